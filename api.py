@@ -4,24 +4,44 @@ Exposes the existing Python services as HTTP endpoints for the web UI.
 Run with: uvicorn api:app --reload --port 8000
 """
 
+import hashlib
+import json
+import operator
 import os
 import sys
-from datetime import datetime
-from typing import List, Optional
+import time
+from typing import List, Literal, Optional, Tuple
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel
 import pathlib
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+try:
+    import keyring
+    HAS_KEYRING = True
+except ImportError:
+    HAS_KEYRING = False
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from services import DatabaseService, OpenAIService, HeartbeatService, RoomService, setup_logging, get_logger
-from models import AIAgent, ChatMessage
+from services.hud_service import HUDService
+from services.toon_service import serialize_hud, HUDFormat
+from models import AIAgent, ChatMessage, SelfConcept
+from models.timestamps import utcnow_iso_seconds
+import config
+import prompts
 
 setup_logging()
 logger = get_logger("api")
@@ -31,33 +51,35 @@ db: DatabaseService = None
 openai_service: OpenAIService = None
 room_service: RoomService = None
 heartbeat_service: HeartbeatService = None
+hud_service: HUDService = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize services on startup, cleanup on shutdown."""
-    global db, openai_service, room_service, heartbeat_service
+    global db, openai_service, room_service, heartbeat_service, hud_service
 
     logger.info("Starting API server...")
+    # Endpoints that touch SQLite, files or the OpenAI API are plain `def` so
+    # FastAPI runs them in the threadpool instead of blocking the event loop
+    anyio.to_thread.current_default_thread_limiter().total_tokens = config.API_THREADPOOL_SIZE
     db = DatabaseService()
     openai_service = OpenAIService()
     room_service = RoomService(db)
     heartbeat_service = HeartbeatService(openai_service, db, room_service)
+    # Shared so HUD previews include the heartbeat's recorded recent actions
+    hud_service = heartbeat_service.hud_service
 
     # Try to load API key from environment or keyring
     api_key = os.environ.get("OPENAI_API_KEY")
     if api_key:
         openai_service.set_api_key(api_key)
         logger.info("API key loaded from environment")
-    else:
-        try:
-            import keyring
-            api_key = keyring.get_password("aichatroom", "openai_api_key")
-            if api_key:
-                openai_service.set_api_key(api_key)
-                logger.info("API key loaded from keyring")
-        except ImportError:
-            pass
+    elif HAS_KEYRING:
+        api_key = keyring.get_password("aichatroom", "openai_api_key")
+        if api_key:
+            openai_service.set_api_key(api_key)
+            logger.info("API key loaded from keyring")
 
     yield
 
@@ -67,6 +89,8 @@ async def lifespan(app: FastAPI):
         heartbeat_service.cleanup()
     if room_service:
         room_service.cleanup()
+    if openai_service:
+        openai_service.close()
 
 
 app = FastAPI(
@@ -76,6 +100,92 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+class ETagMiddleware:
+    """Add weak ETags to GET /api/ responses and answer 304 on a match.
+
+    The web UI polls the same endpoints repeatedly; when the body hasn't
+    changed the client gets an empty 304 instead of the full payload.
+    Message endpoints are skipped since they change on nearly every poll,
+    and so is the HUD preview, which embeds the current time and is the
+    largest body to buffer; as are non-200 responses and bodies over
+    API_ETAG_MAX_BODY_BYTES.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "GET"
+                or not scope["path"].startswith("/api/") or "/messages" in scope["path"]
+                or scope["path"].startswith("/api/hud/preview/")):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value
+                break
+
+        start = None
+        chunks = []
+        size = 0
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, size, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            chunks.append(body)
+            size += len(body)
+            if size > config.API_ETAG_MAX_BODY_BYTES:
+                # Too large to be worth buffering; flush what we have
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(chunks),
+                            "more_body": message.get("more_body", False)})
+                return
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = b'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest().encode() + b'"'
+            if if_none_match is not None and etag in [t.strip() for t in if_none_match.split(b",")]:
+                headers = [(k, v) for k, v in start["headers"]
+                           if k not in (b"content-length", b"content-type")]
+                headers.append((b"etag", etag))
+                await send({"type": "http.response.start", "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            headers = list(start["headers"])
+            headers.append((b"etag", etag))
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# Registered before CORS so that CORS stays outermost and 304s carry its headers
+app.add_middleware(ETagMiddleware)
+
+# Outside ETagMiddleware: tags are computed on the uncompressed body and 304s
+# (no body) are never compressed
+app.add_middleware(GZipMiddleware, minimum_size=config.API_GZIP_MIN_BYTES,
+                   compresslevel=config.API_GZIP_LEVEL)
+
 # CORS for local development and Vercel
 app.add_middleware(
     CORSMiddleware,
@@ -91,18 +201,72 @@ app.add_middleware(
 # Path to the web UI build output (Next.js static export)
 WEB_UI_PATH = pathlib.Path(__file__).parent / "web" / "out"
 
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for fingerprinted build assets, cacheable forever."""
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["cache-control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+# HTML pages name the current asset bundles, so browsers must revalidate them
+_HTML_HEADERS = {"cache-control": "no-cache"}
+
+
+# Landing page served at / when the web UI hasn't been built
+_API_ONLY_HTML = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>AI Chat Room API</title>
+        <style>
+            body { font-family: system-ui, sans-serif; max-width: 800px; margin: 50px auto; padding: 20px; background: #1a1a2e; color: #eee; }
+            h1 { color: #3b82f6; }
+            a { color: #79c0ff; }
+            code { background: #2d2d44; padding: 2px 6px; border-radius: 4px; }
+            .status { color: #7ee787; }
+            .warning { color: #f0883e; }
+        </style>
+    </head>
+    <body>
+        <h1>AI Chat Room API</h1>
+        <p class="status">✓ API is running</p>
+        <p class="warning">⚠ Web UI not built. Run: <code>cd web && npm run build</code></p>
+        <h2>API Endpoints</h2>
+        <ul>
+            <li><code>GET /api/agents</code> - List all agents</li>
+            <li><code>POST /api/agents</code> - Create agent</li>
+            <li><code>GET /api/agents/{id}/room/messages</code> - Get agent room messages</li>
+            <li><code>GET /api/health</code> - Health check</li>
+        </ul>
+        <p>📖 <a href="/docs">API Documentation (Swagger UI)</a></p>
+    </body>
+    </html>
+    """
+
+
 def setup_static_files():
     """Mount static files if the web UI build exists."""
     if WEB_UI_PATH.exists():
         # Mount static files (CSS, JS, images) under /_next
         next_static = WEB_UI_PATH / "_next"
         if next_static.exists():
-            app.mount("/_next", StaticFiles(directory=str(next_static)), name="next_static")
+            app.mount("/_next", ImmutableStaticFiles(directory=str(next_static)), name="next_static")
+
+        # Index the static export once so request handling is a dict lookup
+        # rather than a chain of stat() calls per request.
+        index_html = str(WEB_UI_PATH / "index.html")
+        spa_files = {
+            p.relative_to(WEB_UI_PATH).as_posix(): str(p)
+            for p in WEB_UI_PATH.rglob("*") if p.is_file()
+        }
 
         # Serve index.html for root and any non-API routes (SPA fallback)
         @app.get("/")
         async def serve_root():
-            return FileResponse(str(WEB_UI_PATH / "index.html"))
+            return FileResponse(index_html, headers=_HTML_HEADERS)
 
         # Catch-all for client-side routing (must be registered last)
         @app.get("/{full_path:path}")
@@ -111,55 +275,25 @@ def setup_static_files():
             if full_path.startswith("api/") or full_path in ("docs", "redoc", "openapi.json"):
                 raise HTTPException(status_code=404)
 
-            # Try to serve the exact file first
-            file_path = WEB_UI_PATH / full_path
-            if file_path.is_file():
-                return FileResponse(str(file_path))
-
-            # Try with index.html for directory paths (Next.js trailingSlash)
-            index_path = WEB_UI_PATH / full_path / "index.html"
-            if index_path.is_file():
-                return FileResponse(str(index_path))
-
-            # Fallback to root index.html for SPA routing
-            return FileResponse(str(WEB_UI_PATH / "index.html"))
+            # Exact file first, then index.html for directory paths
+            # (Next.js trailingSlash), then the root index.html for SPA routing
+            file_path = (spa_files.get(full_path)
+                         or spa_files.get(full_path.rstrip("/") + "/index.html")
+                         or index_html)
+            return FileResponse(file_path, headers=_HTML_HEADERS if file_path.endswith(".html") else None)
 
         logger.info(f"Web UI mounted from {WEB_UI_PATH}")
     else:
         # Fallback: Show API info when no web UI is built
-        from fastapi.responses import HTMLResponse
+
+        # Encoded once. Each request still gets its own Response: middleware
+        # (e.g. GZip) edits the header list of the response it sends in place.
+        api_only_page = _API_ONLY_HTML.encode("utf-8")
 
         @app.get("/", response_class=HTMLResponse)
         async def root():
-            return """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>AI Chat Room API</title>
-                <style>
-                    body { font-family: system-ui, sans-serif; max-width: 800px; margin: 50px auto; padding: 20px; background: #1a1a2e; color: #eee; }
-                    h1 { color: #3b82f6; }
-                    a { color: #79c0ff; }
-                    code { background: #2d2d44; padding: 2px 6px; border-radius: 4px; }
-                    .status { color: #7ee787; }
-                    .warning { color: #f0883e; }
-                </style>
-            </head>
-            <body>
-                <h1>AI Chat Room API</h1>
-                <p class="status">✓ API is running</p>
-                <p class="warning">⚠ Web UI not built. Run: <code>cd web && npm run build</code></p>
-                <h2>API Endpoints</h2>
-                <ul>
-                    <li><code>GET /api/agents</code> - List all agents</li>
-                    <li><code>POST /api/agents</code> - Create agent</li>
-                    <li><code>GET /api/agents/{id}/room/messages</code> - Get agent room messages</li>
-                    <li><code>GET /api/health</code> - Health check</li>
-                </ul>
-                <p>📖 <a href="/docs">API Documentation (Swagger UI)</a></p>
-            </body>
-            </html>
-            """
+            return HTMLResponse(api_only_page, headers=_HTML_HEADERS)
+
         logger.info(f"Web UI not found at {WEB_UI_PATH} - API-only mode")
 
 
@@ -257,57 +391,82 @@ class StatusResponse(BaseModel):
     message: str
 
 
+# ============ Fast List Responses ============
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available.
+
+    Agent and message endpoints build plain dicts and return this directly,
+    skipping Pydantic validation and the jsonable_encoder pass. Their Pydantic
+    models are still listed under ``responses`` for the OpenAPI schema.
+    """
+
+    def render(self, content) -> bytes:
+        if HAS_ORJSON:
+            return orjson.dumps(content)
+        return super().render(content)
+
+
+def _json_dumps(obj, indent: bool = False) -> str:
+    """Serialize to a JSON string, with orjson when available."""
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits - stdlib json handles these
+    return json.dumps(obj, indent=2 if indent else None, default=str)
+
+
+_AGENT_KEYS = ('id', 'name', 'model', 'background_prompt', 'temperature', 'status', 'room_wpm',
+               'heartbeat_interval', 'can_create_agents', 'is_architect', 'total_tokens_used',
+               'token_budget')
+_agent_fields = operator.attrgetter(*_AGENT_KEYS, 'created_at')
+
+
+def _agent_payload(a: AIAgent) -> dict:
+    """Fields of AgentResponse for an agent."""
+    *values, created_at = _agent_fields(a)
+    payload = dict(zip(_AGENT_KEYS, values))
+    payload["created_at"] = created_at.isoformat() if created_at else ""
+    return payload
+
+
+def _message_payload(m: ChatMessage) -> dict:
+    """Fields of MessageResponse for a message."""
+    return {
+        "id": m.id,
+        "room_id": m.room_id,
+        "sender_id": m.sender_id,
+        "sender_name": m.sender_name,
+        "content": m.content,
+        "timestamp": m.timestamp.isoformat() if m.timestamp else "",
+        "sequence_number": m.sequence_number,
+        "message_type": m.message_type,
+        "reply_to_id": m.reply_to_id
+    }
+
+
 # ============ Agent Endpoints ============
 
-@app.get("/api/agents", response_model=List[AgentResponse])
-async def get_agents():
+@app.get("/api/agents", response_class=FastJSONResponse, responses={200: {"model": List[AgentResponse]}})
+def get_agents():
     """Get all agents (excluding The Architect)."""
     agents = db.get_all_agents()
-    return [
-        AgentResponse(
-            id=a.id,
-            name=a.name,
-            model=a.model,
-            background_prompt=a.background_prompt,
-            temperature=a.temperature,
-            status=a.status,
-            room_wpm=a.room_wpm,
-            heartbeat_interval=a.heartbeat_interval,
-            can_create_agents=a.can_create_agents,
-            is_architect=a.is_architect,
-            total_tokens_used=a.total_tokens_used,
-            token_budget=a.token_budget,
-            created_at=a.created_at.isoformat() if a.created_at else ""
-        )
-        for a in agents if not a.is_architect
-    ]
-
-
-@app.get("/api/agents/{agent_id}", response_model=AgentResponse)
-async def get_agent(agent_id: int):
+    return FastJSONResponse([_agent_payload(a) for a in agents if not a.is_architect])
+
+
+@app.get("/api/agents/{agent_id}", response_class=FastJSONResponse, responses={200: {"model": AgentResponse}})
+def get_agent(agent_id: int):
     """Get a specific agent by ID."""
     agent = db.get_agent(agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
-    return AgentResponse(
-        id=agent.id,
-        name=agent.name,
-        model=agent.model,
-        background_prompt=agent.background_prompt,
-        temperature=agent.temperature,
-        status=agent.status,
-        room_wpm=agent.room_wpm,
-        heartbeat_interval=agent.heartbeat_interval,
-        can_create_agents=agent.can_create_agents,
-        is_architect=agent.is_architect,
-        total_tokens_used=agent.total_tokens_used,
-        token_budget=agent.token_budget,
-        created_at=agent.created_at.isoformat() if agent.created_at else ""
-    )
+    return FastJSONResponse(_agent_payload(agent))
 
 
-@app.post("/api/agents", response_model=AgentResponse)
-async def create_agent(agent_data: AgentCreate):
+@app.post("/api/agents", response_class=FastJSONResponse, responses={200: {"model": AgentResponse}})
+def create_agent(agent_data: AgentCreate):
     """Create a new agent."""
     agent = AIAgent(
         name=agent_data.name,
@@ -325,25 +484,12 @@ async def create_agent(agent_data: AgentCreate):
     # Auto-join the agent to their own room
     room_service.join_room(agent, agent_id)
 
-    return AgentResponse(
-        id=agent.id,
-        name=agent.name,
-        model=agent.model,
-        background_prompt=agent.background_prompt,
-        temperature=agent.temperature,
-        status=agent.status,
-        room_wpm=agent.room_wpm,
-        heartbeat_interval=agent.heartbeat_interval,
-        can_create_agents=agent.can_create_agents,
-        is_architect=agent.is_architect,
-        total_tokens_used=agent.total_tokens_used,
-        token_budget=agent.token_budget,
-        created_at=agent.created_at.isoformat() if agent.created_at else ""
-    )
+    return FastJSONResponse(_agent_payload(agent))
 
 
-@app.put("/api/agents/{agent_id}", response_model=AgentResponse)
-async def update_agent(agent_id: int, agent_data: AgentUpdate):
+@app.put("/api/agents/{agent_id}", response_class=FastJSONResponse,
+         responses={200: {"model": AgentResponse}})
+def update_agent(agent_id: int, agent_data: AgentUpdate):
     """Update an existing agent."""
     agent = db.get_agent(agent_id)
     if not agent:
@@ -368,25 +514,11 @@ async def update_agent(agent_id: int, agent_data: AgentUpdate):
 
     db.save_agent(agent)
 
-    return AgentResponse(
-        id=agent.id,
-        name=agent.name,
-        model=agent.model,
-        background_prompt=agent.background_prompt,
-        temperature=agent.temperature,
-        status=agent.status,
-        room_wpm=agent.room_wpm,
-        heartbeat_interval=agent.heartbeat_interval,
-        can_create_agents=agent.can_create_agents,
-        is_architect=agent.is_architect,
-        total_tokens_used=agent.total_tokens_used,
-        token_budget=agent.token_budget,
-        created_at=agent.created_at.isoformat() if agent.created_at else ""
-    )
+    return FastJSONResponse(_agent_payload(agent))
 
 
 @app.delete("/api/agents/{agent_id}")
-async def delete_agent(agent_id: int):
+def delete_agent(agent_id: int):
     """Delete an agent."""
     if not db.delete_agent(agent_id):
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -395,32 +527,27 @@ async def delete_agent(agent_id: int):
 
 # ============ Message Endpoints ============
 
-@app.get("/api/agents/{agent_id}/room/messages", response_model=List[MessageResponse])
-async def get_agent_room_messages(agent_id: int, since: Optional[int] = None):
-    """Get messages for an agent's room, optionally since a sequence number."""
+@app.get("/api/agents/{agent_id}/room/messages", response_class=FastJSONResponse,
+         responses={200: {"model": List[MessageResponse]}})
+def get_agent_room_messages(agent_id: int, since: Optional[int] = None,
+                            limit: Optional[int] = None, before: Optional[int] = None):
+    """Get messages for an agent's room.
+
+    With `since`, returns everything after that sequence number. Otherwise
+    returns the full history, or only the newest `limit` messages (before
+    sequence number `before` if given) when paging.
+    """
     if since is not None:
         messages = db.get_messages_for_room_since(agent_id, since)
     else:
-        messages = db.get_messages_for_room(agent_id)
-
-    return [
-        MessageResponse(
-            id=m.id,
-            room_id=m.room_id,
-            sender_id=m.sender_id,
-            sender_name=m.sender_name,
-            content=m.content,
-            timestamp=m.timestamp.isoformat() if m.timestamp else "",
-            sequence_number=m.sequence_number,
-            message_type=m.message_type,
-            reply_to_id=m.reply_to_id
-        )
-        for m in messages
-    ]
-
-
-@app.post("/api/agents/{agent_id}/room/messages", response_model=MessageResponse)
-async def send_agent_room_message(agent_id: int, message_data: MessageCreate):
+        messages = db.get_messages_for_room(agent_id, limit=limit, before_seq=before)
+
+    return FastJSONResponse([_message_payload(m) for m in messages])
+
+
+@app.post("/api/agents/{agent_id}/room/messages", response_class=FastJSONResponse,
+          responses={200: {"model": MessageResponse}})
+def send_agent_room_message(agent_id: int, message_data: MessageCreate):
     """Send a message to an agent's room."""
     # Determine sender_id from sender_name
     sender_id = None
@@ -435,34 +562,18 @@ async def send_agent_room_message(agent_id: int, message_data: MessageCreate):
             # Not a numeric ID, leave as None
             pass
     
-    room_service.send_message(
+    message = room_service.send_message(
         agent_id,
         message_data.sender_name,
         message_data.content,
         reply_to_id=message_data.reply_to_id,
         sender_id=sender_id
     )
-
-    # Get the latest message
-    messages = db.get_messages_for_room(agent_id)
-    if messages:
-        m = messages[-1]
-        return MessageResponse(
-            id=m.id,
-            room_id=m.room_id,
-            sender_id=m.sender_id,
-            sender_name=m.sender_name,
-            content=m.content,
-            timestamp=m.timestamp.isoformat() if m.timestamp else "",
-            sequence_number=m.sequence_number,
-            message_type=m.message_type,
-            reply_to_id=m.reply_to_id
-        )
-    raise HTTPException(status_code=500, detail="Failed to send message")
+    return FastJSONResponse(_message_payload(message))
 
 
 @app.delete("/api/agents/{agent_id}/room/messages")
-async def clear_agent_room_messages(agent_id: int):
+def clear_agent_room_messages(agent_id: int):
     """Clear all messages in an agent's room."""
     room_service.clear_room_messages(agent_id)
     return {"status": "cleared", "agent_id": agent_id}
@@ -470,23 +581,19 @@ async def clear_agent_room_messages(agent_id: int):
 
 # ============ Room Member Endpoints ============
 
-@app.get("/api/agents/{agent_id}/room/members", response_model=List[RoomMemberResponse])
-async def get_agent_room_members(agent_id: int):
+@app.get("/api/agents/{agent_id}/room/members", response_class=FastJSONResponse,
+         responses={200: {"model": List[RoomMemberResponse]}})
+def get_agent_room_members(agent_id: int):
     """Get all members of an agent's room."""
     agents = room_service.get_agents_in_room(agent_id)
-    return [
-        RoomMemberResponse(
-            agent_id=a.id,
-            agent_name=a.name,
-            status=a.status,
-            is_owner=(a.id == agent_id)
-        )
+    return FastJSONResponse([
+        {"agent_id": a.id, "agent_name": a.name, "status": a.status, "is_owner": a.id == agent_id}
         for a in agents
-    ]
+    ])
 
 
 @app.post("/api/agents/{agent_id}/room/members")
-async def add_agent_room_member(agent_id: int, request: AddMemberRequest):
+def add_agent_room_member(agent_id: int, request: AddMemberRequest):
     """Add a member to an agent's room."""
     member = db.get_agent(request.member_id)
     if not member:
@@ -497,7 +604,7 @@ async def add_agent_room_member(agent_id: int, request: AddMemberRequest):
 
 
 @app.delete("/api/agents/{agent_id}/room/members/{member_id}")
-async def remove_agent_room_member(agent_id: int, member_id: int):
+def remove_agent_room_member(agent_id: int, member_id: int):
     """Remove an agent from a room."""
     agent = db.get_agent(agent_id)
     if not agent:
@@ -545,7 +652,7 @@ async def start_heartbeat():
 
 
 @app.post("/api/heartbeat/stop")
-async def stop_heartbeat():
+def stop_heartbeat():
     """Stop the heartbeat service."""
     heartbeat_service.stop()
     return {"status": "stopped"}
@@ -553,31 +660,47 @@ async def stop_heartbeat():
 
 # ============ Settings Endpoints ============
 
+# (monotonic time, response) of the last successful status check
+_status_cache: Optional[Tuple[float, StatusResponse]] = None
+
+
 @app.get("/api/settings/status", response_model=StatusResponse)
-async def get_api_status():
-    """Get OpenAI API connection status."""
+def get_api_status():
+    """Get OpenAI API connection status.
+
+    A successful check is reused for API_STATUS_CACHE_TTL_SECONDS so UI
+    polling doesn't make an OpenAI request each time; failures are not
+    cached, so a fixed connection shows up on the next poll.
+    """
+    global _status_cache
     if not openai_service.has_api_key:
         return StatusResponse(connected=False, models=[], message="API key not configured")
 
+    cached = _status_cache
+    if cached is not None and time.monotonic() - cached[0] < config.API_STATUS_CACHE_TTL_SECONDS:
+        return cached[1]
+
     success, message = openai_service.test_connection()
     models = openai_service.get_available_models() if success else []
 
-    return StatusResponse(connected=success, models=models, message=message)
+    status = StatusResponse(connected=success, models=models, message=message)
+    if success:
+        _status_cache = (time.monotonic(), status)
+    return status
 
 
 @app.post("/api/settings/apikey")
-async def set_api_key(request: ApiKeyRequest):
+def set_api_key(request: ApiKeyRequest):
     """Set the OpenAI API key."""
+    global _status_cache
+    _status_cache = None
     openai_service.set_api_key(request.api_key)
     success, message = openai_service.test_connection()
 
     if success:
         # Save to keyring if available
-        try:
-            import keyring
+        if HAS_KEYRING:
             keyring.set_password("aichatroom", "openai_api_key", request.api_key)
-        except ImportError:
-            pass
 
         return {"status": "connected", "message": message}
     else:
@@ -585,7 +708,7 @@ async def set_api_key(request: ApiKeyRequest):
 
 
 @app.get("/api/settings/models", response_model=List[str])
-async def get_available_models():
+def get_available_models():
     """Get list of available OpenAI models."""
     if not openai_service.has_api_key:
         raise HTTPException(status_code=400, detail="API key not configured")
@@ -599,7 +722,7 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utcnow_iso_seconds(),
         "heartbeat_running": heartbeat_service.is_running if heartbeat_service else False,
         "api_connected": openai_service.has_api_key if openai_service else False
     }
@@ -607,14 +730,14 @@ async def health_check():
 
 # ============ HUD History Endpoints ============
 
-@app.get("/api/agents/{agent_id}/hud-history")
+@app.get("/api/agents/{agent_id}/hud-history", response_class=FastJSONResponse)
 async def get_hud_history(agent_id: int, limit: int = 50):
     """Get HUD interaction history for an agent."""
     if not heartbeat_service:
-        return []
+        return FastJSONResponse([])
     history = heartbeat_service.get_hud_history(agent_id)
     # Return most recent entries, limited
-    return history[-limit:] if history else []
+    return FastJSONResponse(history[-limit:] if history else [])
 
 
 @app.delete("/api/agents/{agent_id}/hud-history")
@@ -628,29 +751,29 @@ async def clear_hud_history(agent_id: int):
 # ============ Knowledge/Self-Concept Endpoints ============
 
 @app.get("/api/agents/{agent_id}/knowledge")
-async def get_agent_knowledge(agent_id: int):
+def get_agent_knowledge(agent_id: int):
     """Get an agent's self-concept/knowledge tree."""
     agent = db.get_agent(agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
-    from models import SelfConcept
     return SelfConcept.from_json(agent.self_concept_json).to_dict()
 
 
 @app.put("/api/agents/{agent_id}/knowledge")
-async def update_agent_knowledge(agent_id: int, data: dict):
-    """Update an agent's self-concept."""
+def update_agent_knowledge(agent_id: int, data: dict):
+    """Update an agent's self-concept.
+
+    Only the self_concept_json column is written, not the whole agent row.
+    """
     agent = db.get_agent(agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
-    import json
-    agent.self_concept_json = json.dumps(data)
-    db.save_agent(agent)
+    db.update_self_concepts({agent_id: _json_dumps(data)})
     return {"status": "updated", "agent_id": agent_id}
 
 
 @app.delete("/api/agents/{agent_id}/knowledge")
-async def clear_agent_knowledge(agent_id: int):
+def clear_agent_knowledge(agent_id: int):
     """Clear an agent's entire knowledge bank."""
     agent = db.get_agent(agent_id)
     if not agent:
@@ -664,109 +787,80 @@ async def clear_agent_knowledge(agent_id: int):
 # ============ Prompts Endpoints ============
 
 @app.get("/api/prompts")
-async def get_prompts():
+def get_prompts():
     """Get the prompts configuration."""
-    import prompts
     return prompts.load_prompts()
 
 
 @app.put("/api/prompts")
-async def save_prompts(data: dict):
+def save_prompts(data: dict):
     """Save the prompts configuration."""
-    import prompts
     prompts.save_prompts(data)
     return {"status": "saved"}
 
 
 @app.get("/api/prompt-blocks")
 async def get_prompt_blocks():
-    """Get the main prompt text blocks from config."""
-    import config
-    return {
-        "system_directives": config.SYSTEM_DIRECTIVES,
-        "persona_instructions": config.PERSONA_INSTRUCTIONS,
-        "bot_instructions": config.BOT_INSTRUCTIONS,
-        "batch_instructions": config.BATCH_INSTRUCTIONS
-    }
+    """Get the main prompt text blocks, with saved overrides applied."""
+    return prompts.get_prompt_blocks()
 
 
 @app.put("/api/prompt-blocks")
-async def save_prompt_blocks(data: dict):
-    """Save prompt blocks to an override file."""
-    import json
-    import os
-    
-    override_file = os.path.join(os.path.dirname(__file__), "prompt_overrides.json")
-    
-    # Load existing overrides
-    overrides = {}
-    if os.path.exists(override_file):
-        with open(override_file, 'r', encoding='utf-8') as f:
-            overrides = json.load(f)
-    
-    # Update with new values
-    for key in ["system_directives", "persona_instructions", "bot_instructions", "batch_instructions"]:
-        if key in data:
-            overrides[key] = data[key]
-    
-    # Save
-    with open(override_file, 'w', encoding='utf-8') as f:
-        json.dump(overrides, f, indent=2)
-    
-    # Reload config module to pick up changes
-    import importlib
-    importlib.reload(config)
-    
+def save_prompt_blocks(data: dict):
+    """Save prompt blocks to the override file."""
+    prompts.save_prompt_blocks(data)
     return {"status": "saved"}
 
 
 # ============ HUD OS Preview Endpoints ============
 
 @app.get("/api/hud/preview/{agent_id}")
-async def get_hud_preview(agent_id: int):
-    """Get a preview HUD for an agent in both JSON and TOON formats."""
-    from services.hud_service import HUDService
-    from services.toon_service import serialize_hud, HUDFormat
-    from models import SelfConcept
-    import json
+def get_hud_preview(agent_id: int, format: Literal["full", "structure", "json", "toon"] = "full"):
+    """Get a preview HUD for an agent in both JSON and TOON formats.
 
+    `format` trims the response: "full" (default) returns the structure,
+    both serializations and stats; "structure" drops the two serialized
+    strings; "json" and "toon" return just that serialization as the body.
+    """
     agent = db.get_agent(agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
-    hud_service = HUDService()
-
     # Get agent's rooms and build room data
+    # Batched: memberships, members, agents and recent messages are one query each
     memberships = db.get_agent_memberships(agent_id)
-    room_data = []
+    room_ids = [mem.room_id for mem in memberships]
+    members_by_room = db.get_room_members_bulk(room_ids)
+    agents_by_id = db.get_agents_by_ids(
+        room_ids + [m.agent_id for members in members_by_room.values() for m in members]
+    )
+    messages_by_room = db.get_recent_messages_bulk(room_ids, 5)
+    agent_rooms = []
     for mem in memberships:
-        # Get the agent that IS this room
-        room_agent = db.get_agent(mem.room_id)
-        if room_agent:
-            messages = db.get_messages_for_room(mem.room_id)[-10:]
-            members = db.get_room_members(mem.room_id)
-            member_names = [db.get_agent(m.agent_id).name for m in members if db.get_agent(m.agent_id)]
-            # Create a minimal room dict for this agent
-            room_dict = {
-                "id": room_agent.id,
-                "name": f"{room_agent.id}" if not room_agent.is_architect else "The Architect"
-            }
-            room_data.append({
-                "room": room_dict,
-                "membership": mem,
-                "messages": messages,
-                "members": member_names,
-                "word_budget": 500
-            })
+        # Only rooms whose owning agent (agent.id == room.id) still exists
+        if mem.room_id not in agents_by_id:
+            continue
+        agent_rooms.append({
+            "agent_id": mem.room_id,
+            "members": [agents_by_id[m.agent_id].name for m in members_by_room[mem.room_id]
+                        if m.agent_id in agents_by_id],
+            "messages": [
+                {
+                    "sender": m.sender_name,
+                    "content": m.content[:200] + "..." if len(m.content) > 200 else m.content,
+                    "timestamp": m.timestamp.isoformat() if hasattr(m.timestamp, 'isoformat') else str(m.timestamp)
+                }
+                for m in messages_by_room[mem.room_id]
+            ]
+        })
 
     # Build HUD structure (without serialization)
     self_concept = SelfConcept.from_json(agent.self_concept_json)
 
     # Calculate free tokens (simplified)
-    from datetime import datetime
     base_tokens = hud_service.estimate_base_hud_tokens(agent)
     free_tokens = max(0, agent.token_budget - base_tokens)
-    current_time = datetime.utcnow().isoformat() + "Z"
+    current_time = utcnow_iso_seconds() + "Z"
 
     # Build the complete HUD structure
     hud_struct = {
@@ -791,41 +885,28 @@ async def get_hud_preview(agent_id: int):
             "knowledge": self_concept.to_dict(),
             "recent_actions": hud_service.get_recent_actions(agent_id)
         }],
-        "agent_rooms": []
+        "agent_rooms": agent_rooms
     }
 
-    # Add agent_rooms data
-    for rd in room_data:
-        room = rd["room"]
-        hud_struct["agent_rooms"].append({
-            "agent_id": room["id"],
-            "members": rd["members"],
-            "messages": [
-                {
-                    "sender": m.sender_name,
-                    "content": m.content[:200] + "..." if len(m.content) > 200 else m.content,
-                    "timestamp": m.timestamp.isoformat() if hasattr(m.timestamp, 'isoformat') else str(m.timestamp)
-                }
-                for m in rd["messages"][-5:]
-            ]
-        })
-
     # Generate JSON representation
-    json_str = json.dumps(hud_struct, indent=2, default=str)
+    json_str = _json_dumps(hud_struct, indent=True)
 
     # Generate TOON representation
     toon_str = serialize_hud(hud_struct, format=HUDFormat.TOON, record_telemetry=False)
 
-    # Calculate token estimates
+    if format == "json":
+        return Response(json_str, media_type="application/json")
+    if format == "toon":
+        return PlainTextResponse(toon_str)
+
+    # Calculate token estimates (same chars/4 heuristic the web UI uses)
     json_tokens = len(json_str) // 4 + 1
     toon_tokens = len(toon_str) // 4 + 1
 
-    return {
+    preview = {
         "agent_id": agent_id,
         "agent_name": agent.name,
         "structure": hud_struct,
-        "json": json_str,
-        "toon": toon_str,
         "stats": {
             "json_chars": len(json_str),
             "toon_chars": len(toon_str),
@@ -836,6 +917,10 @@ async def get_hud_preview(agent_id: int):
             "savings_pct": round((1 - len(toon_str) / len(json_str)) * 100, 1) if len(json_str) > 0 else 0
         }
     }
+    if format == "full":
+        preview["json"] = json_str
+        preview["toon"] = toon_str
+    return preview
 
 
 @app.get("/api/hud/schema")
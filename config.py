@@ -21,6 +21,7 @@ AGENT_TYPES = [AGENT_TYPE_PERSONA, AGENT_TYPE_BOT]
 
 DEFAULT_TOKEN_BUDGET = 10000  # Default total tokens per agent
 MAX_RECENT_ACTIONS = 50  # Maximum recent actions to show in HUD
+MAX_TRACKED_AGENTS = 1024  # Agents whose recent actions are kept in memory (least recently active evicted)
 
 # =============================================================================
 # Agent Defaults
@@ -60,6 +61,15 @@ MAX_WPM = 200
 
 API_TIMEOUT_SECONDS = 60
 API_CONNECT_TIMEOUT_SECONDS = 10
+API_MAX_CONNECTIONS = 20  # Pooled HTTPS connections shared by all API calls
+API_MAX_KEEPALIVE_CONNECTIONS = 10
+API_KEEPALIVE_EXPIRY_SECONDS = 60
+API_MODELS_CACHE_TTL_SECONDS = 300  # How long a fetched model list is reused
+API_THREADPOOL_SIZE = 100  # Worker threads for blocking (sync) API endpoints
+API_ETAG_MAX_BODY_BYTES = 512 * 1024  # Larger GET responses are sent without an ETag
+API_GZIP_MIN_BYTES = 1024  # Smaller responses are sent uncompressed
+API_GZIP_LEVEL = 5
+API_STATUS_CACHE_TTL_SECONDS = 30  # How long a successful /api/settings/status check is reused
 API_MAX_RETRIES = 3
 API_BASE_RETRY_DELAY = 5.0  # Exponential backoff starting point
 
@@ -111,6 +121,21 @@ BATCH_HEARTBEAT_INTERVAL = 1.0  # seconds
 # Reserve tokens for response generation in batch context
 BATCH_RESERVE_TOKENS = 5000
 
+# Due agents are bundled per model: a batch is sent as soon as it reaches the
+# preferred size, or once its oldest agent has waited BATCH_MAX_WAIT_MS.
+# The size is lowered automatically when the measured per-agent HUD size
+# would not fit the model's context limit.
+BATCH_PREFERRED_SIZE = 8
+BATCH_MAX_WAIT_MS = 1000
+
+# Each agent's room messages in a batch are packed by importance (recency,
+# mentions, replies) into CONTEXT_BASE_TOKENS + CONTEXT_ROLE_TOKENS[type]
+CONTEXT_BASE_TOKENS = 2000
+CONTEXT_ROLE_TOKENS = {"persona": 1000, "bot": 0}
+CONTEXT_RECENCY_TAU_SECONDS = 600.0  # Recency score decays as exp(-age / tau)
+CONTEXT_MENTION_BOOST = 1.0  # Added when a message names the agent
+CONTEXT_REPLY_BOOST = 1.0  # Added when a message replies to the agent
+
 # Context limits per model (used to determine batch sizes)
 MODEL_CONTEXT_LIMITS = {
     "gpt-5.1": 128000,
@@ -134,11 +159,17 @@ WINDOW_MIN_WIDTH = 1000
 WINDOW_MIN_HEIGHT = 700
 WINDOW_DEFAULT_WIDTH = 1400
 WINDOW_DEFAULT_HEIGHT = 900
+SEND_BATCH_DELAY_MS = 20  # Messages sent within this window are written together
+CONFIRM_CLEAR_CHAT = True  # Default for the "clear chat" confirmation (user can turn it off)
 
 # =============================================================================
 # Prompt Text Blocks (Editable via Settings UI)
 # =============================================================================
 
+# How often load_prompts() stats prompts.json for outside edits (saves through
+# prompts.save_prompts are seen immediately)
+PROMPTS_RECHECK_SECONDS = 1.0
+
 SYSTEM_DIRECTIVES = """## Multiple Conversations
 You might be in several chat rooms at once - like having different group chats open. Each is its own conversation with its own context.
 
@@ -3,7 +3,18 @@
 import json
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from .self_concept import SelfConcept
+from .compat import DATACLASS_SLOTS
+from .interned import canonical
+from .timestamps import utcnow, parse_iso
 
 
 # HUD format options (for both input and output)
@@ -16,7 +27,7 @@ HUD_INPUT_FORMATS = [HUD_FORMAT_JSON, HUD_FORMAT_COMPACT, HUD_FORMAT_TOON]
 HUD_OUTPUT_FORMATS = [HUD_FORMAT_JSON, HUD_FORMAT_TOON]  # Compact JSON output not supported (LLM writes full keys)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AIAgent:
     """Represents an AI agent with OpenAI Responses API integration.
 
@@ -28,7 +39,7 @@ class AIAgent:
     name: str = ""  # Display name (personas use custom names, bots use ID)
     background_prompt: str = ""  # Personality for personas, role for bots
     previous_response_id: str = ""  # For Responses API conversation continuity
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utcnow)
 
     # Agent configuration
     agent_type: str = "persona"  # "persona" (human-like) or "bot" (AI assistant)
@@ -59,6 +70,31 @@ class AIAgent:
     token_budget: int = 10000  # Total tokens available for this agent's HUD
     memory_allocations_json: str = ""  # JSON dict: {"knowledge": 30, "recent_actions": 10, "rooms": 60}
 
+    # Runtime-only state below (not persisted, not part of __init__)
+
+    # Actions queued by HUDService.apply_actions, drained by HeartbeatService
+    _pending_messages: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _pending_room_actions: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _pending_billboard_action: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _pending_wake_agents: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    _pending_create_agents: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _pending_alter_agents: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _pending_retire_agents: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    _pending_sleep: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+
+    # Set by HUDService when the last HUD exceeded token_budget
+    _over_budget: bool = field(default=False, init=False, repr=False, compare=False)
+
+    # Parsed self_concept_json, paired with the exact string it was parsed from
+    _self_concept_cache: Optional[Tuple[str, SelfConcept]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Parsed memory_allocations_json (merged with defaults), same pairing
+    _memory_allocations_cache: Optional[Tuple[str, Dict[str, int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def to_dict(self) -> dict:
         """Convert agent to dictionary for database storage."""
         return {
@@ -89,47 +125,103 @@ class AIAgent:
     @classmethod
     def from_dict(cls, data: dict) -> 'AIAgent':
         """Create agent from dictionary."""
-        created_at = data.get('created_at')
+        get = data.get
+        created_at = get('created_at')
         if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
+            created_at = parse_iso(created_at)
         elif created_at is None:
-            created_at = datetime.utcnow()
+            created_at = utcnow()
 
-        sleep_until = data.get('sleep_until')
+        sleep_until = get('sleep_until')
         if isinstance(sleep_until, str):
-            sleep_until = datetime.fromisoformat(sleep_until)
+            sleep_until = parse_iso(sleep_until)
         else:
             sleep_until = None
 
         # Handle migration from old hud_format to new split fields
-        hud_input = data.get('hud_input_format') or data.get('hud_format', 'json')
-        hud_output = data.get('hud_output_format', 'json')
+        hud_input = get('hud_input_format') or get('hud_format', 'json')
+        hud_output = get('hud_output_format', 'json')
 
         return cls(
-            id=data.get('id'),
-            name=data.get('name', ''),
-            background_prompt=data.get('background_prompt', ''),
-            previous_response_id=data.get('previous_response_id', ''),
+            id=get('id'),
+            name=get('name', ''),
+            background_prompt=get('background_prompt', ''),
+            previous_response_id=get('previous_response_id', ''),
             created_at=created_at,
-            agent_type=data.get('agent_type', 'persona'),
-            model=data.get('model', 'gpt-5-nano'),
-            temperature=float(data.get('temperature', 0.7)),
-            is_architect=bool(data.get('is_architect', False)),
-            hud_input_format=hud_input,
-            hud_output_format=hud_output,
-            status=data.get('status', 'idle'),
-            total_tokens_used=int(data.get('total_tokens_used', 0)),
-            next_heartbeat_offset=float(data.get('next_heartbeat_offset', 0.0)),
-            self_concept_json=data.get('self_concept_json', ''),
-            room_billboard=data.get('room_billboard', ''),
-            heartbeat_interval=float(data.get('heartbeat_interval', 5.0)),
-            room_wpm=int(data.get('room_wpm', 80)),
-            can_create_agents=bool(data.get('can_create_agents', False)),
+            agent_type=canonical(get('agent_type', 'persona')),
+            model=get('model', 'gpt-5-nano'),
+            temperature=float(get('temperature', 0.7)),
+            is_architect=bool(get('is_architect', False)),
+            hud_input_format=canonical(hud_input),
+            hud_output_format=canonical(hud_output),
+            status=canonical(get('status', 'idle')),
+            total_tokens_used=int(get('total_tokens_used', 0)),
+            next_heartbeat_offset=float(get('next_heartbeat_offset', 0.0)),
+            self_concept_json=get('self_concept_json', ''),
+            room_billboard=get('room_billboard', ''),
+            heartbeat_interval=float(get('heartbeat_interval', 5.0)),
+            room_wpm=int(get('room_wpm', 80)),
+            can_create_agents=bool(get('can_create_agents', False)),
             sleep_until=sleep_until,
-            token_budget=int(data.get('token_budget', 10000)),
-            memory_allocations_json=data.get('memory_allocations_json', '')
+            token_budget=int(get('token_budget', 10000)),
+            memory_allocations_json=get('memory_allocations_json', '')
         )
 
+    @classmethod
+    def from_dict_unchecked(cls, data) -> 'AIAgent':
+        """Create agent from a trusted row of our own agents table.
+
+        Skips defaults and numeric coercion - every column must be present
+        (dict or sqlite3.Row). Use from_dict for anything external.
+        """
+        sleep_until = data['sleep_until']
+        return cls(
+            id=data['id'],
+            name=data['name'],
+            background_prompt=data['background_prompt'],
+            previous_response_id=data['previous_response_id'],
+            created_at=parse_iso(data['created_at']),
+            agent_type=canonical(data['agent_type']),
+            model=data['model'],
+            temperature=data['temperature'],
+            is_architect=bool(data['is_architect']),  # SQLite stores 0/1
+            hud_input_format=canonical(data['hud_input_format'] or data['hud_format'] or 'json'),
+            hud_output_format=canonical(data['hud_output_format']),
+            status=canonical(data['status']),
+            total_tokens_used=data['total_tokens_used'],
+            next_heartbeat_offset=data['next_heartbeat_offset'],
+            self_concept_json=data['self_concept_json'],
+            room_billboard=data['room_billboard'],
+            heartbeat_interval=data['heartbeat_interval'],
+            room_wpm=data['room_wpm'],
+            can_create_agents=bool(data['can_create_agents']),
+            sleep_until=parse_iso(sleep_until) if sleep_until else None,
+            token_budget=data['token_budget'],
+            memory_allocations_json=data['memory_allocations_json']
+        )
+
+    def get_self_concept(self) -> SelfConcept:
+        """Get the parsed self-concept, re-parsing only when self_concept_json changed.
+
+        The returned object is shared - after mutating it, call set_self_concept()
+        so self_concept_json stays in sync.
+        """
+        cache = self._self_concept_cache
+        if cache is not None and cache[0] is self.self_concept_json:
+            return cache[1]
+        self_concept = SelfConcept.from_json(self.self_concept_json)
+        self._self_concept_cache = (self.self_concept_json, self_concept)
+        return self_concept
+
+    def set_self_concept(self, self_concept: SelfConcept) -> None:
+        """Store a self-concept, serializing it once and keeping the parsed copy."""
+        self.self_concept_json = self_concept.to_json()
+        self._self_concept_cache = (self.self_concept_json, self_concept)
+
+    def discard_self_concept_cache(self) -> None:
+        """Drop the cached parsed self-concept (e.g. after a mutation was abandoned)."""
+        self._self_concept_cache = None
+
     # Default memory allocations (percentages of allocatable memory)
     DEFAULT_MEMORY_ALLOCATIONS = {
         "knowledge": 30,       # self.knowledge store
@@ -138,26 +230,32 @@ class AIAgent:
     }
 
     def get_memory_allocations(self) -> Dict[str, int]:
-        """Get memory allocations as a dict, with defaults if not set."""
-        if not self.memory_allocations_json:
-            return dict(self.DEFAULT_MEMORY_ALLOCATIONS)
-        try:
-            allocations = json.loads(self.memory_allocations_json)
-            # Merge with defaults for any missing keys
-            result = dict(self.DEFAULT_MEMORY_ALLOCATIONS)
-            result.update(allocations)
-            return result
-        except json.JSONDecodeError:
-            return dict(self.DEFAULT_MEMORY_ALLOCATIONS)
+        """Get memory allocations as a dict, with defaults if not set.
+
+        Parsed once per memory_allocations_json value; callers get a fresh copy.
+        """
+        cache = self._memory_allocations_cache
+        if cache is not None and cache[0] is self.memory_allocations_json:
+            return dict(cache[1])
+
+        result = dict(self.DEFAULT_MEMORY_ALLOCATIONS)
+        if self.memory_allocations_json:
+            try:
+                # Merge with defaults for any missing keys
+                allocations = self.memory_allocations_json
+                result.update(orjson.loads(allocations) if HAS_ORJSON else json.loads(allocations))
+            except json.JSONDecodeError:
+                pass
+        self._memory_allocations_cache = (self.memory_allocations_json, result)
+        return dict(result)
 
     def set_memory_allocation(self, path: str, percent: int) -> bool:
         """Set a memory allocation by path. Returns True if successful."""
         allocations = self.get_memory_allocations()
 
         # Validate the path
-        valid_paths = ["knowledge", "recent_actions", "rooms"]
         # Also allow room.{id} paths for per-room allocation (stored separately in RoomMembership)
-        if path not in valid_paths and not path.startswith("room."):
+        if path not in self.DEFAULT_MEMORY_ALLOCATIONS and not path.startswith("room."):
             return False
 
         # Validate percentage
@@ -166,5 +264,9 @@ class AIAgent:
 
         # Set the allocation
         allocations[path] = percent
-        self.memory_allocations_json = json.dumps(allocations)
+        # Values are small ints, so orjson can always encode these
+        if HAS_ORJSON:
+            self.memory_allocations_json = orjson.dumps(allocations).decode()
+        else:
+            self.memory_allocations_json = json.dumps(allocations)
         return True
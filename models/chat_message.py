@@ -1,11 +1,44 @@
 """Chat message model representing a message in the chatroom."""
 
+import json
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
+from .compat import DATACLASS_SLOTS
+from .interned import canonical
+from .timestamps import utcnow
 
-@dataclass
+# Sender kinds, derived from sender_name (see classify_sender)
+SENDER_OTHER = 0
+SENDER_SYSTEM = 1
+SENDER_USER = 2  # "The Architect" or "User"
+SENDER_AGENT = 3  # sender_name is the agent's ID
+
+
+@lru_cache(maxsize=1024)
+def classify_sender(sender_name: str) -> Tuple[int, Optional[int]]:
+    """Return (sender kind, agent ID or None) for a message's sender_name.
+
+    A room only has a handful of distinct senders, so the cache turns the
+    string compares and int() parse into one dict lookup per message.
+    """
+    if sender_name == "System":
+        return SENDER_SYSTEM, None
+    if sender_name in ("The Architect", "User"):
+        return SENDER_USER, None
+    if sender_name.isdigit():
+        return SENDER_AGENT, int(sender_name)
+    return SENDER_OTHER, None
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ChatMessage:
     """Represents a chat message in a chatroom."""
 
@@ -14,7 +47,7 @@ class ChatMessage:
     sender_id: Optional[int] = None  # Foreign key to agents.id (None for system messages)
     sender_name: str = ""  # Display name (kept for convenience, but sender_id is source of truth)
     content: str = ""
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=utcnow)
     sequence_number: int = 0
 
     # Additional fields
@@ -42,26 +75,71 @@ class ChatMessage:
     @classmethod
     def from_dict(cls, data: dict) -> 'ChatMessage':
         """Create message from dictionary."""
-        timestamp = data.get('timestamp')
+        get = data.get
+        timestamp = get('timestamp')
         if isinstance(timestamp, str):
             timestamp = datetime.fromisoformat(timestamp)
         elif timestamp is None:
-            timestamp = datetime.utcnow()
+            timestamp = utcnow()
 
         return cls(
-            id=data.get('id'),
-            room_id=int(data.get('room_id', 0)),
-            sender_id=data.get('sender_id'),
-            sender_name=data.get('sender_name', ''),
-            content=data.get('content', ''),
+            id=get('id'),
+            room_id=int(get('room_id', 0)),
+            sender_id=get('sender_id'),
+            sender_name=get('sender_name', ''),
+            content=get('content', ''),
             timestamp=timestamp,
-            sequence_number=data.get('sequence_number', 0),
-            message_type=data.get('message_type', 'text'),
-            image_url=data.get('image_url'),
-            image_path=data.get('image_path'),
-            reply_to_id=data.get('reply_to_id')
+            sequence_number=get('sequence_number', 0),
+            message_type=canonical(get('message_type', 'text')),
+            image_url=get('image_url'),
+            image_path=get('image_path'),
+            reply_to_id=get('reply_to_id')
         )
 
+    @classmethod
+    def from_dict_unchecked(cls, data) -> 'ChatMessage':
+        """Create message from a trusted row of our own messages table.
+
+        Skips defaults and coercion - every column must be present
+        (dict or sqlite3.Row). Use from_dict for imported data.
+        """
+        return cls(
+            id=data['id'],
+            room_id=data['room_id'],
+            sender_id=data['sender_id'],
+            sender_name=data['sender_name'],
+            content=data['content'],
+            # Not parse_iso: message timestamps are unique, so memoizing them
+            # only adds cache misses and evicts the agents' repeating stamps
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            sequence_number=data['sequence_number'],
+            message_type=canonical(data['message_type']),
+            image_url=data['image_url'],
+            image_path=data['image_path'],
+            reply_to_id=data['reply_to_id']
+        )
+
+    @classmethod
+    def from_json_list(cls, buf: Union[str, bytes]) -> List['ChatMessage']:
+        """Create messages from a JSON array of message dicts.
+
+        The whole array is decoded in one parser call (orjson when available)
+        rather than one json.loads per message.
+        """
+        items = orjson.loads(buf) if HAS_ORJSON else json.loads(buf)
+        from_dict = cls.from_dict
+        return [from_dict(item) for item in items]
+
+    @property
+    def sender_kind(self) -> int:
+        """One of the SENDER_* constants."""
+        return classify_sender(self.sender_name)[0]
+
+    @property
+    def sender_agent_id(self) -> Optional[int]:
+        """Agent ID of the sender, or None if not sent by an agent."""
+        return classify_sender(self.sender_name)[1]
+
     @property
     def is_system_message(self) -> bool:
         """Check if this is a system message (join/leave)."""
@@ -9,8 +9,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+from .compat import DATACLASS_SLOTS
+from .interned import canonical
+from .timestamps import utcnow, parse_iso
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class ChatRoom:
     """Lightweight view of an agent when treated as a room.
 
@@ -24,7 +28,7 @@ class ChatRoom:
 
     id: Optional[int] = None
     name: str = ""
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utcnow)
 
     def to_dict(self) -> dict:
         """Convert room to dictionary for database storage."""
@@ -37,20 +41,21 @@ class ChatRoom:
     @classmethod
     def from_dict(cls, data: dict) -> 'ChatRoom':
         """Create room from dictionary."""
-        created_at = data.get('created_at')
+        get = data.get
+        created_at = get('created_at')
         if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
+            created_at = parse_iso(created_at)
         elif created_at is None:
-            created_at = datetime.utcnow()
+            created_at = utcnow()
 
         return cls(
-            id=data.get('id'),
-            name=data.get('name', ''),
+            id=get('id'),
+            name=get('name', ''),
             created_at=created_at
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RoomMembership:
     """Represents an agent's membership in a room with per-room state.
 
@@ -61,7 +66,7 @@ class RoomMembership:
     id: Optional[int] = None
     agent_id: int = 0  # The agent who is the member
     room_id: int = 0   # The room (which is also an agent's ID)
-    joined_at: datetime = field(default_factory=datetime.utcnow)
+    joined_at: datetime = field(default_factory=utcnow)
     last_message_id: str = "0"  # Last message sequence number seen in this room
     status: str = "idle"  # idle, thinking, typing
     last_response_time: Optional[datetime] = None  # For WPM rate limiting
@@ -93,27 +98,28 @@ class RoomMembership:
     @classmethod
     def from_dict(cls, data: dict) -> 'RoomMembership':
         """Create membership from dictionary."""
-        joined_at = data.get('joined_at')
+        get = data.get
+        joined_at = get('joined_at')
         if isinstance(joined_at, str):
-            joined_at = datetime.fromisoformat(joined_at)
+            joined_at = parse_iso(joined_at)
         elif joined_at is None:
-            joined_at = datetime.utcnow()
+            joined_at = utcnow()
 
-        last_response_time = data.get('last_response_time')
+        last_response_time = get('last_response_time')
         if isinstance(last_response_time, str):
-            last_response_time = datetime.fromisoformat(last_response_time)
+            last_response_time = parse_iso(last_response_time)
 
         return cls(
-            id=data.get('id'),
-            agent_id=int(data.get('agent_id', 0)),
-            room_id=int(data.get('room_id', 0)),
+            id=get('id'),
+            agent_id=int(get('agent_id', 0)),
+            room_id=int(get('room_id', 0)),
             joined_at=joined_at,
-            last_message_id=data.get('last_message_id', '0'),
-            status=data.get('status', 'idle'),
+            last_message_id=get('last_message_id', '0'),
+            status=canonical(get('status', 'idle')),
             last_response_time=last_response_time,
-            last_response_word_count=int(data.get('last_response_word_count', 0)),
-            next_heartbeat_offset=float(data.get('next_heartbeat_offset', 0.0)),
-            attention_pct=float(data.get('attention_pct', 10.0)),
-            is_dynamic=bool(data.get('is_dynamic', False)),
-            is_self_room=bool(data.get('is_self_room', False))
+            last_response_word_count=int(get('last_response_word_count', 0)),
+            next_heartbeat_offset=float(get('next_heartbeat_offset', 0.0)),
+            attention_pct=float(get('attention_pct', 10.0)),
+            is_dynamic=bool(get('is_dynamic', False)),
+            is_self_room=bool(get('is_self_room', False))
         )
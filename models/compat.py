@@ -0,0 +1,6 @@
+"""Python version compatibility shims for the models."""
+
+import sys
+
+# dataclass(slots=True) needs 3.10+; older interpreters just keep __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
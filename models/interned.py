@@ -0,0 +1,27 @@
+"""Canonical instances of the small enum-like strings stored on models.
+
+Values loaded from the database or JSON are fresh string objects per row;
+mapping them to one shared instance keeps thousands of loaded messages and
+agents from each carrying their own copy of "text" or "idle".
+"""
+
+import sys
+
+_CANONICAL = {
+    value: sys.intern(value)
+    for value in (
+        # AIAgent.agent_type
+        "persona", "bot",
+        # AIAgent.status / RoomMembership.status
+        "idle", "thinking", "typing", "responded", "sleeping",
+        # HUD input/output formats
+        "json", "compact_json", "toon",
+        # ChatMessage.message_type
+        "text", "image", "system", "starter",
+    )
+}
+
+
+def canonical(value):
+    """Return the shared instance of a known enum-like string, else value unchanged."""
+    return _CANONICAL.get(value, value)
@@ -1,7 +1,54 @@
 """Self-concept model - flexible JSON store for agent's knowledge."""
 
 import json
-from typing import Any, Optional
+import re
+from functools import lru_cache
+from typing import Any, Optional, Union
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Sentinel for "path doesn't exist" (distinct from a stored None)
+_MISSING = object()
+
+
+# One token of a dot path: a "quoted" or 'quoted' run (closing quote optional,
+# as an unterminated quote runs to the end), a bare run, or a separator dot
+_PATH_TOKEN = re.compile(r'"([^"]*)"?|\'([^\']*)\'?|([^.\'"]+)|\.')
+
+
+@lru_cache(maxsize=4096)
+def _split_path(path: str) -> tuple:
+    """Parse a dot path into components, handling quoted segments.
+
+    Cached: agents hit the same handful of paths every turn, and the
+    result is a pure function of the (immutable) path string.
+    """
+    if not path:
+        return ()
+
+    if '"' not in path and "'" not in path:
+        return tuple(filter(None, path.split('.')))
+
+    components = []
+    parts = []
+    for match in _PATH_TOKEN.finditer(path):
+        if match.lastindex is None:  # separator
+            segment = "".join(parts)
+            if segment:
+                components.append(segment)
+            parts = []
+        else:
+            parts.append(match.group(match.lastindex))
+
+    segment = "".join(parts)
+    if segment:
+        components.append(segment)
+
+    return tuple(components)
 
 
 class SelfConcept:
@@ -27,22 +74,37 @@ class SelfConcept:
     def __init__(self, data: dict = None):
         """Initialize with optional data dict."""
         self._data = data if data is not None else {}
+        # path string -> value for paths already resolved by get().
+        # Reads vastly outnumber writes, so any set/delete just clears it.
+        self._flat = {}
 
     def to_dict(self) -> dict:
-        """Return the internal data dict."""
+        """Return the internal data dict.
+
+        Treat it as read-only - changes made through it bypass the get() cache.
+        """
         return self._data
 
     def to_json(self) -> str:
-        """Serialize to JSON string."""
+        """Serialize to JSON string (orjson when available)."""
+        if HAS_ORJSON:
+            try:
+                return orjson.dumps(self._data, option=orjson.OPT_NON_STR_KEYS).decode()
+            except TypeError:
+                pass  # e.g. integers beyond 64 bits - stdlib json handles these
         return json.dumps(self._data)
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'SelfConcept':
-        """Create from JSON string."""
+    def from_json(cls, json_str: Union[str, bytes]) -> 'SelfConcept':
+        """Create from JSON string (or UTF-8 bytes, passed straight to the parser)."""
         if not json_str:
             return cls()
+        # Anything but an object ends up empty anyway - skip the parse
+        # (and the exception) for blank or obviously invalid input
+        if json_str.lstrip()[:1] not in ('{', b'{'):
+            return cls()
         try:
-            data = json.loads(json_str)
+            data = orjson.loads(json_str) if HAS_ORJSON else json.loads(json_str)
             # Handle migration from old format
             if isinstance(data, dict):
                 # Check if it's old format with facts/theories/relationships
@@ -73,37 +135,32 @@ class SelfConcept:
                                 new_data['people'][str(r)] = {"notes": ""}
                     return cls(new_data)
             return cls(data if isinstance(data, dict) else {})
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
             return cls()
 
-    def _parse_path(self, path: str) -> list:
-        """Parse a dot path into components, handling quoted segments."""
-        if not path:
-            return []
-
-        components = []
-        current = ""
-        in_quotes = False
-        quote_char = None
-
-        for char in path:
-            if char in ('"', "'") and not in_quotes:
-                in_quotes = True
-                quote_char = char
-            elif char == quote_char and in_quotes:
-                in_quotes = False
-                quote_char = None
-            elif char == '.' and not in_quotes:
-                if current:
-                    components.append(current)
-                current = ""
-            else:
-                current += char
-
-        if current:
-            components.append(current)
+    def _walk(self, components: tuple) -> Any:
+        """Follow path components from the root.
 
-        return components
+        Returns the node reached, or _MISSING if any step doesn't exist.
+        """
+        current = self._data
+        for component in components:
+            if isinstance(current, dict):
+                # Single lookup instead of `in` + `[]`
+                current = current.get(component, _MISSING)
+                if current is _MISSING:
+                    return _MISSING
+            elif isinstance(current, list):
+                try:
+                    idx = int(component)
+                except ValueError:
+                    return _MISSING
+                if not 0 <= idx < len(current):
+                    return _MISSING
+                current = current[idx]
+            else:
+                return _MISSING
+        return current
 
     def get(self, path: str) -> Optional[Any]:
         """
@@ -113,29 +170,19 @@ class SelfConcept:
             get("people.Smarty Jones.trust") -> 0.8
             get("projects.ideas") -> ["flexible schemas", "dot paths"]
         """
-        components = self._parse_path(path)
+        value = self._flat.get(path, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        components = _split_path(path)
         if not components:
             return self._data
 
-        current = self._data
-        for component in components:
-            if isinstance(current, dict):
-                if component not in current:
-                    return None
-                current = current[component]
-            elif isinstance(current, list):
-                try:
-                    idx = int(component)
-                    if 0 <= idx < len(current):
-                        current = current[idx]
-                    else:
-                        return None
-                except ValueError:
-                    return None
-            else:
-                return None
-
-        return current
+        value = self._walk(components)
+        if value is _MISSING:
+            return None
+        self._flat[path] = value
+        return value
 
     def set(self, path: str, value: Any) -> bool:
         """
@@ -145,7 +192,7 @@ class SelfConcept:
             set("people.Smarty Jones.trust", 0.9)
             set("projects.current", "new feature")
         """
-        components = self._parse_path(path)
+        components = _split_path(path)
         if not components:
             return False
 
@@ -159,6 +206,7 @@ class SelfConcept:
             current = current[component]
 
         current[components[-1]] = value
+        self._flat.clear()
         return True
 
     def delete(self, path: str) -> bool:
@@ -169,38 +217,23 @@ class SelfConcept:
             delete("people.Smarty Jones")
             delete("projects.ideas.0")  # Delete first item in list
         """
-        components = self._parse_path(path)
+        components = _split_path(path)
         if not components:
             return False
 
-        current = self._data
-        for component in components[:-1]:
-            if isinstance(current, dict):
-                if component not in current:
-                    return False
-                current = current[component]
-            elif isinstance(current, list):
-                try:
-                    idx = int(component)
-                    if 0 <= idx < len(current):
-                        current = current[idx]
-                    else:
-                        return False
-                except ValueError:
-                    return False
-            else:
-                return False
-
+        current = self._walk(components[:-1])
         last = components[-1]
         if isinstance(current, dict):
             if last in current:
                 del current[last]
+                self._flat.clear()
                 return True
         elif isinstance(current, list):
             try:
                 idx = int(last)
                 if 0 <= idx < len(current):
                     current.pop(idx)
+                    self._flat.clear()
                     return True
             except ValueError:
                 pass
@@ -215,6 +248,12 @@ class SelfConcept:
             append("projects.ideas", "new idea")
             append("people.Smarty Jones.tags", "helpful")
         """
+        # Hot path: repeated appends to a list get() has already resolved
+        cached = self._flat.get(path)
+        if type(cached) is list:
+            cached.append(value)
+            return True
+
         existing = self.get(path)
 
         if existing is None:
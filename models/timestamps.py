@@ -0,0 +1,45 @@
+"""Timestamp helpers shared by the models.
+
+Timestamps are stored as naive UTC ISO strings (that's what every row in
+existing databases holds), so utcnow() keeps returning naive datetimes.
+"""
+
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Tuple
+
+# (epoch second, ISO string) of the last utcnow_iso_seconds() result; replaced
+# as a whole so concurrent readers never see a mismatched pair
+_iso_second: Tuple[int, str] = (0, "")
+
+
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime (non-deprecated datetime.utcnow)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def utcnow_iso_seconds() -> str:
+    """Current UTC time as a naive ISO string, to the second.
+
+    The string is built at most once per second and shared by every caller
+    in that second - for status stamps that get polled, not stored data.
+    """
+    global _iso_second
+    now = int(time.time())
+    cached = _iso_second
+    if cached[0] != now:
+        cached = (now, datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat())
+        _iso_second = cached
+    return cached[1]
+
+
+@lru_cache(maxsize=8192)
+def parse_iso(value: str) -> datetime:
+    """datetime.fromisoformat, memoized - batch loads repeat the same timestamps.
+
+    Meant for values that recur across loads (agent/room created_at and
+    the like); per-message timestamps are unique and parse directly.
+    Safe to share results since datetimes are immutable.
+    """
+    return datetime.fromisoformat(value)
@@ -5,16 +5,69 @@ Loads prompts from prompts.json for easy editing via the UI.
 
 import json
 import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+import config
 
 # Path to the JSON prompts file
 PROMPTS_FILE = os.path.join(os.path.dirname(__file__), "prompts.json")
 
+# Saved edits of the prompt blocks defined in config (key -> text)
+PROMPT_BLOCKS_FILE = os.path.join(os.path.dirname(__file__), "prompt_overrides.json")
+PROMPT_BLOCK_KEYS = ("system_directives", "persona_instructions", "bot_instructions", "batch_instructions")
+
+# ((st_mtime_ns, st_size), parsed data) of the last load
+_prompts_cache: Optional[Tuple[Tuple[int, int], dict]] = None
+_prompts_checked_at = 0.0  # time.monotonic() of the last stat of PROMPTS_FILE
+
+
+def _read_json(path: str):
+    if HAS_ORJSON:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data) -> None:
+    # Same layout either way: 2-space indent, non-ASCII written as-is
+    if HAS_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
 
 def load_prompts() -> dict:
-    """Load prompts from JSON file."""
+    """Load prompts from JSON file.
+
+    The parsed file is cached until its mtime or size changes, and the file
+    is stat'ed at most every PROMPTS_RECHECK_SECONDS. The returned dict is
+    shared between callers, so copy it before editing.
+    """
+    global _prompts_cache, _prompts_checked_at
+    cached = _prompts_cache
+    now = time.monotonic()
+    if cached is not None and now - _prompts_checked_at < config.PROMPTS_RECHECK_SECONDS:
+        return cached[1]
     try:
-        with open(PROMPTS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        _prompts_checked_at = now
+        st = os.stat(PROMPTS_FILE)
+        key = (st.st_mtime_ns, st.st_size)
+        if _prompts_cache is not None and _prompts_cache[0] == key:
+            return _prompts_cache[1]
+        data = _read_json(PROMPTS_FILE)
+        _prompts_cache = (key, data)
+        return data
     except Exception as e:
         print(f"Error loading prompts: {e}")
         return {}
@@ -22,15 +75,67 @@ def load_prompts() -> dict:
 
 def save_prompts(data: dict) -> bool:
     """Save prompts to JSON file."""
+    global _prompts_cache
+    _prompts_cache = None
     try:
-        with open(PROMPTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_json(PROMPTS_FILE, data)
         return True
     except Exception as e:
         print(f"Error saving prompts: {e}")
         return False
 
 
+# Loaded on first use; replaced (never mutated) on save so readers need no lock
+_prompt_block_overrides: Optional[Dict[str, str]] = None
+_prompt_blocks_lock = threading.Lock()
+
+
+def _get_prompt_block_overrides() -> Dict[str, str]:
+    global _prompt_block_overrides
+    if _prompt_block_overrides is None:
+        try:
+            _prompt_block_overrides = _read_json(PROMPT_BLOCKS_FILE)
+        except FileNotFoundError:
+            _prompt_block_overrides = {}
+        except Exception as e:
+            print(f"Error loading prompt overrides: {e}")
+            _prompt_block_overrides = {}
+    return _prompt_block_overrides
+
+
+def get_prompt_block(key: str) -> str:
+    """Get a prompt block (e.g. "system_directives"), preferring a saved override
+    over the default in config."""
+    overrides = _get_prompt_block_overrides()
+    if key in overrides:
+        return overrides[key]
+    return getattr(config, key.upper())
+
+
+def get_prompt_blocks() -> Dict[str, str]:
+    """Get all prompt blocks with overrides applied."""
+    return {key: get_prompt_block(key) for key in PROMPT_BLOCK_KEYS}
+
+
+def save_prompt_blocks(data: dict) -> None:
+    """Override the prompt blocks present in `data` and persist the overrides."""
+    global _prompt_block_overrides
+    with _prompt_blocks_lock:
+        overrides = dict(_get_prompt_block_overrides())
+        overrides.update((key, data[key]) for key in PROMPT_BLOCK_KEYS if key in data)
+        _write_json(PROMPT_BLOCKS_FILE, overrides)
+        _prompt_block_overrides = overrides
+
+
+def prompts_snapshot() -> Tuple[dict, Dict[str, str]]:
+    """Get the current prompts data and prompt block overrides.
+
+    Both are replaced, never mutated, when they change, so a value derived
+    from them can be cached until the snapshot differs by identity.
+    """
+    return load_prompts(), _get_prompt_block_overrides()
+
+
 def get_prompt(path: str, default: str = "") -> str:
     """
     Get a prompt value by dot-separated path.
@@ -75,13 +180,29 @@ def _build_sections_recursive(data: dict, prefix: str = "") -> list:
     return sections
 
 
-def build_technical_instructions() -> str:
-    """Build the technical format instructions dynamically from JSON."""
+# node name -> (load_prompts() dict it was built from, joined sections)
+_joined_sections_cache: Dict[str, Tuple[dict, str]] = {}
+
+
+def _joined_sections(name: str) -> str:
+    """Join the sections of a top-level prompts.json node.
+
+    The result is reused until load_prompts() hands out a freshly parsed
+    dict, i.e. until prompts.json changes.
+    """
     data = load_prompts()
-    technical = data.get("technical", {})
+    cached = _joined_sections_cache.get(name)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    sections = _build_sections_recursive(data.get(name, {}))
+    text = "\n\n".join(s for s in sections if s)
+    _joined_sections_cache[name] = (data, text)
+    return text
+
 
-    sections = _build_sections_recursive(technical)
-    return "\n\n".join(s for s in sections if s)
+def build_technical_instructions() -> str:
+    """Build the technical format instructions dynamically from JSON."""
+    return _joined_sections("technical")
 
 
 def build_agent_philosophy() -> str:
@@ -90,11 +211,7 @@ def build_agent_philosophy() -> str:
     This is the tunable "soul" that shapes agent behavior.
     Used for PERSONA type agents.
     """
-    data = load_prompts()
-    philosophy = data.get("philosophy", {})
-
-    sections = _build_sections_recursive(philosophy)
-    return "\n\n".join(s for s in sections if s)
+    return _joined_sections("philosophy")
 
 
 def build_persona_instructions() -> str:
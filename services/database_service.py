@@ -3,8 +3,9 @@
 import sqlite3
 import json
 import os
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from models import AIAgent, ChatMessage, ChatRoom, RoomMembership
+from models.timestamps import utcnow
 from .logging_config import get_logger
 
 logger = get_logger("database")
@@ -17,6 +18,7 @@ class DatabaseService:
     - **Agents**: AI agents and The Architect (human user)
     - **Messages**: Chat messages in rooms
     - **Room Memberships**: Agent membership in rooms (agent.id = room.id)
+    - **Reactions**: Message reactions (thumbs_up, thumbs_down, brain, heart)
 
     The database uses SQLite with automatic schema migrations. New columns
     are added automatically when the application starts.
@@ -106,6 +108,20 @@ class DatabaseService:
                 )
             ''')
 
+            # Create message_reactions table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS message_reactions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    message_id INTEGER NOT NULL,
+                    reactor_id INTEGER NOT NULL,
+                    reaction_type TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (message_id) REFERENCES messages(id) ON DELETE CASCADE,
+                    FOREIGN KEY (reactor_id) REFERENCES agents(id) ON DELETE CASCADE,
+                    UNIQUE(message_id, reactor_id, reaction_type)
+                )
+            ''')
+
             conn.commit()
 
             # Migrate existing tables if needed
@@ -179,6 +195,11 @@ class DatabaseService:
                 cursor.execute(f"ALTER TABLE messages ADD COLUMN {col_name} {col_def}")
                 logger.info(f"Added column {col_name} to messages table")
 
+        # Room history reads filter by room and order/page by sequence number
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_room_seq ON messages(room_id, sequence_number)"
+        )
+
         conn.commit()
 
     # Agent operations
@@ -188,7 +209,7 @@ class DatabaseService:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM agents ORDER BY created_at')
             rows = cursor.fetchall()
-            agents = [AIAgent.from_dict(dict(row)) for row in rows]
+            agents = [AIAgent.from_dict_unchecked(row) for row in rows]
             logger.debug(f"Retrieved {len(agents)} agents")
             return agents
 
@@ -198,7 +219,18 @@ class DatabaseService:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM agents WHERE id = ?', (agent_id,))
             row = cursor.fetchone()
-            return AIAgent.from_dict(dict(row)) if row else None
+            return AIAgent.from_dict_unchecked(row) if row else None
+
+    def get_agents_by_ids(self, agent_ids: Iterable[int]) -> Dict[int, AIAgent]:
+        """Get several agents in one query, keyed by ID (missing IDs are omitted)."""
+        ids = list(set(agent_ids))
+        if not ids:
+            return {}
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ','.join('?' * len(ids))
+            cursor.execute(f'SELECT * FROM agents WHERE id IN ({placeholders})', ids)
+            return {row['id']: AIAgent.from_dict_unchecked(row) for row in cursor.fetchall()}
 
     def save_agent(self, agent: AIAgent) -> int:
         """Save or update an agent. Returns the agent ID."""
@@ -282,6 +314,18 @@ class DatabaseService:
             conn.commit()
             return agent.id
 
+    def update_self_concepts(self, concepts: Dict[int, str]) -> None:
+        """Write several agents' self-concept JSON in one transaction (agent ID -> JSON)."""
+        if not concepts:
+            return
+        with self._get_connection() as conn:
+            conn.executemany(
+                'UPDATE agents SET self_concept_json = ? WHERE id = ?',
+                [(blob, agent_id) for agent_id, blob in concepts.items()]
+            )
+            conn.commit()
+        logger.debug(f"Updated self-concepts for {len(concepts)} agents")
+
     def delete_agent(self, agent_id: int) -> bool:
         """Delete an agent by ID."""
         with self._get_connection() as conn:
@@ -299,7 +343,7 @@ class DatabaseService:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM agents WHERE is_architect = 1')
             row = cursor.fetchone()
-            return AIAgent.from_dict(dict(row)) if row else None
+            return AIAgent.from_dict_unchecked(row) if row else None
 
     def get_ai_agents(self) -> List[AIAgent]:
         """Get all non-Architect agents (the AI agents that get polled)."""
@@ -307,7 +351,7 @@ class DatabaseService:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM agents WHERE is_architect = 0 ORDER BY created_at')
             rows = cursor.fetchall()
-            return [AIAgent.from_dict(dict(row)) for row in rows]
+            return [AIAgent.from_dict_unchecked(row) for row in rows]
 
     # Message operations
     def get_all_messages(self) -> List[ChatMessage]:
@@ -316,7 +360,7 @@ class DatabaseService:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM messages ORDER BY sequence_number')
             rows = cursor.fetchall()
-            return [ChatMessage.from_dict(dict(row)) for row in rows]
+            return [ChatMessage.from_dict_unchecked(row) for row in rows]
 
     def get_messages_since(self, sequence_number: int) -> List[ChatMessage]:
         """Get messages after a given sequence number."""
@@ -328,7 +372,7 @@ class DatabaseService:
                 ORDER BY sequence_number
             ''', (sequence_number,))
             rows = cursor.fetchall()
-            return [ChatMessage.from_dict(dict(row)) for row in rows]
+            return [ChatMessage.from_dict_unchecked(row) for row in rows]
 
     def get_next_sequence_number(self) -> int:
         """Get the next sequence number for a message."""
@@ -385,6 +429,41 @@ class DatabaseService:
             conn.commit()
             return message.id
 
+    def add_messages(self, messages: List[ChatMessage]) -> None:
+        """Insert new messages in one transaction.
+
+        Each message gets the next sequence number in list order; its id and
+        sequence_number are set on the object.
+        """
+        if not messages:
+            return
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT MAX(sequence_number) FROM messages')
+            seq = cursor.fetchone()[0] or 0
+            for message in messages:
+                seq += 1
+                message.sequence_number = seq
+                cursor.execute('''
+                    INSERT INTO messages (room_id, sender_id, sender_name, content, timestamp, sequence_number,
+                                         message_type, image_url, image_path, reply_to_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    message.room_id,
+                    message.sender_id,
+                    message.sender_name,
+                    message.content,
+                    message.timestamp.isoformat() if message.timestamp else None,
+                    message.sequence_number,
+                    message.message_type,
+                    message.image_url,
+                    message.image_path,
+                    message.reply_to_id
+                ))
+                message.id = cursor.lastrowid
+            conn.commit()
+            logger.debug(f"Saved {len(messages)} messages in one transaction")
+
     def clear_messages(self) -> None:
         """Delete all messages."""
         with self._get_connection() as conn:
@@ -448,6 +527,20 @@ class DatabaseService:
             rows = cursor.fetchall()
             return [RoomMembership.from_dict(dict(row)) for row in rows]
 
+    def get_room_members_bulk(self, room_ids: Iterable[int]) -> Dict[int, List[RoomMembership]]:
+        """Get memberships for several rooms in one query, keyed by room ID."""
+        ids = list(set(room_ids))
+        result: Dict[int, List[RoomMembership]] = {room_id: [] for room_id in ids}
+        if not ids:
+            return result
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ','.join('?' * len(ids))
+            cursor.execute(f'SELECT * FROM room_members WHERE room_id IN ({placeholders})', ids)
+            for row in cursor.fetchall():
+                result[row['room_id']].append(RoomMembership.from_dict(dict(row)))
+        return result
+
     def get_agent_memberships(self, agent_id: int) -> List[RoomMembership]:
         """Get all room memberships for an agent."""
         with self._get_connection() as conn:
@@ -530,16 +623,28 @@ class DatabaseService:
                 logger.info(f"Deleted membership: agent {agent_id} from room {room_id}")
             return deleted
 
-    def get_messages_for_room(self, room_id: int) -> List[ChatMessage]:
-        """Get all messages for a specific room."""
+    def get_messages_for_room(self, room_id: int, limit: Optional[int] = None,
+                              before_seq: Optional[int] = None) -> List[ChatMessage]:
+        """Get messages for a specific room, oldest first.
+
+        With `limit`, only the newest `limit` messages (before `before_seq`,
+        if given) are read from the database.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                'SELECT * FROM messages WHERE room_id = ? ORDER BY sequence_number',
-                (room_id,)
-            )
+            if limit is None and before_seq is None:
+                cursor.execute(
+                    'SELECT * FROM messages WHERE room_id = ? ORDER BY sequence_number',
+                    (room_id,)
+                )
+                return [ChatMessage.from_dict_unchecked(row) for row in cursor.fetchall()]
+            cursor.execute('''
+                SELECT * FROM messages
+                WHERE room_id = ? AND (? IS NULL OR sequence_number < ?)
+                ORDER BY sequence_number DESC LIMIT ?
+            ''', (room_id, before_seq, before_seq, -1 if limit is None else limit))
             rows = cursor.fetchall()
-            return [ChatMessage.from_dict(dict(row)) for row in rows]
+            return [ChatMessage.from_dict_unchecked(row) for row in reversed(rows)]
 
     def get_messages_for_room_since(self, room_id: int, sequence_number: int) -> List[ChatMessage]:
         """Get messages for a room after a given sequence number."""
@@ -551,7 +656,29 @@ class DatabaseService:
                 ORDER BY sequence_number
             ''', (room_id, sequence_number))
             rows = cursor.fetchall()
-            return [ChatMessage.from_dict(dict(row)) for row in rows]
+            return [ChatMessage.from_dict_unchecked(row) for row in rows]
+
+    def get_recent_messages_bulk(self, room_ids: Iterable[int], limit: int) -> Dict[int, List[ChatMessage]]:
+        """Get the last `limit` messages of several rooms in one query, keyed by room ID."""
+        ids = list(set(room_ids))
+        result: Dict[int, List[ChatMessage]] = {room_id: [] for room_id in ids}
+        if not ids:
+            return result
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ','.join('?' * len(ids))
+            cursor.execute(f'''
+                SELECT * FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY room_id ORDER BY sequence_number DESC
+                    ) AS rn
+                    FROM messages WHERE room_id IN ({placeholders})
+                ) WHERE rn <= ?
+                ORDER BY room_id, sequence_number
+            ''', (*ids, limit))
+            for row in cursor.fetchall():
+                result[row['room_id']].append(ChatMessage.from_dict_unchecked(row))
+        return result
 
     def clear_room_messages(self, room_id: int) -> None:
         """Delete all messages in a room."""
@@ -562,10 +689,49 @@ class DatabaseService:
             logger.info(f"Cleared messages for room {room_id}")
 
     # Message reaction operations
+    def add_reaction(self, message_id: int, reactor_id: int, reaction_type: str) -> int:
+        """Add a reaction to a message. Returns the reaction ID (0 if already present)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('''
+                    INSERT INTO message_reactions (message_id, reactor_id, reaction_type, created_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (message_id, reactor_id, reaction_type, utcnow().isoformat()))
+                conn.commit()
+                logger.info(f"Agent {reactor_id} reacted to message {message_id} with {reaction_type}")
+                return cursor.lastrowid
+            except sqlite3.IntegrityError:
+                # Already reacted with this type
+                logger.debug(f"Agent {reactor_id} already reacted to message {message_id} with {reaction_type}")
+                return 0
+
+    def get_reactions_summary_bulk(self, message_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+        """Get reaction counts by type for many messages in one grouped query.
+
+        Messages without reactions are omitted from the result.
+        """
+        ids = list(set(message_ids))
+        if not ids:
+            return {}
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ','.join('?' * len(ids))
+            cursor.execute(f'''
+                SELECT message_id, reaction_type, COUNT(*) as count
+                FROM message_reactions
+                WHERE message_id IN ({placeholders})
+                GROUP BY message_id, reaction_type
+            ''', ids)
+            summary: Dict[int, Dict[str, int]] = {}
+            for row in cursor.fetchall():
+                summary.setdefault(row['message_id'], {})[row['reaction_type']] = row['count']
+            return summary
+
     def get_message_by_id(self, message_id: int) -> Optional[ChatMessage]:
         """Get a message by its ID."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM messages WHERE id = ?', (message_id,))
             row = cursor.fetchone()
-            return ChatMessage.from_dict(dict(row)) if row else None
+            return ChatMessage.from_dict_unchecked(row) if row else None
@@ -11,8 +11,9 @@ import json
 import threading
 import time
 import random
+from collections import deque
 from datetime import datetime
-from typing import Callable, List, Optional, Dict
+from typing import Callable, Deque, List, Optional, Dict, Tuple
 from .openai_service import OpenAIService
 from .database_service import DatabaseService
 from .hud_service import HUDService
@@ -20,9 +21,16 @@ from .room_service import RoomService
 from .logging_config import get_logger
 from models import AIAgent, ChatRoom, RoomMembership, ChatMessage
 import config
+import prompts
 
 logger = get_logger("heartbeat")
 
+# Instructions sent alongside every batched HUD
+BATCH_REQUEST_INSTRUCTIONS = (
+    "You are processing multiple agents. Read each agent's context in the HUD "
+    "and respond with JSON containing an 'agents' array with actions for each agent."
+)
+
 
 class HeartbeatService:
     """Handles periodic polling of AI agents with staggered, randomized timing.
@@ -88,6 +96,13 @@ class HeartbeatService:
         self._active_agents: set = set()
         self._active_agents_lock = threading.Lock()
 
+        # Batched mode: model -> queue of (enqueued_at, agent) awaiting a batch
+        self._pending_batches: Dict[str, Deque[Tuple[float, AIAgent]]] = {}
+        # model -> measured tokens per agent from the last batch (fixed cost excluded)
+        self._batch_agent_tokens: Dict[str, float] = {}
+        # (prompts snapshot, tokens) - see batch_fixed_cost_tokens()
+        self._batch_fixed_tokens: Optional[Tuple[Tuple[dict, Dict[str, str]], int]] = None
+
         # HUD history storage - dict of agent_id -> list of HUD entries
         self._hud_history: Dict[int, List[dict]] = {}
         self._hud_history_lock = threading.Lock()
@@ -144,6 +159,11 @@ class HeartbeatService:
             except Exception as e:
                 logger.error(f"Error in error callback: {e}")
 
+    @property
+    def hud_service(self) -> HUDService:
+        """The HUD builder, which also tracks agents' recent actions."""
+        return self._hud
+
     @property
     def is_running(self) -> bool:
         """Check if heartbeat is running."""
@@ -193,9 +213,10 @@ class HeartbeatService:
 
         self._thread = None
 
-        # Clear active agents
+        # Clear active agents and drop queued batches so they aren't sent after a restart
         with self._active_agents_lock:
             self._active_agents.clear()
+            self._pending_batches.clear()
 
         self._notify_status("Heartbeat stopped")
         logger.info("Heartbeat stopped")
@@ -240,7 +261,12 @@ class HeartbeatService:
             self._individual_heartbeat_loop()
 
     def _batched_heartbeat_loop(self) -> None:
-        """Batched heartbeat loop - collects agents and processes in batches."""
+        """Batched heartbeat loop - bundles due agents into per-model batches.
+
+        Due agents are collected every BATCH_HEARTBEAT_INTERVAL; a model's batch
+        is sent once it reaches its preferred size or its oldest agent has
+        waited BATCH_MAX_WAIT_MS, whichever comes first.
+        """
         tick_interval = config.BATCH_HEARTBEAT_INTERVAL
 
         while not self._stop_event.is_set():
@@ -267,7 +293,7 @@ class HeartbeatService:
                 due_agents = self.collect_due_agents()
 
                 if due_agents:
-                    # Mark all due agents as active
+                    # Mark all due agents as active (they stay active while queued)
                     with self._active_agents_lock:
                         for agent in due_agents:
                             self._active_agents.add(agent.id)
@@ -280,24 +306,30 @@ class HeartbeatService:
                         next_interval = max(1.0, min(10.0, next_interval))
                         self._agent_next_poll[agent.id] = current_time + next_interval
 
-                    # Group by model and process batches
-                    model_groups = self.group_agents_by_model(due_agents)
-
-                    logger.info(f"Processing {len(due_agents)} agents in {len(model_groups)} batch(es)")
-
-                    # Process each model group in a separate thread
-                    threads = []
-                    for model, agents in model_groups.items():
-                        thread = threading.Thread(
-                            target=self._process_batch_thread,
-                            args=(agents, model),
-                            daemon=True
-                        )
-                        thread.start()
-                        threads.append(thread)
-
-                # Sleep until next tick
-                time.sleep(tick_interval)
+                    self.enqueue_batch_agents(due_agents, current_time)
+
+                batches = self.take_ready_batches(current_time)
+                if batches:
+                    logger.info(
+                        f"Processing {sum(len(agents) for _, agents in batches)} agents "
+                        f"in {len(batches)} batch(es)"
+                    )
+
+                # Process each batch in a separate thread
+                for model, agents in batches:
+                    thread = threading.Thread(
+                        target=self._process_batch_thread,
+                        args=(agents, model),
+                        daemon=True
+                    )
+                    thread.start()
+
+                # Sleep until the next tick, or earlier if a pending batch times out first
+                wake_at = current_time + tick_interval
+                deadline = self._next_batch_deadline()
+                if deadline is not None:
+                    wake_at = min(wake_at, deadline)
+                self._stop_event.wait(max(0.01, wake_at - time.time()))
 
             except Exception as e:
                 logger.error(f"Batched heartbeat loop error: {e}", exc_info=True)
@@ -306,6 +338,88 @@ class HeartbeatService:
 
         logger.info("Batched heartbeat loop ended")
 
+    def batch_fixed_cost_tokens(self) -> int:
+        """Tokens every batch request pays regardless of how many agents it holds.
+
+        The shared HUD sections (system, meta) as serialized for a batch, plus
+        the batch security notice and the request instructions. Measured once
+        and cached until the prompts or prompt blocks change.
+        """
+        snapshot = prompts.prompts_snapshot()
+        cached = self._batch_fixed_tokens
+        if cached is not None and cached[0][0] is snapshot[0] and cached[0][1] is snapshot[1]:
+            return cached[1]
+        _, shared_tokens = self._hud.build_batched_hud(
+            [], {}, output_format='toon', record_telemetry=False
+        )
+        tokens = (
+            shared_tokens
+            + self._hud.estimate_tokens(config.BATCH_SECURITY_NOTICE)
+            + self._hud.estimate_tokens(BATCH_REQUEST_INSTRUCTIONS)
+        )
+        self._batch_fixed_tokens = (snapshot, tokens)
+        return tokens
+
+    def batch_preferred_size(self, model: str) -> int:
+        """Number of agents to send in one batch for this model.
+
+        A batch request decomposes as
+
+            context_limit >= fixed + BATCH_RESERVE_TOKENS + size * per_agent
+
+        where fixed is batch_fixed_cost_tokens(), BATCH_RESERVE_TOKENS is kept
+        free for the response, and per_agent is measured from the model's last
+        batch. BATCH_PREFERRED_SIZE is lowered to the largest size that fits.
+        """
+        size = config.BATCH_PREFERRED_SIZE
+        per_agent = self._batch_agent_tokens.get(model)
+        limit = config.MODEL_CONTEXT_LIMITS.get(model)
+        if per_agent and limit:
+            available = limit - self.batch_fixed_cost_tokens() - config.BATCH_RESERVE_TOKENS
+            size = min(size, int(available // per_agent))
+        return max(1, size)
+
+    def enqueue_batch_agents(self, agents: List[AIAgent], now: float) -> None:
+        """Queue due agents for batching, grouped by model.
+
+        Agents already queued for their model are skipped.
+        """
+        with self._active_agents_lock:
+            for model, model_agents in self.group_agents_by_model(agents).items():
+                queue = self._pending_batches.setdefault(model, deque())
+                queued_ids = {agent.id for _, agent in queue}
+                for agent in model_agents:
+                    if agent.id not in queued_ids:
+                        queued_ids.add(agent.id)
+                        queue.append((now, agent))
+
+    def take_ready_batches(self, now: float) -> List[Tuple[str, List[AIAgent]]]:
+        """Pop the batches that are ready to send.
+
+        Full batches (preferred size) are always ready; a partial batch is ready
+        once its oldest agent has waited BATCH_MAX_WAIT_MS.
+        """
+        max_wait = config.BATCH_MAX_WAIT_MS / 1000
+        sizes = {model: self.batch_preferred_size(model) for model in list(self._pending_batches)}
+        batches = []
+        with self._active_agents_lock:
+            for model, queue in self._pending_batches.items():
+                size = sizes.get(model, config.BATCH_PREFERRED_SIZE)
+                while len(queue) >= size:
+                    batches.append((model, [queue.popleft()[1] for _ in range(size)]))
+                if queue and now - queue[0][0] >= max_wait:
+                    batches.append((model, [agent for _, agent in queue]))
+                    queue.clear()
+        return batches
+
+    def _next_batch_deadline(self) -> Optional[float]:
+        """Time at which the oldest pending partial batch must be sent, if any."""
+        with self._active_agents_lock:
+            oldest = [queue[0][0] for queue in self._pending_batches.values() if queue]
+        if not oldest:
+            return None
+        return min(oldest) + config.BATCH_MAX_WAIT_MS / 1000
+
     def _process_batch_thread(self, agents: List[AIAgent], model: str) -> None:
         """Thread wrapper for batch processing - ensures cleanup."""
         try:
@@ -701,7 +815,7 @@ class HeartbeatService:
                 self._database.save_agent(agent)
 
             # Notify message change
-            self._room_service.notify_messages_changed()
+            self._room_service.notify_messages_changed(room.id)
 
             # Small pause between chunks
             if i < len(paragraphs) - 1:
@@ -726,59 +840,51 @@ class HeartbeatService:
 
     def _process_pending_actions(self, agent: AIAgent) -> None:
         """Process pending actions stored on agent by HUD service."""
-        # Process attention changes
-        if hasattr(agent, '_pending_attention'):
-            for change in agent._pending_attention:
-                self._process_attention_change(agent, change)
-            delattr(agent, '_pending_attention')
-
         # Process room actions
-        if hasattr(agent, '_pending_room_actions'):
+        if agent._pending_room_actions:
             for action in agent._pending_room_actions:
                 self._process_room_action(agent, action)
-            delattr(agent, '_pending_room_actions')
+            agent._pending_room_actions = []
 
         # Process billboard actions
-        if hasattr(agent, '_pending_billboard_action'):
+        if agent._pending_billboard_action is not None:
             self._process_billboard_action(agent, agent._pending_billboard_action)
-            delattr(agent, '_pending_billboard_action')
+            agent._pending_billboard_action = None
 
         # Process wake agent actions
-        if hasattr(agent, '_pending_wake_agents'):
+        if agent._pending_wake_agents:
             for target_id in agent._pending_wake_agents:
                 self._process_wake_agent(agent, target_id)
-            delattr(agent, '_pending_wake_agents')
+            agent._pending_wake_agents = []
 
-        # Process replies (handled separately from regular responses)
         # Process message actions (unified message format)
-        if hasattr(agent, '_pending_messages'):
+        if agent._pending_messages:
             for msg_data in agent._pending_messages:
                 self._process_message_action(agent, msg_data)
-            delattr(agent, '_pending_messages')
+            agent._pending_messages = []
 
-        # Process reactions
         # Process agent creation
-        if hasattr(agent, '_pending_create_agents'):
+        if agent._pending_create_agents:
             for create_data in agent._pending_create_agents:
                 self._process_create_agent(agent, create_data)
-            delattr(agent, '_pending_create_agents')
+            agent._pending_create_agents = []
 
         # Process agent alterations
-        if hasattr(agent, '_pending_alter_agents'):
+        if agent._pending_alter_agents:
             for alter_data in agent._pending_alter_agents:
                 self._process_alter_agent(agent, alter_data)
-            delattr(agent, '_pending_alter_agents')
+            agent._pending_alter_agents = []
 
         # Process agent retirements
-        if hasattr(agent, '_pending_retire_agents'):
+        if agent._pending_retire_agents:
             for target_id in agent._pending_retire_agents:
                 self._process_retire_agent(agent, target_id)
-            delattr(agent, '_pending_retire_agents')
+            agent._pending_retire_agents = []
 
         # Process sleep
-        if hasattr(agent, '_pending_sleep'):
+        if agent._pending_sleep is not None:
             self._process_sleep(agent, agent._pending_sleep)
-            delattr(agent, '_pending_sleep')
+            agent._pending_sleep = None
 
     def _process_attention_change(self, agent: AIAgent, change: dict) -> None:
         """Process an attention percentage change for a room."""
@@ -930,7 +1036,7 @@ class HeartbeatService:
             self._database.save_membership(membership)
 
             # Notify message change
-            self._room_service.notify_messages_changed()
+            self._room_service.notify_messages_changed(room_id)
 
             logger.info(f"Agent {agent.id} replied to message {reply_to_id} in room {room_id}")
             self._hud._record_action(agent.id, hud_action, "ok")
@@ -1158,6 +1264,7 @@ class HeartbeatService:
         # Add the reaction
         self._database.add_reaction(message_id, agent.id, reaction_type)
         self._hud._record_action(agent.id, hud_action, "ok")
+        self._room_service.notify_reactions_changed(message.room_id)
 
         # Adjust sender's heartbeat interval based on reaction
         sender_id_str = message.sender_name
@@ -1185,9 +1292,6 @@ class HeartbeatService:
             self._database.save_agent(sender)
             logger.info(f"Agent {sender_id} heartbeat adjusted from {old_interval}s to {sender.heartbeat_interval}s due to {reaction_type}")
 
-        # Notify so reaction and any status changes are visible
-        self._room_service.notify_messages_changed()
-
     def _apply_heartbeat_decay(self, agent: AIAgent) -> None:
         """Apply natural decay toward 10s heartbeat interval."""
         if agent.heartbeat_interval < 10.0:
@@ -1379,14 +1483,14 @@ class HeartbeatService:
 
             # Send to OpenAI
             model = valid_agents[0].model or config.DEFAULT_MODEL
-            instructions = (
-                "You are processing multiple agents. Read each agent's context in the HUD "
-                "and respond with JSON containing an 'agents' array with actions for each agent."
+            request_tokens = hud_tokens + self._hud.estimate_tokens(BATCH_REQUEST_INSTRUCTIONS)
+            self._batch_agent_tokens[model] = (
+                max(1, request_tokens - self.batch_fixed_cost_tokens()) / len(valid_agents)
             )
 
             response, response_id, error, tokens = self._openai.send_message(
                 message=hud_string,
-                instructions=instructions,
+                instructions=BATCH_REQUEST_INSTRUCTIONS,
                 model=model,
                 temperature=config.DEFAULT_TEMPERATURE,
                 previous_response_id=None
@@ -2,15 +2,18 @@
 
 import json
 import re
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Union, Deque
 from models import AIAgent, ChatMessage, ChatRoom, RoomMembership, SelfConcept
 from models.ai_agent import HUD_FORMAT_JSON, HUD_FORMAT_COMPACT, HUD_FORMAT_TOON
+from models.timestamps import utcnow
 from .logging_config import get_logger
 from .toon_service import (
     serialize_hud, get_telemetry, get_format_comparison,
-    HUDFormat, TOONTelemetry, toon_to_hud
+    HUDFormat, TOONTelemetry, toon_to_hud, dumps_json, loads_json
 )
+from .scoring import ContextBudget, agent_context_budget, importance, pack_by_importance
 import config
 import prompts
 
@@ -33,9 +36,11 @@ class HUDService:
 
     def __init__(self):
         """Initialize HUD service."""
-        # Store recent actions per agent: {agent_id: [{"timestamp": ..., "action": ...}]}
-        self._recent_actions: Dict[int, List[Dict[str, Any]]] = {}
+        # Store recent action summaries per agent: {agent_id: deque[summary]}
+        # Kept in LRU order so agents that stop acting are eventually evicted.
+        self._recent_actions: Dict[int, Deque[Dict[str, Any]]] = OrderedDict()
         self._max_recent_actions = config.MAX_RECENT_ACTIONS
+        self._max_tracked_agents = config.MAX_TRACKED_AGENTS
 
     def _convert_rooms_to_agent_rooms(self, rooms_section: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert old rooms format to new agent_rooms format.
@@ -112,8 +117,7 @@ class HUDService:
         Returns:
             Estimated token count for knowledge
         """
-        self_concept = SelfConcept.from_json(agent.self_concept_json)
-        knowledge_dict = self_concept.to_dict()
+        knowledge_dict = agent.get_self_concept().to_dict()
         return self.estimate_json_tokens(knowledge_dict)
 
     def estimate_base_hud_tokens(self, agent: AIAgent) -> int:
@@ -255,17 +259,29 @@ class HUDService:
     def _record_action(self, agent_id: int, action: Dict[str, Any], result: str = "ok") -> None:
         """Record an action in the agent's recent actions history.
 
+        The summary (with long values truncated) is built once here, since
+        the history is read on every HUD build.
+
         Args:
             agent_id: The agent who performed the action
             action: The action dict with type and parameters
             result: The outcome - "ok" for success, or an error message
         """
-        if agent_id not in self._recent_actions:
-            self._recent_actions[agent_id] = []
+        recent = self._recent_actions.get(agent_id)
+        if recent is None:
+            # deque maxlen trims to the most recent entries
+            recent = self._recent_actions[agent_id] = deque(maxlen=self._max_recent_actions)
+            if len(self._recent_actions) > self._max_tracked_agents:
+                self._recent_actions.popitem(last=False)
+        else:
+            self._recent_actions.move_to_end(agent_id)
+        recent.append(self._summarize_action(datetime.utcnow(), action, result))
 
+    def _summarize_action(self, timestamp: datetime, action: Dict[str, Any], result: str) -> Dict[str, Any]:
+        """Build the summary dict shown in the HUD for one recorded action."""
         # Create a simplified summary of the action
         action_type = action.get("type", "") or action.get("action", "")
-        summary = {"type": action_type, "timestamp": datetime.utcnow().isoformat(), "result": result}
+        summary = {"type": action_type, "timestamp": timestamp.isoformat(), "result": result}
 
         # Add relevant details based on action type
         if action_type in ["set", "delete", "append"]:
@@ -311,15 +327,11 @@ class HUDService:
         elif action_type in ["sleep", "timing.sleep"]:
             summary["until"] = action.get("until")
 
-        self._recent_actions[agent_id].append(summary)
-
-        # Trim to max
-        if len(self._recent_actions[agent_id]) > self._max_recent_actions:
-            self._recent_actions[agent_id] = self._recent_actions[agent_id][-self._max_recent_actions:]
+        return summary
 
     def get_recent_actions(self, agent_id: int) -> List[Dict[str, Any]]:
         """Get recent actions for an agent."""
-        return list(self._recent_actions.get(agent_id, []))
+        return list(self._recent_actions.get(agent_id, ()))
 
     def _build_warnings(
         self,
@@ -398,11 +410,11 @@ class HUDService:
 
     def estimate_json_tokens(self, obj: Any) -> int:
         """Estimate tokens for a JSON-serializable object."""
-        return self.estimate_tokens(json.dumps(obj))
+        return self.estimate_tokens(dumps_json(obj))
 
     def build_system_directives(self) -> str:
         """Build system-level directives that apply to all agent types."""
-        return config.SYSTEM_DIRECTIVES
+        return prompts.get_prompt_block("system_directives")
 
     def build_toon_parsing_instructions(self) -> str:
         """Build instructions explaining how to parse TOON-formatted HUD input.
@@ -435,7 +447,7 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
 
     def build_meta_instructions(self, agent_type: str = "persona") -> str:
         """Build the meta instructions (persona only - no bot split)."""
-        return config.PERSONA_INSTRUCTIONS
+        return prompts.get_prompt_block("persona_instructions")
 
     def _build_response_format_instructions(self, output_format: str, batched: bool = False) -> dict:
         """Build instructions for how the agent should format their response.
@@ -591,37 +603,13 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
         # ========================================
         # STEP 3: Build self section with budget-constrained knowledge
         # ========================================
-        self_concept = SelfConcept.from_json(agent.self_concept_json)
-        knowledge_dict = self_concept.to_dict()
+        knowledge_dict = agent.get_self_concept().to_dict()
         knowledge_tokens = self.estimate_json_tokens(knowledge_dict)
 
         # Get recent actions within budget
         recent_actions = self.get_recent_actions(agent.id)
         recent_actions_tokens = self.estimate_json_tokens(recent_actions)
 
-        # Build identity section (part of base HUD, not allocatable)
-        if agent.agent_type == "bot":
-            identity = {
-                "id": agent.id,
-                "name": agent.name or f"Bot-{agent.id}",
-                "model": agent.model,
-                "role": agent.background_prompt
-            }
-        else:
-            identity = {
-                "id": agent.id,
-                "name": agent.name,
-                "model": agent.model,
-                "seed": agent.background_prompt
-            }
-
-        # Build self section
-        self_section = {
-            "identity": identity,
-            "knowledge": knowledge_dict,
-            "recent_actions": recent_actions
-        }
-
         # ========================================
         # STEP 4: Build rooms section within allocated budget
         # ========================================
@@ -739,7 +727,7 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
 
         # Log format comparison for analysis
         if hud_input_format != HUD_FORMAT_JSON:
-            json_tokens = self.estimate_tokens(json.dumps(hud, indent=2))
+            json_tokens = self.estimate_tokens(dumps_json(hud, indent=2))
             savings = json_tokens - total_tokens
             savings_pct = (savings / json_tokens * 100) if json_tokens > 0 else 0
             logger.info(
@@ -906,7 +894,7 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
             - filtered_responses: Responses that are allowed (empty if over budget)
             - blocked_count: Number of responses that were blocked
         """
-        is_over_budget = getattr(agent, '_over_budget', False)
+        is_over_budget = agent._over_budget
 
         if not is_over_budget:
             return responses, 0
@@ -959,7 +947,7 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
         }
 
         # Count tokens
-        token_count = self.estimate_tokens(json.dumps(os_section))
+        token_count = self.estimate_tokens(dumps_json(os_section))
         return os_section, token_count
 
     def build_agent_segment(
@@ -975,6 +963,9 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
             room_data: List of room data dicts [{room, membership, messages, members}]
             include_meta: Whether to include meta instructions (usually only for non-batched)
 
+        Messages from all rooms are packed by importance into the agent's
+        context budget; the breakdown is included as "context_budget".
+
         Returns:
             (agent_segment_dict, token_count)
         """
@@ -987,18 +978,18 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
         }
 
         # Add knowledge
-        if agent.self_concept_json:
-            self_concept = SelfConcept.from_json(agent.self_concept_json)
-            segment["knowledge"] = self_concept.to_dict()
-        else:
-            segment["knowledge"] = {}
+        segment["knowledge"] = agent.get_self_concept().to_dict()
 
         # Add recent actions
         recent = self.get_recent_actions(agent.id)
         segment["recent_actions"] = recent[-config.MAX_RECENT_ACTIONS:]
 
-        # Build rooms section
+        # Build rooms section, collecting message candidates for packing
         rooms_list = []
+        candidates = []  # (room_entry, msg_entry)
+        scores = []
+        costs = []
+        now = utcnow()
         for rd in room_data:
             room = rd.get("room")
             membership = rd.get("membership")
@@ -1018,30 +1009,56 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
                 "messages": []
             }
 
-            # Add messages
+            # Score messages; replies to this agent's own messages get a boost
+            own_ids = set()
             for msg in messages:
+                is_obj = hasattr(msg, 'content')
+                msg_id = msg.id if is_obj else msg.get('id')
+                sender_id = msg.sender_id if is_obj else msg.get('sender_id')
+                reply_to = msg.reply_to_id if is_obj else msg.get('reply_to_id')
+                timestamp = msg.timestamp if is_obj else msg.get('timestamp')
                 msg_entry = {
-                    "id": msg.id if hasattr(msg, 'id') else msg.get('id'),
-                    "ts": str(msg.timestamp) if hasattr(msg, 'timestamp') else msg.get('timestamp'),
-                    "sender": msg.sender_name if hasattr(msg, 'sender_name') else msg.get('sender_name'),
-                    "content": msg.content if hasattr(msg, 'content') else msg.get('content'),
-                    "type": msg.message_type if hasattr(msg, 'message_type') else msg.get('message_type', 'text')
+                    "id": msg_id,
+                    "ts": str(timestamp) if is_obj else timestamp,
+                    "sender": msg.sender_name if is_obj else msg.get('sender_name'),
+                    "content": msg.content if is_obj else msg.get('content'),
+                    "type": msg.message_type if is_obj else msg.get('message_type', 'text')
                 }
-                room_entry["messages"].append(msg_entry)
+                if sender_id == membership.agent_id:
+                    own_ids.add(msg_id)
+                candidates.append((room_entry, msg_entry))
+                scores.append(importance(
+                    msg_entry["content"], timestamp, agent.name, now,
+                    replies_to_agent=reply_to is not None and reply_to in own_ids
+                ))
+                costs.append(self.estimate_json_tokens(msg_entry))
 
             rooms_list.append(room_entry)
 
+        budget = agent_context_budget(agent.agent_type)
+        chosen = pack_by_importance(scores, costs, budget)
+        for i in chosen:
+            room_entry, msg_entry = candidates[i]
+            room_entry["messages"].append(msg_entry)
+
         segment["rooms"] = rooms_list
+        segment["context_budget"] = ContextBudget(
+            budget=budget,
+            used=sum(costs[i] for i in chosen),
+            kept=len(chosen),
+            dropped=len(candidates) - len(chosen)
+        ).to_dict()
 
         # Token count
-        token_count = self.estimate_tokens(json.dumps(segment))
+        token_count = self.estimate_tokens(dumps_json(segment))
         return segment, token_count
 
     def build_batched_hud(
         self,
         agents: List[AIAgent],
         room_data_map: Dict[int, List[Dict[str, Any]]],
-        output_format: str = HUD_FORMAT_TOON
+        output_format: str = HUD_FORMAT_TOON,
+        record_telemetry: bool = True
     ) -> Tuple[str, int]:
         """Build a batched HUD for multiple agents.
 
@@ -1052,6 +1069,8 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
             agents: List of agents to include in batch
             room_data_map: Dict mapping agent_id -> room_data list
             output_format: Output format for the HUD (toon or json)
+            record_telemetry: Whether to record TOON telemetry and log the build
+                (off for measurements that aren't sent)
 
         Returns:
             (hud_string, total_token_count)
@@ -1070,7 +1089,7 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
             "instructions": prompts.build_persona_instructions(),
             "available_actions": self.build_available_actions("all", can_create_agents=True)
         }
-        meta_tokens = self.estimate_tokens(json.dumps(meta_section))
+        meta_tokens = self.estimate_tokens(dumps_json(meta_section))
 
         # Build agent segments
         agent_segments = []
@@ -1090,11 +1109,13 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
 
         # Serialize based on format
         if output_format == HUD_FORMAT_TOON:
-            hud_string = serialize_hud(hud_dict, format=HUDFormat.TOON)
+            hud_string = serialize_hud(hud_dict, format=HUDFormat.TOON, record_telemetry=record_telemetry)
         else:
-            hud_string = json.dumps(hud_dict, indent=2)
+            hud_string = dumps_json(hud_dict, indent=2)
 
         total_tokens = self.estimate_tokens(hud_string)
+        if not record_telemetry:
+            return hud_string, total_tokens
         logger.info(
             f"Built batched HUD for {len(agents)} agents: {total_tokens} tokens "
             f"(os={os_tokens}, meta={meta_tokens}, agents={total_agent_tokens})"
@@ -1121,7 +1142,7 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
         logger.debug(f"Raw batched response: {response_text[:500]}...")
 
         try:
-            data = json.loads(response_text)
+            data = loads_json(response_text)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse batched response JSON: {e}")
             logger.error(f"Raw response was: {response_text[:200]}...")
@@ -1187,7 +1208,7 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
 
     def parse_response(
         self,
-        response_text: str,
+        response_text: Union[str, bytes],
         output_format: str = HUD_FORMAT_JSON
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
@@ -1195,7 +1216,7 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
         Supports both JSON and TOON output formats.
 
         Args:
-            response_text: The raw response text from the agent
+            response_text: The raw response text (or UTF-8 bytes) from the agent
             output_format: Expected format - 'json' or 'toon'
 
         Returns:
@@ -1203,16 +1224,32 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
             - room_responses: [{"room_id": 1, "message": "..."}, ...]
             - actions: [{"type": "set", ...}, ...]
         """
-        if not response_text:
+        # Empty / whitespace-only completions are common for idle agents
+        if not response_text or response_text.isspace():
             return [], []
 
         data = None
 
-        # Try TOON parsing first if that's the expected format
-        if output_format == HUD_FORMAT_TOON:
+        # Raw bytes: decode JSON directly, without a bytes -> str round-trip
+        if isinstance(response_text, bytes):
+            if output_format != HUD_FORMAT_TOON:
+                try:
+                    data = loads_json(response_text)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    pass
+            response_text = response_text.decode("utf-8", errors="replace")
+
+        # Try TOON parsing first if that's the expected format.
+        # Agents often answer in JSON anyway - a leading '{' goes straight to the
+        # JSON path instead of a TOON pass that would be thrown away.
+        if data is None and output_format == HUD_FORMAT_TOON and not response_text.lstrip().startswith("{"):
             try:
                 data = toon_to_hud(response_text)
-                logger.debug(f"Successfully parsed TOON response")
+                if isinstance(data, dict):
+                    logger.debug(f"Successfully parsed TOON response")
+                else:
+                    logger.debug(f"TOON response is not an object, falling back to JSON")
+                    data = None
             except Exception as e:
                 logger.debug(f"TOON parsing failed, falling back to JSON: {e}")
                 # Fall through to JSON parsing
@@ -1220,13 +1257,13 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
         # JSON parsing (primary or fallback)
         if data is None:
             try:
-                data = json.loads(response_text)
+                data = loads_json(response_text)
             except json.JSONDecodeError:
                 # Try to find JSON block in response (agent may have added extra text)
                 json_match = re.search(r'\{[\s\S]*\}', response_text)
                 if json_match:
                     try:
-                        data = json.loads(json_match.group())
+                        data = loads_json(json_match.group())
                     except json.JSONDecodeError:
                         logger.warning(f"Could not parse response (tried {output_format} and JSON)")
                         return [], []
@@ -1285,7 +1322,15 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
         if not actions:
             return 0
 
-        self_concept = SelfConcept.from_json(agent.self_concept_json)
+        # Only touch the self-concept if a knowledge action needs it. The parsed copy
+        # is cached on the agent, so a HUD built this heartbeat has already paid for it.
+        needs_self_concept = any(
+            (action.get("type", "") or action.get("action", "")) in self._KNOWLEDGE_ACTION_TYPES
+            for action in actions
+        )
+        self_concept = agent.get_self_concept() if needs_self_concept else None
+        knowledge_changed = False
+        knowledge_failed = False
         applied = 0
 
         # Knowledge operations are always allowed (even when over budget)
@@ -1293,294 +1338,310 @@ If sender_agent_id equals your_agent_id (3), that message is from YOU.
         knowledge_actions = {"set", "delete", "append"}
 
         # Check if agent is over budget
-        is_over_budget = getattr(agent, '_over_budget', False)
-
-        for action in actions:
-            # Support both "type" and "action" keys for backward compatibility
-            action_type = action.get("type", "") or action.get("action", "")
-
-            # Skip empty or malformed actions silently
-            if not action_type:
-                continue
+        is_over_budget = agent._over_budget
 
-            # Block non-knowledge actions when over budget
-            if is_over_budget and action_type not in knowledge_actions:
-                action_result = (
-                    f"error: BLOCKED - over budget. Only knowledge operations (set, delete, append) "
-                    f"allowed until you reduce memory usage. Delete knowledge entries to continue."
-                )
-                self._record_action(agent.id, action, action_result)
-                logger.warning(f"Agent '{agent.name}' action '{action_type}' blocked: over budget")
-                continue
-
-            action_result = None  # None = not processed, "ok" = success, "queued" = deferred, or error message
-            try:
-                # Knowledge management actions (dot-path operations)
-                if action_type in ["set", "knowledge.set"]:
-                    path = action.get("path", "")
-                    value = action.get("value")
-                    if not path:
-                        action_result = "error: path required"
-                    elif value is None:
-                        action_result = "error: value required"
-                    else:
-                        if self_concept.set(path, value):
-                            applied += 1
-                            action_result = "ok"
-                            logger.debug(f"Agent '{agent.name}' set {path}")
-                        else:
-                            action_result = "error: failed to set path"
-
-                elif action_type in ["delete", "knowledge.delete"]:
-                    path = action.get("path", "")
-                    if not path:
-                        action_result = "error: path required"
-                    elif self_concept.delete(path):
-                        applied += 1
-                        action_result = "ok"
-                        logger.debug(f"Agent '{agent.name}' deleted {path}")
-                    else:
-                        action_result = "error: path not found"
-
-                elif action_type in ["append", "knowledge.append"]:
-                    path = action.get("path", "")
-                    value = action.get("value")
-                    if not path:
-                        action_result = "error: path required"
-                    elif value is None:
-                        action_result = "error: value required"
-                    elif self_concept.append(path, value):
-                        applied += 1
-                        action_result = "ok"
-                        logger.debug(f"Agent '{agent.name}' appended to {path}")
-                    else:
-                        action_result = "error: failed to append (path may not be array)"
-
-                elif action_type == "message":
-                    # Send a message to a room (unified action format)
-                    room_id = action.get("room_id")
-                    content = action.get("content", action.get("message", "")).strip()
-                    if room_id is None:
-                        action_result = "error: room_id required"
-                    elif not content:
-                        action_result = "error: content required"
-                    else:
-                        if not hasattr(agent, '_pending_messages'):
-                            agent._pending_messages = []
-                        agent._pending_messages.append({
-                            "room_id": room_id,
-                            "content": content
-                        })
-                        applied += 1
-                        action_result = "queued"
-                        logger.debug(f"Agent '{agent.name}' queued message to room {room_id}")
-
-                elif action_type == "set_attention":
-                    # Deprecated action - no longer supported
-                    action_result = "error: set_attention is no longer supported"
-
-                elif action_type == "allocate":
-                    # Deprecated action - no longer supported  
-                    action_result = "error: allocate is no longer supported"
-
-                elif action_type == "react":
-                    # Deprecated action - no longer supported
-                    action_result = "error: react is no longer supported"
-
-                elif action_type == "reply":
-                    # Deprecated action - no longer supported
-                    action_result = "error: reply is no longer supported"
-
-                elif action_type in ["leave_room", "room.leave"]:
-                    # Leave a room
-                    room_id = action.get("room_id")
-                    if room_id is None:
-                        action_result = "error: room_id required"
-                    else:
-                        if not hasattr(agent, '_pending_room_actions'):
-                            agent._pending_room_actions = []
-                        agent._pending_room_actions.append({
-                            "action": "leave",
-                            "room_id": room_id
-                        })
-                        applied += 1
-                        action_result = "queued"
-                        logger.debug(f"Agent '{agent.name}' leaving room {room_id}")
-
-                elif action_type in ["set_billboard", "room.billboard"]:
-                    # Set billboard for agent's own room
-                    message = action.get("message", "")
-                    if not message:
-                        action_result = "error: message required"
-                    else:
-                        if not hasattr(agent, '_pending_billboard_action'):
-                            agent._pending_billboard_action = None
-                        agent._pending_billboard_action = {"action": "set", "message": message}
-                        applied += 1
-                        action_result = "queued"
-                        logger.debug(f"Agent '{agent.name}' setting billboard: {message[:50]}...")
-
-                elif action_type in ["clear_billboard", "room.billboard.clear"]:
-                    # Clear billboard for agent's own room
-                    if not hasattr(agent, '_pending_billboard_action'):
-                        agent._pending_billboard_action = None
-                    agent._pending_billboard_action = {"action": "clear"}
-                    applied += 1
-                    action_result = "queued"
-                    logger.debug(f"Agent '{agent.name}' clearing billboard")
-
-                elif action_type in ["wake_agent", "agent.wake"]:
-                    # Wake a sleeping agent (requires room proximity)
-                    target_id = action.get("agent_id")
-                    if target_id is None:
-                        action_result = "error: agent_id required"
-                    else:
-                        if not hasattr(agent, '_pending_wake_agents'):
-                            agent._pending_wake_agents = []
-                        agent._pending_wake_agents.append(target_id)
-                        applied += 1
-                        action_result = "queued"
-                        logger.debug(f"Agent '{agent.name}' waking agent {target_id}")
-
-                elif action_type in ["set_wpm", "room.wpm"]:
-                    # Set WPM for agent's own room
-                    wpm = action.get("wpm")
-                    if wpm is None:
-                        action_result = "error: wpm required"
-                    else:
-                        try:
-                            wpm = int(wpm)
-                            wpm = max(10, min(200, wpm))  # Clamp to 10-200
-                            agent.room_wpm = wpm
-                            applied += 1
-                            action_result = "ok"
-                            logger.debug(f"Agent '{agent.name}' set room WPM to {wpm}")
-                        except (ValueError, TypeError):
-                            action_result = f"error: invalid wpm value '{action.get('wpm')}' (must be number 10-200)"
-
-                elif action_type in ["set_name", "identity.name"]:
-                    # Set agent's display name
-                    new_name = action.get("name", "").strip()
-                    if not new_name:
-                        action_result = "error: name required"
-                    elif len(new_name) > 50:
-                        action_result = "error: name too long (max 50 chars)"
-                    else:
-                        old_name = agent.name
-                        agent.name = new_name
-                        applied += 1
-                        action_result = "ok"
-                        logger.info(f"Agent {agent.id} renamed from '{old_name}' to '{new_name}'")
-
-                elif action_type in ["create_agent", "agent.create"]:
-                    # Create a new agent (requires permission)
-                    if not agent.can_create_agents:
-                        action_result = "error: no permission to create agents"
-                    else:
-                        name = action.get("name", "").strip()
-                        background_prompt = action.get("background_prompt", "").strip()
-                        new_agent_type = action.get("agent_type", "persona")
-                        in_room_id = action.get("in_room_id")
-
-                        if not name:
-                            action_result = "error: name required"
-                        elif not background_prompt:
-                            action_result = "error: background_prompt required"
-                        else:
-                            if not hasattr(agent, '_pending_create_agents'):
-                                agent._pending_create_agents = []
-                            agent._pending_create_agents.append({
-                                "name": name,
-                                "background_prompt": background_prompt,
-                                "agent_type": new_agent_type if new_agent_type in ["persona", "bot"] else "persona",
-                                "in_room_id": in_room_id
-                            })
-                            applied += 1
-                            action_result = "queued"
-                            logger.debug(f"Agent '{agent.name}' creating new agent: {name}")
-
-                elif action_type in ["alter_agent", "agent.alter"]:
-                    # Alter another agent's persona (requires permission)
-                    if not agent.can_create_agents:
-                        action_result = "error: no permission to alter agents"
-                    else:
-                        target_id = action.get("agent_id")
-                        new_name = action.get("name", "").strip() if action.get("name") else None
-                        new_prompt = action.get("background_prompt", "").strip() if action.get("background_prompt") else None
-                        new_model = action.get("model", "").strip() if action.get("model") else None
-
-                        if target_id is None:
-                            action_result = "error: agent_id required"
-                        elif target_id == agent.id:
-                            action_result = "error: cannot alter yourself (use set_name or knowledge instead)"
-                        elif not new_name and not new_prompt and not new_model:
-                            action_result = "error: at least one of name, background_prompt, or model required"
-                        else:
-                            if not hasattr(agent, '_pending_alter_agents'):
-                                agent._pending_alter_agents = []
-                            agent._pending_alter_agents.append({
-                                "target_id": target_id,
-                                "name": new_name,
-                                "background_prompt": new_prompt,
-                                "model": new_model
-                            })
-                            applied += 1
-                            action_result = "queued"
-                            logger.debug(f"Agent '{agent.name}' altering agent {target_id}")
-
-                elif action_type in ["retire_agent", "agent.retire"]:
-                    # Retire (delete) another agent (requires permission)
-                    if not agent.can_create_agents:
-                        action_result = "error: no permission to retire agents"
-                    else:
-                        target_id = action.get("agent_id")
-                        if target_id is None:
-                            action_result = "error: agent_id required"
-                        elif target_id == agent.id:
-                            action_result = "error: cannot retire yourself"
-                        else:
-                            if not hasattr(agent, '_pending_retire_agents'):
-                                agent._pending_retire_agents = []
-                            agent._pending_retire_agents.append(target_id)
-                            applied += 1
-                            action_result = "queued"
-                            logger.debug(f"Agent '{agent.name}' retiring agent {target_id}")
-
-                elif action_type in ["sleep", "timing.sleep"]:
-                    # Sleep until a specific time
-                    until_str = action.get("until", "")
-                    if not until_str:
-                        action_result = "error: until datetime required (ISO 8601 format)"
-                    else:
-                        try:
-                            sleep_until = datetime.fromisoformat(until_str.replace('Z', '+00:00'))
-                            # Store as pending sleep action
-                            if not hasattr(agent, '_pending_sleep'):
-                                agent._pending_sleep = None
-                            agent._pending_sleep = sleep_until
-                            applied += 1
-                            action_result = "queued"
-                            logger.debug(f"Agent '{agent.name}' sleeping until {until_str}")
-                        except ValueError:
-                            action_result = f"error: invalid datetime format '{until_str}' (use ISO 8601)"
-
-                else:
-                    action_result = f"error: unknown action type '{action_type}'"
-
-                # Record all actions with their results
-                if action_result:
+        try:
+            for action in actions:
+                # Support both "type" and "action" keys for backward compatibility
+                action_type = action.get("type", "") or action.get("action", "")
+
+                # Skip empty or malformed actions silently
+                if not action_type:
+                    continue
+
+                # Block non-knowledge actions when over budget
+                if is_over_budget and action_type not in knowledge_actions:
+                    action_result = (
+                        f"error: BLOCKED - over budget. Only knowledge operations (set, delete, append) "
+                        f"allowed until you reduce memory usage. Delete knowledge entries to continue."
+                    )
                     self._record_action(agent.id, action, action_result)
-                    if action_result.startswith("error:"):
-                        logger.warning(f"Action {action_type} failed: {action_result}")
-
-            except Exception as e:
-                logger.error(f"Error applying action {action_type}: {e}")
-                self._record_action(agent.id, action, f"error: {str(e)}")
+                    logger.warning(f"Agent '{agent.name}' action '{action_type}' blocked: over budget")
+                    continue
+
+                try:
+                    # "ok" = success, "queued" = deferred, or error message
+                    handler = self._ACTION_HANDLERS.get(action_type)
+                    if handler is None:
+                        action_result = f"error: unknown action type '{action_type}'"
+                    else:
+                        action_result = handler(self, agent, action, self_concept)
 
-        # Save updated self-concept
-        agent.self_concept_json = self_concept.to_json()
+                    if action_result in ("ok", "queued"):
+                        applied += 1
+                        if action_result == "ok" and action_type in self._KNOWLEDGE_ACTION_TYPES:
+                            knowledge_changed = True
+
+                    # Record all actions with their results
+                    if action_result:
+                        self._record_action(agent.id, action, action_result)
+                        if action_result.startswith("error:"):
+                            logger.warning(f"Action {action_type} failed: {action_result}")
+
+                except Exception as e:
+                    logger.error(f"Error applying action {action_type}: {e}")
+                    self._record_action(agent.id, action, f"error: {str(e)}")
+                    if action_type in self._KNOWLEDGE_ACTION_TYPES:
+                        # The handler may have half-applied its change to the shared object
+                        knowledge_failed = True
+
+            # Save updated self-concept once for the whole batch, only if it changed
+            if knowledge_changed:
+                agent.set_self_concept(self_concept)
+            elif knowledge_failed:
+                agent.discard_self_concept_cache()
+        except BaseException:
+            # Don't let the next get_self_concept() return a half-applied state
+            if self_concept is not None:
+                agent.discard_self_concept_cache()
+            raise
 
         if applied > 0:
             logger.info(f"Agent '{agent.name}' applied {applied} actions to self-concept")
 
         return applied
+
+    # =========================================================================
+    # Action Handlers
+    #
+    # Each handler applies one action and returns its result string:
+    # "ok" (applied), "queued" (deferred to heartbeat processing), or "error: ...".
+    # =========================================================================
+
+    def _apply_set(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Set a value at a knowledge dot-path."""
+        path = action.get("path", "")
+        value = action.get("value")
+        if not path:
+            return "error: path required"
+        if value is None:
+            return "error: value required"
+        if not self_concept.set(path, value):
+            return "error: failed to set path"
+        logger.debug(f"Agent '{agent.name}' set {path}")
+        return "ok"
+
+    def _apply_delete(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Delete a knowledge dot-path."""
+        path = action.get("path", "")
+        if not path:
+            return "error: path required"
+        if not self_concept.delete(path):
+            return "error: path not found"
+        logger.debug(f"Agent '{agent.name}' deleted {path}")
+        return "ok"
+
+    def _apply_append(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Append a value to the array at a knowledge dot-path."""
+        path = action.get("path", "")
+        value = action.get("value")
+        if not path:
+            return "error: path required"
+        if value is None:
+            return "error: value required"
+        if not self_concept.append(path, value):
+            return "error: failed to append (path may not be array)"
+        logger.debug(f"Agent '{agent.name}' appended to {path}")
+        return "ok"
+
+    def _apply_message(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue a message to a room (unified action format)."""
+        room_id = action.get("room_id")
+        content = action.get("content", action.get("message", "")).strip()
+        if room_id is None:
+            return "error: room_id required"
+        if not content:
+            return "error: content required"
+        agent._pending_messages.append({
+            "room_id": room_id,
+            "content": content
+        })
+        logger.debug(f"Agent '{agent.name}' queued message to room {room_id}")
+        return "queued"
+
+    def _apply_deprecated(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Reject an action type that is no longer supported."""
+        action_type = action.get("type", "") or action.get("action", "")
+        return f"error: {action_type} is no longer supported"
+
+    def _apply_leave_room(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue leaving a room."""
+        room_id = action.get("room_id")
+        if room_id is None:
+            return "error: room_id required"
+        agent._pending_room_actions.append({
+            "action": "leave",
+            "room_id": room_id
+        })
+        logger.debug(f"Agent '{agent.name}' leaving room {room_id}")
+        return "queued"
+
+    def _apply_set_billboard(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue setting the billboard for agent's own room."""
+        message = action.get("message", "")
+        if not message:
+            return "error: message required"
+        agent._pending_billboard_action = {"action": "set", "message": message}
+        logger.debug(f"Agent '{agent.name}' setting billboard: {message[:50]}...")
+        return "queued"
+
+    def _apply_clear_billboard(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue clearing the billboard for agent's own room."""
+        agent._pending_billboard_action = {"action": "clear"}
+        logger.debug(f"Agent '{agent.name}' clearing billboard")
+        return "queued"
+
+    def _apply_wake_agent(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue waking a sleeping agent (requires room proximity)."""
+        target_id = action.get("agent_id")
+        if target_id is None:
+            return "error: agent_id required"
+        agent._pending_wake_agents.append(target_id)
+        logger.debug(f"Agent '{agent.name}' waking agent {target_id}")
+        return "queued"
+
+    def _apply_set_wpm(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Set WPM for agent's own room."""
+        wpm = action.get("wpm")
+        if wpm is None:
+            return "error: wpm required"
+        try:
+            wpm = int(wpm)
+        except (ValueError, TypeError):
+            return f"error: invalid wpm value '{action.get('wpm')}' (must be number 10-200)"
+        wpm = max(10, min(200, wpm))  # Clamp to 10-200
+        agent.room_wpm = wpm
+        logger.debug(f"Agent '{agent.name}' set room WPM to {wpm}")
+        return "ok"
+
+    def _apply_set_name(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Set agent's display name."""
+        new_name = action.get("name", "").strip()
+        if not new_name:
+            return "error: name required"
+        if len(new_name) > 50:
+            return "error: name too long (max 50 chars)"
+        old_name = agent.name
+        agent.name = new_name
+        logger.info(f"Agent {agent.id} renamed from '{old_name}' to '{new_name}'")
+        return "ok"
+
+    def _apply_create_agent(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue creating a new agent (requires permission)."""
+        if not agent.can_create_agents:
+            return "error: no permission to create agents"
+
+        name = action.get("name", "").strip()
+        background_prompt = action.get("background_prompt", "").strip()
+        new_agent_type = action.get("agent_type", "persona")
+        in_room_id = action.get("in_room_id")
+
+        if not name:
+            return "error: name required"
+        if not background_prompt:
+            return "error: background_prompt required"
+
+        agent._pending_create_agents.append({
+            "name": name,
+            "background_prompt": background_prompt,
+            "agent_type": new_agent_type if new_agent_type in ["persona", "bot"] else "persona",
+            "in_room_id": in_room_id
+        })
+        logger.debug(f"Agent '{agent.name}' creating new agent: {name}")
+        return "queued"
+
+    def _apply_alter_agent(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue altering another agent's persona (requires permission)."""
+        if not agent.can_create_agents:
+            return "error: no permission to alter agents"
+
+        target_id = action.get("agent_id")
+        new_name = action.get("name", "").strip() if action.get("name") else None
+        new_prompt = action.get("background_prompt", "").strip() if action.get("background_prompt") else None
+        new_model = action.get("model", "").strip() if action.get("model") else None
+
+        if target_id is None:
+            return "error: agent_id required"
+        if target_id == agent.id:
+            return "error: cannot alter yourself (use set_name or knowledge instead)"
+        if not new_name and not new_prompt and not new_model:
+            return "error: at least one of name, background_prompt, or model required"
+
+        agent._pending_alter_agents.append({
+            "target_id": target_id,
+            "name": new_name,
+            "background_prompt": new_prompt,
+            "model": new_model
+        })
+        logger.debug(f"Agent '{agent.name}' altering agent {target_id}")
+        return "queued"
+
+    def _apply_retire_agent(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue retiring (deleting) another agent (requires permission)."""
+        if not agent.can_create_agents:
+            return "error: no permission to retire agents"
+
+        target_id = action.get("agent_id")
+        if target_id is None:
+            return "error: agent_id required"
+        if target_id == agent.id:
+            return "error: cannot retire yourself"
+
+        agent._pending_retire_agents.append(target_id)
+        logger.debug(f"Agent '{agent.name}' retiring agent {target_id}")
+        return "queued"
+
+    def _apply_sleep(self, agent: AIAgent, action: Dict[str, Any], self_concept: SelfConcept) -> str:
+        """Queue sleeping until a specific time."""
+        until_str = action.get("until", "")
+        if not until_str:
+            return "error: until datetime required (ISO 8601 format)"
+        try:
+            sleep_until = datetime.fromisoformat(until_str.replace('Z', '+00:00'))
+        except ValueError:
+            return f"error: invalid datetime format '{until_str}' (use ISO 8601)"
+        agent._pending_sleep = sleep_until
+        logger.debug(f"Agent '{agent.name}' sleeping until {until_str}")
+        return "queued"
+
+    # Action types that read or write the self-concept (knowledge store)
+    _KNOWLEDGE_ACTION_TYPES = frozenset({
+        "set", "knowledge.set",
+        "delete", "knowledge.delete",
+        "append", "knowledge.append",
+    })
+
+    # Action type -> handler. Legacy names and dot-path names share handlers.
+    _ACTION_HANDLERS = {
+        "set": _apply_set,
+        "knowledge.set": _apply_set,
+        "delete": _apply_delete,
+        "knowledge.delete": _apply_delete,
+        "append": _apply_append,
+        "knowledge.append": _apply_append,
+        "message": _apply_message,
+        "set_attention": _apply_deprecated,
+        "allocate": _apply_deprecated,
+        "react": _apply_deprecated,
+        "reply": _apply_deprecated,
+        "leave_room": _apply_leave_room,
+        "room.leave": _apply_leave_room,
+        "set_billboard": _apply_set_billboard,
+        "room.billboard": _apply_set_billboard,
+        "clear_billboard": _apply_clear_billboard,
+        "room.billboard.clear": _apply_clear_billboard,
+        "wake_agent": _apply_wake_agent,
+        "agent.wake": _apply_wake_agent,
+        "set_wpm": _apply_set_wpm,
+        "room.wpm": _apply_set_wpm,
+        "set_name": _apply_set_name,
+        "identity.name": _apply_set_name,
+        "create_agent": _apply_create_agent,
+        "agent.create": _apply_create_agent,
+        "alter_agent": _apply_alter_agent,
+        "agent.alter": _apply_alter_agent,
+        "retire_agent": _apply_retire_agent,
+        "agent.retire": _apply_retire_agent,
+        "sleep": _apply_sleep,
+        "timing.sleep": _apply_sleep,
+    }
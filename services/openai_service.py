@@ -19,23 +19,52 @@ logger = get_logger("openai")
 class OpenAIService:
     """Handles all OpenAI Responses API operations."""
 
+    # Curated list of models to offer
+    ALLOWED_MODELS = ("gpt-5.1", "gpt-5-mini", "gpt-5-nano")
+
     def __init__(self):
         """Initialize the OpenAI service."""
         self._client: Optional[OpenAI] = None
+        self._http_client: Optional[httpx.Client] = None
         self._api_key: str = ""
+        # (time.monotonic() when fetched, available models) for the current key
+        self._models_cache: Optional[Tuple[float, list]] = None
 
     def set_api_key(self, api_key: str) -> None:
-        """Set the API key and initialize the client with timeout."""
-        self._api_key = api_key
-        self._client = OpenAI(
-            api_key=api_key,
-            timeout=httpx.Timeout(
-                float(config.API_TIMEOUT_SECONDS),
-                connect=float(config.API_CONNECT_TIMEOUT_SECONDS)
-            )
+        """Set the API key and initialize the client with timeout.
+
+        All clients share one pooled httpx.Client, so keep-alive connections
+        (and their TLS sessions) survive across calls and key changes.
+        """
+        timeout = httpx.Timeout(
+            float(config.API_TIMEOUT_SECONDS),
+            connect=float(config.API_CONNECT_TIMEOUT_SECONDS)
         )
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=config.API_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.API_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=float(config.API_KEEPALIVE_EXPIRY_SECONDS)
+                )
+            )
+        self._api_key = api_key
+        self._models_cache = None
+        self._client = OpenAI(api_key=api_key, timeout=timeout, http_client=self._http_client)
         logger.info(f"API key set and client initialized with {config.API_TIMEOUT_SECONDS}s timeout")
 
+    def close(self) -> None:
+        """Close pooled connections. set_api_key can be called again afterwards."""
+        self._client = None
+        self._models_cache = None
+        if self._http_client is not None:
+            try:
+                self._http_client.close()
+            except Exception as e:
+                logger.debug(f"Error closing HTTP client: {e}")
+            self._http_client = None
+
     @property
     def has_api_key(self) -> bool:
         """Check if API key is set."""
@@ -47,8 +76,9 @@ class OpenAIService:
             return False, "API key not set"
 
         try:
-            # List models to test connection
-            self._client.models.list()
+            # List models to test connection; the listing also primes the
+            # model cache so a following get_available_models() is free
+            self._remember_models(self._client.models.list())
             logger.info("API connection test successful")
             return True, "Connection successful"
         except Exception as e:
@@ -250,24 +280,26 @@ You're not an AI assistant. You're {name}, figuring out who you are through conv
             return None, None, str(e)
 
     def get_available_models(self) -> list:
-        """Get list of available models that support the Responses API."""
-        # Curated list of models to offer
-        allowed_models = ["gpt-5.1", "gpt-5-mini", "gpt-5-nano"]
+        """Get list of available models that support the Responses API.
+
+        A successful lookup is reused for API_MODELS_CACHE_TTL_SECONDS;
+        the fallback list returned on errors is not cached.
+        """
+        allowed_models = list(self.ALLOWED_MODELS)
 
         if not self._client:
             return allowed_models
 
+        cached = self._models_cache
+        if cached is not None and time.monotonic() - cached[0] < config.API_MODELS_CACHE_TTL_SECONDS:
+            return list(cached[1])
+
         try:
             # Fetch models from API to verify availability
-            models_response = self._client.models.list()
-            available_ids = {model.id for model in models_response.data}
-
-            # Return only allowed models that are actually available
-            available = [m for m in allowed_models if m in available_ids]
-
+            available = self._remember_models(self._client.models.list())
             if available:
                 logger.info(f"Available models: {available}")
-                return available
+                return list(available)
 
             # Fallback if none available
             logger.warning("None of the allowed models are available, returning default list")
@@ -276,3 +308,13 @@ You're not an AI assistant. You're {name}, figuring out who you are through conv
         except Exception as e:
             logger.warning(f"Failed to fetch models from API: {e}")
             return allowed_models
+
+    def _remember_models(self, models_response) -> list:
+        """Cache the allowed models present in a models.list() response and return them."""
+        available_ids = {model.id for model in models_response.data}
+
+        # Only allowed models that are actually available
+        available = [m for m in self.ALLOWED_MODELS if m in available_ids]
+        if available:
+            self._models_cache = (time.monotonic(), available)
+        return available
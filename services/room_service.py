@@ -8,7 +8,7 @@ In this architecture:
 """
 
 from datetime import datetime
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple
 from models import ChatRoom, RoomMembership, AIAgent, ChatMessage
 from .database_service import DatabaseService
 from .logging_config import get_logger
@@ -31,7 +31,8 @@ class RoomService:
         self._database = database
         self._on_room_changed: List[Callable[[], None]] = []
         self._on_membership_changed: List[Callable[[int], None]] = []  # room_id
-        self._on_messages_changed: List[Callable[[], None]] = []
+        self._on_messages_changed: List[Callable[[int], None]] = []
+        self._on_reactions_changed: List[Callable[[int], None]] = []  # room_id
         self._on_agent_status_changed: List[Callable[[AIAgent], None]] = []
 
         # Ensure The Architect exists
@@ -40,22 +41,34 @@ class RoomService:
         # Ensure all agents have self-room memberships (migration)
         self._ensure_self_room_memberships()
 
-    def add_messages_changed_callback(self, callback: Callable[[], None]) -> None:
-        """Add a callback for when messages change."""
+    def add_messages_changed_callback(self, callback: Callable[[int], None]) -> None:
+        """Add a callback for when messages change; it receives the room ID."""
         self._on_messages_changed.append(callback)
 
+    def add_reactions_changed_callback(self, callback: Callable[[int], None]) -> None:
+        """Add a callback for when reactions on a room's messages change; it receives the room ID."""
+        self._on_reactions_changed.append(callback)
+
     def add_agent_status_callback(self, callback: Callable[[AIAgent], None]) -> None:
         """Add a callback for when agent status changes."""
         self._on_agent_status_changed.append(callback)
 
-    def notify_messages_changed(self) -> None:
-        """Notify all callbacks that messages have changed."""
+    def notify_messages_changed(self, room_id: int) -> None:
+        """Notify all callbacks that messages in a room have changed."""
         for callback in self._on_messages_changed:
             try:
-                callback()
+                callback(room_id)
             except Exception as e:
                 logger.error(f"Error in messages changed callback: {e}")
 
+    def notify_reactions_changed(self, room_id: int) -> None:
+        """Notify all callbacks that reactions on messages in a room have changed."""
+        for callback in self._on_reactions_changed:
+            try:
+                callback(room_id)
+            except Exception as e:
+                logger.error(f"Error in reactions changed callback: {e}")
+
     def notify_agent_status_changed(self, agent: AIAgent) -> None:
         """Notify all callbacks that agent status changed."""
         for callback in self._on_agent_status_changed:
@@ -401,6 +414,16 @@ class RoomService:
         logger.info(f"Message in room {room_id} from '{sender_name}' (ID: {sender_id})")
         return message
 
+    def send_messages(self, items: List[Tuple[int, str, str]]) -> List[ChatMessage]:
+        """Send several text messages, given as (room_id, sender_name, content), in one write."""
+        messages = [
+            ChatMessage(room_id=room_id, sender_name=sender_name, content=content, timestamp=datetime.utcnow())
+            for room_id, sender_name, content in items
+        ]
+        self._database.add_messages(messages)
+        logger.info(f"Sent {len(messages)} queued messages")
+        return messages
+
     def _add_system_message(self, room_id: int, content: str) -> None:
         """Add a system message to a room."""
         self.send_message(room_id, "System", content, "system")
@@ -423,6 +446,7 @@ class RoomService:
         self._on_room_changed.clear()
         self._on_membership_changed.clear()
         self._on_messages_changed.clear()
+        self._on_reactions_changed.clear()
         self._on_agent_status_changed.clear()
 
         logger.info("Room service cleaned up")
@@ -0,0 +1,76 @@
+"""Importance scoring for packing agent context into a fixed token budget.
+
+Candidates (e.g. room messages) are scored by recency decay plus boosts for
+mentioning or replying to the agent, then packed greedily, highest score
+first, until the budget is used up.
+"""
+
+import math
+import re
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import config
+
+
+@dataclass
+class ContextBudget:
+    """Token budget breakdown for one agent's packed context."""
+
+    budget: int = 0
+    used: int = 0
+    kept: int = 0
+    dropped: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def agent_context_budget(agent_type: str) -> int:
+    """Token budget for an agent's messages in a batch: base plus a per-type share."""
+    return config.CONTEXT_BASE_TOKENS + config.CONTEXT_ROLE_TOKENS.get(agent_type, 0)
+
+
+@lru_cache(maxsize=256)
+def _mention_pattern(name: str) -> "re.Pattern":
+    # A bare number in a message isn't a mention, so numeric names need @ or #
+    prefix = r"[@#]" if name.isdigit() else r"@?"
+    return re.compile(r"(?<!\w)" + prefix + re.escape(name) + r"(?!\w)", re.IGNORECASE)
+
+
+def importance(
+    content: str,
+    timestamp: Optional[datetime],
+    agent_name: str,
+    now: datetime,
+    replies_to_agent: bool = False
+) -> float:
+    """Score a message for an agent: recency decay plus mention/reply boosts."""
+    score = 1.0
+    if isinstance(timestamp, datetime):
+        age = max(0.0, (now - timestamp).total_seconds())
+        score = math.exp(-age / config.CONTEXT_RECENCY_TAU_SECONDS)
+    if agent_name and content and _mention_pattern(agent_name).search(content):
+        score += config.CONTEXT_MENTION_BOOST
+    if replies_to_agent:
+        score += config.CONTEXT_REPLY_BOOST
+    return score
+
+
+def pack_by_importance(scores: Sequence[float], costs: Sequence[int], budget: int) -> List[int]:
+    """Greedily pick the highest-scoring items whose costs fit in budget.
+
+    Items that don't fit are skipped, so smaller items further down can
+    still be packed. Ties go to the later item. Returns the chosen indices
+    in their original order.
+    """
+    chosen = []
+    remaining = budget
+    for i in sorted(range(len(scores)), key=lambda i: (scores[i], i), reverse=True):
+        if costs[i] <= remaining:
+            chosen.append(i)
+            remaining -= costs[i]
+    chosen.sort()
+    return chosen
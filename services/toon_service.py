@@ -22,9 +22,43 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from .logging_config import get_logger
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = get_logger("toon")
 
 
+def dumps_json(obj: Any, indent: Optional[int] = None) -> str:
+    """Serialize to JSON without escaping non-ASCII, using orjson when available.
+
+    indent=None gives fully compact output (no spaces after separators);
+    indent=2 matches json.dumps(indent=2, ensure_ascii=False).
+    """
+    if HAS_ORJSON and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; stdlib handles these
+    if indent is None:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """Parse JSON, using orjson when available.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    keep catching the stdlib exception.
+    """
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
 # =============================================================================
 # Telemetry for Token Comparison
 # =============================================================================
@@ -219,41 +253,41 @@ COMPACT_KEY_MAP = {
 COMPACT_KEY_REVERSE = {v: k for k, v in COMPACT_KEY_MAP.items()}
 
 
-def compact_keys(obj: Any) -> Any:
-    """Recursively replace verbose keys with compact versions."""
+def _remap_keys(obj: Any, lookup) -> Any:
+    """Recursively rename dict keys using lookup(key, default)."""
     if isinstance(obj, dict):
         return {
-            COMPACT_KEY_MAP.get(k, k): compact_keys(v)
+            lookup(k, k): _remap_keys(v, lookup) if isinstance(v, (dict, list)) else v
             for k, v in obj.items()
         }
     elif isinstance(obj, list):
-        return [compact_keys(item) for item in obj]
+        return [
+            _remap_keys(item, lookup) if isinstance(item, (dict, list)) else item
+            for item in obj
+        ]
     else:
         return obj
 
 
+def compact_keys(obj: Any) -> Any:
+    """Recursively replace verbose keys with compact versions."""
+    return _remap_keys(obj, COMPACT_KEY_MAP.get)
+
+
 def expand_keys(obj: Any) -> Any:
     """Recursively replace compact keys with verbose versions."""
-    if isinstance(obj, dict):
-        return {
-            COMPACT_KEY_REVERSE.get(k, k): expand_keys(v)
-            for k, v in obj.items()
-        }
-    elif isinstance(obj, list):
-        return [expand_keys(item) for item in obj]
-    else:
-        return obj
+    return _remap_keys(obj, COMPACT_KEY_REVERSE.get)
 
 
 def to_compact_json(obj: Any, indent: Optional[int] = None) -> str:
     """Convert object to compact JSON with shortened keys."""
     compacted = compact_keys(obj)
-    return json.dumps(compacted, indent=indent, ensure_ascii=False)
+    return dumps_json(compacted, indent=indent)
 
 
 def from_compact_json(json_str: str) -> Any:
     """Parse compact JSON and expand keys to verbose versions."""
-    obj = json.loads(json_str)
+    obj = loads_json(json_str)
     return expand_keys(obj)
 
 
@@ -352,8 +386,8 @@ class TOONSerializer:
             return self._serialize_complex_array(arr, name, keys)
 
         # Simple format: name[N]{key1,key2,...}:
-  val1, val2, ...
-  ...
+        #   val1, val2, ...
+        #   ...
         schema = ",".join(keys)
         lines = [f"{name}[{len(arr)}]{{{schema}}}:"]
 
@@ -365,8 +399,7 @@ class TOONSerializer:
             lines.append(f"{indent}{', '.join(values)}")
 
         self._indent_level -= 1
-        return "
-".join(lines)
+        return "\n".join(lines)
 
     def _serialize_complex_array(self, arr: List[dict], name: str, keys: List[str]) -> str:
         """Serialize an array where items have complex nested values.
@@ -400,10 +433,9 @@ class TOONSerializer:
             self._indent_level -= 1
 
         self._indent_level -= 1
-        return "
-".join(lines)
+        return "\n".join(lines)
 
-    def _serialize_object    def _serialize_object(self, obj: dict, name: str, top_level: bool = False) -> str:
+    def _serialize_object(self, obj: dict, name: str, top_level: bool = False) -> str:
         """Serialize an object to TOON format."""
         if not obj:
             return "{}"
@@ -525,7 +557,12 @@ class TOONDeserializer:
         self._skip_whitespace()
 
         while self._pos < len(self._text) and self._text[self._pos] != ']':
+            start = self._pos
             value = self._parse_value()
+            if self._pos == start:
+                # Stray delimiter (e.g. '}') - skip it rather than loop forever
+                self._pos += 1
+                continue
             result.append(value)
 
             self._skip_whitespace()
@@ -547,8 +584,15 @@ class TOONDeserializer:
         self._skip_whitespace()
 
         while self._pos < len(self._text) and self._text[self._pos] != '}':
-            # Parse key
-            key = self._parse_identifier()
+            # Parse key (quoted keys are accepted so JSON-ish input can't stall the parser)
+            if self._text[self._pos] == '"':
+                key = self._parse_string()
+            else:
+                key = self._parse_identifier()
+                if not key:
+                    # Not a key character - skip it rather than loop forever
+                    self._pos += 1
+                    continue
             self._skip_whitespace()
 
             if self._pos < len(self._text) and self._text[self._pos] == ':':
@@ -610,21 +654,30 @@ class TOONDeserializer:
         # Return everything from start position, trimmed
         return self._text[start_pos:self._pos].strip()
 
-    def _parse_schema_object(self, name: str) -> dict:
-        """Parse a schema-notation object: name{field1,field2}: val1, val2"""
-        # Parse field list
-        assert self._text[self._pos] == '{'
-        self._pos += 1
-
+    def _parse_field_list(self) -> List[str]:
+        """Parse schema field names up to (not including) the closing '}'."""
         fields = []
         while self._pos < len(self._text) and self._text[self._pos] != '}':
             self._skip_whitespace()
+            start = self._pos
             field = self._parse_identifier()
             if field:
                 fields.append(field)
             self._skip_whitespace()
             if self._pos < len(self._text) and self._text[self._pos] == ',':
                 self._pos += 1
+            elif self._pos == start:
+                # Not a field character - skip it rather than loop forever
+                self._pos += 1
+        return fields
+
+    def _parse_schema_object(self, name: str) -> dict:
+        """Parse a schema-notation object: name{field1,field2}: val1, val2"""
+        # Parse field list
+        assert self._text[self._pos] == '{'
+        self._pos += 1
+
+        fields = self._parse_field_list()
 
         if self._pos < len(self._text):
             self._pos += 1  # Skip }
@@ -666,14 +719,7 @@ class TOONDeserializer:
         self._skip_whitespace()
         if self._pos < len(self._text) and self._text[self._pos] == '{':
             self._pos += 1
-            while self._pos < len(self._text) and self._text[self._pos] != '}':
-                self._skip_whitespace()
-                field = self._parse_identifier()
-                if field:
-                    fields.append(field)
-                self._skip_whitespace()
-                if self._pos < len(self._text) and self._text[self._pos] == ',':
-                    self._pos += 1
+            fields = self._parse_field_list()
             if self._pos < len(self._text):
                 self._pos += 1  # Skip }
 
@@ -769,7 +815,7 @@ def serialize_hud(hud_dict: dict, format: str = HUDFormat.JSON, record_telemetry
         Serialized string in the requested format
     """
     # Always compute JSON for baseline comparison
-    json_str = json.dumps(hud_dict, indent=2, ensure_ascii=False)
+    json_str = dumps_json(hud_dict, indent=2)
 
     if format == HUDFormat.JSON:
         result = json_str
@@ -793,8 +839,8 @@ def get_format_comparison(hud_dict: dict) -> dict:
 
     Useful for testing and analysis.
     """
-    json_str = json.dumps(hud_dict, indent=2, ensure_ascii=False)
-    json_no_indent = json.dumps(hud_dict, ensure_ascii=False)
+    json_str = dumps_json(hud_dict, indent=2)
+    json_no_indent = dumps_json(hud_dict)
     compact_str = to_compact_json(hud_dict, indent=None)
     toon_str = hud_to_toon(hud_dict)
 
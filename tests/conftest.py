@@ -0,0 +1,12 @@
+"""Pytest configuration for the AI Chat Room test suite.
+
+Puts the project root on sys.path once per session so test modules can
+import `models`, `services`, `config`, etc. directly.
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
@@ -21,6 +21,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tests import test_models
 from tests import test_database_service
 from tests import test_hud_service
+from tests import test_heartbeat_service
 from tests import test_openai_service
 from tests import test_toon_service
 from tests import test_config_prompts
@@ -32,6 +33,7 @@ TEST_SUITES = {
     'models': test_models,
     'database': test_database_service,
     'hud': test_hud_service,
+    'heartbeat': test_heartbeat_service,
     'openai': test_openai_service,
     'toon': test_toon_service,
     'config': test_config_prompts,
@@ -53,6 +55,9 @@ def get_all_test_cases():
     # HUD service
     suite.addTests(loader.loadTestsFromModule(test_hud_service))
 
+    # Heartbeat service
+    suite.addTests(loader.loadTestsFromModule(test_heartbeat_service))
+
     # OpenAI service
     suite.addTests(loader.loadTestsFromModule(test_openai_service))
 
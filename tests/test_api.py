@@ -2,20 +2,18 @@
 """Test suite for FastAPI REST API endpoints.
 
 Run with: python -m pytest tests/test_api.py -v
-Or standalone: python tests/test_api.py
+Or standalone: python -m tests.test_api
 
 These tests verify API endpoints work correctly with the service layer.
 """
 
 import sys
 import os
+import json
 import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from fastapi.testclient import TestClient
 
 
@@ -59,7 +57,7 @@ class TestAPIMessageEndpoints(unittest.TestCase):
             sequence_number=1,
             message_type="text"
         )
-        self.mock_db.get_messages_for_room.return_value = [mock_message]
+        self.mock_room.send_message.return_value = mock_message
 
         response = self.client.post(
             "/api/agents/2/room/messages",
@@ -94,7 +92,7 @@ class TestAPIMessageEndpoints(unittest.TestCase):
             message_type="text",
             reply_to_id=1
         )
-        self.mock_db.get_messages_for_room.return_value = [mock_message]
+        self.mock_room.send_message.return_value = mock_message
 
         response = self.client.post(
             "/api/agents/2/room/messages",
@@ -125,7 +123,7 @@ class TestAPIMessageEndpoints(unittest.TestCase):
             sequence_number=3,
             message_type="text"
         )
-        self.mock_db.get_messages_for_room.return_value = [mock_message]
+        self.mock_room.send_message.return_value = mock_message
 
         response = self.client.post(
             "/api/agents/2/room/messages",
@@ -138,6 +136,17 @@ class TestAPIMessageEndpoints(unittest.TestCase):
         call_args = self.mock_room.send_message.call_args
         self.assertIsNone(call_args.kwargs.get('reply_to_id'))
 
+    def test_get_messages_defaults_to_full_history(self):
+        """Test messages are only paged when the client asks for a limit."""
+        self.mock_db.get_messages_for_room.reset_mock()
+        self.mock_db.get_messages_for_room.return_value = []
+
+        self.client.get("/api/agents/2/room/messages")
+        self.mock_db.get_messages_for_room.assert_called_with(2, limit=None, before_seq=None)
+
+        self.client.get("/api/agents/2/room/messages?limit=50&before=900")
+        self.mock_db.get_messages_for_room.assert_called_with(2, limit=50, before_seq=900)
+
 
 class TestRoomServiceSendMessage(unittest.TestCase):
     """Direct tests for RoomService.send_message() method."""
@@ -251,6 +260,56 @@ class TestAPIAgentEndpoints(unittest.TestCase):
         data = response.json()
         self.assertIsInstance(data, list)
 
+    def test_get_agents_etag(self):
+        """Test unchanged agent list answers 304 to a matching If-None-Match."""
+        self.mock_db.get_all_agents.return_value = []
+
+        first = self.client.get("/api/agents")
+        etag = first.headers.get("etag")
+        self.assertIsNotNone(etag)
+
+        second = self.client.get("/api/agents", headers={"If-None-Match": etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+        third = self.client.get("/api/agents", headers={"If-None-Match": 'W/"stale"'})
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(third.json(), [])
+
+    def test_large_list_is_gzipped(self):
+        """Test large list responses are gzip-compressed on request."""
+        from models import AIAgent
+        from datetime import datetime
+
+        self.mock_db.get_all_agents.return_value = [
+            AIAgent(id=i, name=f"Agent {i}", model="gpt-5-mini",
+                    background_prompt="A fairly long background prompt " * 4,
+                    created_at=datetime.utcnow())
+            for i in range(2, 40)
+        ]
+
+        response = self.client.get("/api/agents", headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get("content-encoding"), "gzip")
+        self.assertEqual(len(response.json()), 38)
+
+    def test_knowledge_update_writes_only_self_concept(self):
+        """Test a knowledge PUT writes the self-concept column at once, not the agent row."""
+        from models import AIAgent
+
+        self.mock_db.get_agent.return_value = AIAgent(id=2, name="A", self_concept_json="{}")
+        self.mock_db.update_self_concepts.reset_mock()
+        self.mock_db.save_agent.reset_mock()
+
+        response = self.client.put("/api/agents/2/knowledge", json={"mood": "calm"})
+
+        self.assertEqual(response.status_code, 200)
+        self.mock_db.update_self_concepts.assert_called_once()
+        (written,), _ = self.mock_db.update_self_concepts.call_args
+        self.assertEqual(json.loads(written[2]), {"mood": "calm"})
+        self.mock_db.save_agent.assert_not_called()
+
     def test_create_agent(self):
         """Test creating a new agent."""
         self.mock_db.save_agent.return_value = 5
@@ -297,6 +356,37 @@ class TestAPIHealthEndpoint(unittest.TestCase):
         self.assertIn("api_connected", data)
 
 
+class TestAPISettingsEndpoints(unittest.TestCase):
+    """Tests for settings endpoints."""
+
+    def setUp(self):
+        """Set up test client."""
+        import api
+
+        api.db = MagicMock()
+        api.openai_service = MagicMock()
+        api.room_service = MagicMock()
+        api.heartbeat_service = MagicMock()
+        api.openai_service.has_api_key = True
+        api.openai_service.test_connection.return_value = (True, "Connection successful")
+        api.openai_service.get_available_models.return_value = ["gpt-5-mini"]
+        api._status_cache = None
+
+        self.api = api
+        self.client = TestClient(api.app, raise_server_exceptions=False)
+
+    def test_status_reuses_successful_check(self):
+        """Test repeated status polls make one connection test until the key changes."""
+        self.assertTrue(self.client.get("/api/settings/status").json()["connected"])
+        self.assertTrue(self.client.get("/api/settings/status").json()["connected"])
+        self.assertEqual(self.api.openai_service.test_connection.call_count, 1)
+
+        with patch.object(self.api, "HAS_KEYRING", False):
+            self.client.post("/api/settings/apikey", json={"api_key": "sk-new"})
+        self.client.get("/api/settings/status")
+        self.assertEqual(self.api.openai_service.test_connection.call_count, 3)
+
+
 def run_tests():
     """Run all tests and return success status."""
     loader = unittest.TestLoader()
@@ -306,6 +396,7 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestAPIMessageEndpoints))
     suite.addTests(loader.loadTestsFromTestCase(TestAPIAgentEndpoints))
     suite.addTests(loader.loadTestsFromTestCase(TestAPIHealthEndpoint))
+    suite.addTests(loader.loadTestsFromTestCase(TestAPISettingsEndpoints))
 
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
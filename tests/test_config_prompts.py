@@ -2,17 +2,16 @@
 """Test suite for config.py and prompts.py.
 
 Run with: python -m pytest tests/test_config_prompts.py -v
-Or standalone: python tests/test_config_prompts.py
+Or standalone: python -m tests.test_config_prompts
 """
 
 import sys
-import os
 import json
+import os
+import shutil
 import tempfile
 import unittest
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import patch
 
 import config
 import prompts
@@ -157,6 +156,71 @@ class TestPromptsSaveLoad(unittest.TestCase):
         prompts.save_prompts(test_data)
 
 
+    def test_load_prompts_rechecks_file_at_most_once_per_interval(self):
+        """Test hot reloads return the cache without stat'ing the file."""
+        prompts.load_prompts()
+        with patch("prompts.os.stat") as stat:
+            prompts.load_prompts()
+        stat.assert_not_called()
+
+    def test_built_sections_follow_saved_prompts(self):
+        """Test built instructions are reused until prompts.json changes."""
+        original = prompts.load_prompts()
+        first = prompts.build_agent_philosophy()
+        self.assertIs(prompts.build_agent_philosophy(), first)
+
+        test_data = dict(original, philosophy={"probe": {"content": "Probe text"}})
+        try:
+            prompts.save_prompts(test_data)
+            self.assertEqual(prompts.build_agent_philosophy(), "## Probe\nProbe text")
+        finally:
+            prompts.save_prompts(original)
+
+    def test_load_prompts_cached_until_saved(self):
+        """Test repeated loads reuse the parsed file until it is saved."""
+        original = prompts.load_prompts()
+        self.assertIs(prompts.load_prompts(), original)
+
+        test_data = dict(original, _test_key="test_value")
+        try:
+            prompts.save_prompts(test_data)
+            loaded = prompts.load_prompts()
+            self.assertIsNot(loaded, original)
+            self.assertEqual(loaded.get("_test_key"), "test_value")
+        finally:
+            prompts.save_prompts(original)
+
+
+class TestPromptBlocks(unittest.TestCase):
+    """Tests for prompt block overrides."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self._saved = (prompts.PROMPT_BLOCKS_FILE, prompts._prompt_block_overrides)
+        prompts.PROMPT_BLOCKS_FILE = os.path.join(self.tmpdir, "prompt_overrides.json")
+        prompts._prompt_block_overrides = None
+
+    def tearDown(self):
+        prompts.PROMPT_BLOCKS_FILE, prompts._prompt_block_overrides = self._saved
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_defaults_come_from_config(self):
+        """Test blocks without an override use the config constants."""
+        blocks = prompts.get_prompt_blocks()
+        self.assertEqual(blocks["system_directives"], config.SYSTEM_DIRECTIVES)
+        self.assertEqual(blocks["batch_instructions"], config.BATCH_INSTRUCTIONS)
+
+    def test_save_overrides_and_persists(self):
+        """Test saved overrides apply immediately and survive a reload."""
+        prompts.save_prompt_blocks({"system_directives": "Be brief.", "unknown": "ignored"})
+        self.assertEqual(prompts.get_prompt_block("system_directives"), "Be brief.")
+        self.assertEqual(prompts.get_prompt_block("persona_instructions"), config.PERSONA_INSTRUCTIONS)
+
+        prompts._prompt_block_overrides = None
+        self.assertEqual(prompts.get_prompt_block("system_directives"), "Be brief.")
+        self.assertNotIn("unknown", prompts._get_prompt_block_overrides())
+
+
 class TestPromptsContentStructure(unittest.TestCase):
     """Tests for prompts.json content structure."""
 
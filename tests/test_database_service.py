@@ -2,7 +2,7 @@
 """Test suite for DatabaseService - SQLite persistence layer.
 
 Run with: python -m pytest tests/test_database_service.py -v
-Or standalone: python tests/test_database_service.py
+Or standalone: python -m tests.test_database_service
 """
 
 import sys
@@ -11,9 +11,6 @@ import tempfile
 import unittest
 from datetime import datetime
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from services.database_service import DatabaseService
 from models import AIAgent, ChatMessage, ChatRoom, RoomMembership
 
@@ -81,6 +78,26 @@ class TestAgentCRUD(unittest.TestCase):
         self.assertEqual(retrieved.name, "TestAgent")
         self.assertEqual(retrieved.model, "gpt-4o-mini")
 
+    def test_get_agents_by_ids(self):
+        """Test batch agent lookup returns a dict and skips unknown IDs."""
+        a_id = self.db.save_agent(AIAgent(name="A"))
+        b_id = self.db.save_agent(AIAgent(name="B"))
+
+        agents = self.db.get_agents_by_ids([a_id, b_id, a_id, 9999])
+        self.assertEqual(set(agents), {a_id, b_id})
+        self.assertEqual(agents[b_id].name, "B")
+        self.assertEqual(self.db.get_agents_by_ids([]), {})
+
+    def test_update_self_concepts(self):
+        """Test writing several agents' self-concepts at once."""
+        id_a = self.db.save_agent(AIAgent(name="A", background_prompt="a"))
+        id_b = self.db.save_agent(AIAgent(name="B", background_prompt="b"))
+
+        self.db.update_self_concepts({id_a: '{"x": 1}', id_b: '{"y": 2}'})
+
+        self.assertEqual(self.db.get_agent(id_a).self_concept_json, '{"x": 1}')
+        self.assertEqual(self.db.get_agent(id_b).self_concept_json, '{"y": 2}')
+
     def test_update_agent(self):
         """Test updating an existing agent."""
         agent = AIAgent(name="Original")
@@ -206,6 +223,28 @@ class TestMessageCRUD(unittest.TestCase):
         room2_msgs = self.db.get_messages_for_room(2)
         self.assertEqual(len(room2_msgs), 1)
 
+    def test_get_messages_for_room_paged(self):
+        """Test reading the newest messages of a room a page at a time."""
+        for i in range(1, 6):
+            self.db.save_message(ChatMessage(room_id=1, content=f"M{i}", sequence_number=i))
+
+        page = self.db.get_messages_for_room(1, limit=2)
+        self.assertEqual([m.content for m in page], ["M4", "M5"])
+
+        older = self.db.get_messages_for_room(1, limit=2, before_seq=page[0].sequence_number)
+        self.assertEqual([m.content for m in older], ["M2", "M3"])
+
+    def test_get_recent_messages_bulk(self):
+        """Test getting the last few messages of several rooms at once."""
+        for i in range(4):
+            self.db.save_message(ChatMessage(room_id=1, content=f"R1-{i}", sequence_number=i + 1))
+        self.db.save_message(ChatMessage(room_id=2, content="R2-0", sequence_number=10))
+
+        recent = self.db.get_recent_messages_bulk([1, 2, 3], 2)
+        self.assertEqual([m.content for m in recent[1]], ["R1-2", "R1-3"])
+        self.assertEqual([m.content for m in recent[2]], ["R2-0"])
+        self.assertEqual(recent[3], [])
+
     def test_get_messages_since(self):
         """Test retrieving messages since a sequence number."""
         self.db.save_message(ChatMessage(room_id=1, content="Old", sequence_number=10))
@@ -254,6 +293,17 @@ class TestMessageCRUD(unittest.TestCase):
         seq2 = self.db.get_next_sequence_number()
         self.assertEqual(seq2, 2)
 
+    def test_add_messages_bulk(self):
+        """Test inserting several messages in one call."""
+        self.db.save_message(ChatMessage(room_id=1, content="Existing", sequence_number=5))
+        msgs = [ChatMessage(room_id=1, content="A"), ChatMessage(room_id=2, content="B")]
+        self.db.add_messages(msgs)
+
+        self.assertEqual([m.sequence_number for m in msgs], [6, 7])
+        self.assertTrue(all(m.id for m in msgs))
+        self.assertEqual(self.db.get_message_by_id(msgs[1].id).content, "B")
+        self.assertEqual(self.db.get_next_sequence_number(), 8)
+
     def test_message_with_reply(self):
         """Test saving message with reply_to_id."""
         parent_id = self.db.save_message(ChatMessage(room_id=1, content="Parent"))
@@ -304,6 +354,17 @@ class TestMembershipCRUD(unittest.TestCase):
         members = self.db.get_room_members(5)
         self.assertEqual(len(members), 3)
 
+    def test_get_room_members_bulk(self):
+        """Test getting memberships for several rooms at once."""
+        self.db.save_membership(RoomMembership(agent_id=1, room_id=5))
+        self.db.save_membership(RoomMembership(agent_id=2, room_id=5))
+        self.db.save_membership(RoomMembership(agent_id=1, room_id=6))
+
+        members = self.db.get_room_members_bulk([5, 6, 7])
+        self.assertEqual(sorted(m.agent_id for m in members[5]), [1, 2])
+        self.assertEqual([m.agent_id for m in members[6]], [1])
+        self.assertEqual(members[7], [])
+
     def test_get_agent_memberships(self):
         """Test getting all memberships for an agent."""
         self.db.save_membership(RoomMembership(agent_id=5, room_id=1))
@@ -384,9 +445,27 @@ class TestReactions(unittest.TestCase):
         import shutil
         shutil.rmtree(self.tmpdir, ignore_errors=True)
 
-    
-    
-    
+    def test_add_reaction_once_per_type(self):
+        """Test a reactor can add each reaction type only once."""
+        self.assertGreater(self.db.add_reaction(self.msg_id, 2, "heart"), 0)
+        self.assertEqual(self.db.add_reaction(self.msg_id, 2, "heart"), 0)
+
+    def test_reactions_summary_bulk(self):
+        """Test bulk summary groups counts per message and type."""
+        other_id = self.db.save_message(ChatMessage(room_id=1, content="Other"))
+        quiet_id = self.db.save_message(ChatMessage(room_id=1, content="Quiet"))
+        self.db.add_reaction(self.msg_id, 2, "thumbs_up")
+        self.db.add_reaction(self.msg_id, 3, "thumbs_up")
+        self.db.add_reaction(self.msg_id, 3, "brain")
+        self.db.add_reaction(other_id, 2, "heart")
+
+        summary = self.db.get_reactions_summary_bulk([self.msg_id, other_id, quiet_id])
+        self.assertEqual(summary[self.msg_id], {"thumbs_up": 2, "brain": 1})
+        self.assertEqual(summary[other_id], {"heart": 1})
+        self.assertNotIn(quiet_id, summary)
+        self.assertEqual(self.db.get_reactions_summary_bulk([]), {})
+
+
 class TestSessionExportImport(unittest.TestCase):
     """Tests for session export/import functionality."""
 
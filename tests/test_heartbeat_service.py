@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Test suite for HeartbeatService - batched heartbeat bundling.
+
+Run with: python -m pytest tests/test_heartbeat_service.py -v
+Or standalone: python -m tests.test_heartbeat_service
+"""
+
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from services.heartbeat_service import HeartbeatService
+from services.toon_service import get_telemetry
+from models import AIAgent, ChatMessage
+import config
+import prompts
+
+
+class TestBatchBundling(unittest.TestCase):
+    """Tests for size/timeout bundling of due agents into batches."""
+
+    def setUp(self):
+        self.service = HeartbeatService(MagicMock(), MagicMock(), MagicMock())
+
+    def _agents(self, count, model="gpt-5-mini"):
+        return [AIAgent(id=i + 1, name=f"Agent{i + 1}", model=model) for i in range(count)]
+
+    def test_full_batch_sent_immediately(self):
+        """Test a model queue at the preferred size is sent without waiting."""
+        with patch.object(config, "BATCH_PREFERRED_SIZE", 3):
+            self.service.enqueue_batch_agents(self._agents(7), now=100.0)
+            batches = self.service.take_ready_batches(now=100.0)
+
+        self.assertEqual([len(agents) for _, agents in batches], [3, 3])
+        self.assertEqual([a.id for a in batches[0][1]], [1, 2, 3])
+        self.assertEqual(self.service._next_batch_deadline(), 100.0 + config.BATCH_MAX_WAIT_MS / 1000)
+
+    def test_partial_batch_waits_for_timeout(self):
+        """Test a partial batch is held until its oldest agent times out."""
+        max_wait = config.BATCH_MAX_WAIT_MS / 1000
+        self.service.enqueue_batch_agents(self._agents(2), now=100.0)
+        self.service.enqueue_batch_agents(self._agents(1, model="gpt-5-nano"), now=100.5)
+
+        self.assertEqual(self.service.take_ready_batches(now=100.0 + max_wait / 2), [])
+        batches = self.service.take_ready_batches(now=100.0 + max_wait)
+        self.assertEqual([(model, len(agents)) for model, agents in batches], [("gpt-5-mini", 2)])
+        self.assertEqual(self.service._next_batch_deadline(), 100.5 + max_wait)
+
+    def test_agent_queued_once(self):
+        """Test an agent already waiting for a batch is not queued again."""
+        agent = self._agents(1)[0]
+        self.service.enqueue_batch_agents([agent], now=100.0)
+        self.service.enqueue_batch_agents([agent], now=100.5)
+
+        batches = self.service.take_ready_batches(now=102.0)
+        self.assertEqual([[a.id for a in agents] for _, agents in batches], [[1]])
+
+    def test_stop_drops_pending_batches(self):
+        """Test agents queued before stop() are not sent after a restart."""
+        agent = self._agents(1)[0]
+        self.service.enqueue_batch_agents([agent], now=100.0)
+        self.service._is_running = True
+        self.service.stop()
+        self.assertIsNone(self.service._next_batch_deadline())
+
+        self.service.enqueue_batch_agents([agent], now=200.0)
+        batches = self.service.take_ready_batches(now=201.5)
+        self.assertEqual([[a.id for a in agents] for _, agents in batches], [[1]])
+
+    def test_fixed_cost_measured_once(self):
+        """Test the fixed per-request cost covers the shared HUD and is cached."""
+        fixed = self.service.batch_fixed_cost_tokens()
+        shared_hud, _ = self.service._hud.build_batched_hud([], {}, output_format='toon')
+        self.assertGreater(fixed, len(shared_hud) // 4)
+
+        with patch.object(self.service._hud, "build_batched_hud") as build:
+            self.assertEqual(self.service.batch_fixed_cost_tokens(), fixed)
+        build.assert_not_called()
+
+    def test_fixed_cost_remeasured_after_prompt_block_edit(self):
+        """Test an edited prompt block is measured again, without recording telemetry."""
+        fixed = self.service.batch_fixed_cost_tokens()
+        entries = len(get_telemetry().get_entries())
+
+        edited = {"system_directives": config.SYSTEM_DIRECTIVES + " extra" * 400}
+        with patch.object(prompts, "_prompt_block_overrides", edited):
+            self.assertGreater(self.service.batch_fixed_cost_tokens(), fixed + 300)
+        self.assertEqual(self.service.batch_fixed_cost_tokens(), fixed)
+        self.assertEqual(len(get_telemetry().get_entries()), entries)
+
+    def test_preferred_size_fits_context(self):
+        """Test measured per-agent tokens lower the batch size to fit the model."""
+        model = "gpt-5-mini"
+        self.assertEqual(self.service.batch_preferred_size(model), config.BATCH_PREFERRED_SIZE)
+
+        fixed = self.service.batch_fixed_cost_tokens()
+        per_agent = (config.MODEL_CONTEXT_LIMITS[model] - fixed - config.BATCH_RESERVE_TOKENS) / 2
+        self.service._batch_agent_tokens[model] = per_agent
+        self.assertEqual(self.service.batch_preferred_size(model), 2)
+
+        self.service._batch_agent_tokens[model] = per_agent * 10
+        self.assertEqual(self.service.batch_preferred_size(model), 1)
+
+
+class TestReactions(unittest.TestCase):
+    """Tests for agent reactions to messages."""
+
+    def setUp(self):
+        self.database = MagicMock()
+        self.room_service = MagicMock()
+        self.service = HeartbeatService(MagicMock(), self.database, self.room_service)
+
+    def test_reaction_notifies_reactions_changed(self):
+        """Test a reaction, even to a non-agent sender, tells listeners to redraw reactions."""
+        self.database.get_message_by_id.return_value = ChatMessage(
+            id=10, room_id=3, sender_name="The Architect", content="Hi"
+        )
+        agent = AIAgent(id=7, name="Agent7")
+
+        self.service._process_reaction(agent, {"message_id": 10, "reaction": "heart"})
+
+        self.database.add_reaction.assert_called_once_with(10, 7, "heart")
+        self.room_service.notify_reactions_changed.assert_called_once_with(3)
+
+
+def run_tests():
+    """Run all tests and return success status."""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchBundling))
+    suite.addTests(loader.loadTestsFromTestCase(TestReactions))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Heartbeat Service Test Suite")
+    print("=" * 70)
+
+    success = run_tests()
+    sys.exit(0 if success else 1)
@@ -2,19 +2,17 @@
 """Test suite for HUDService - Context window building and response parsing.
 
 Run with: python -m pytest tests/test_hud_service.py -v
-Or standalone: python tests/test_hud_service.py
+Or standalone: python -m tests.test_hud_service
 """
 
 import sys
-import os
 import json
 import unittest
 from datetime import datetime, timedelta
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import patch
 
 from services.hud_service import HUDService
+from services.scoring import importance, pack_by_importance
 from models import AIAgent, ChatMessage, ChatRoom, RoomMembership, SelfConcept
 from models.ai_agent import HUD_FORMAT_JSON, HUD_FORMAT_COMPACT, HUD_FORMAT_TOON
 import config
@@ -23,8 +21,9 @@ import config
 class TestHUDServiceBasics(unittest.TestCase):
     """Basic tests for HUD service initialization and utilities."""
 
-    def setUp(self):
-        self.hud = HUDService()
+    @classmethod
+    def setUpClass(cls):
+        cls.hud = HUDService()
 
     def test_initialization(self):
         """Test HUD service initializes correctly."""
@@ -52,8 +51,9 @@ class TestHUDServiceBasics(unittest.TestCase):
 class TestSystemDirectives(unittest.TestCase):
     """Tests for system directives building."""
 
-    def setUp(self):
-        self.hud = HUDService()
+    @classmethod
+    def setUpClass(cls):
+        cls.hud = HUDService()
 
     def test_build_system_directives(self):
         """Test building system directives."""
@@ -71,8 +71,9 @@ class TestSystemDirectives(unittest.TestCase):
 class TestMetaInstructions(unittest.TestCase):
     """Tests for meta instructions building."""
 
-    def setUp(self):
-        self.hud = HUDService()
+    @classmethod
+    def setUpClass(cls):
+        cls.hud = HUDService()
 
     def test_build_persona_instructions(self):
         """Test building instructions for persona agents."""
@@ -89,8 +90,9 @@ class TestMetaInstructions(unittest.TestCase):
 class TestAvailableActions(unittest.TestCase):
     """Tests for available actions building."""
 
-    def setUp(self):
-        self.hud = HUDService()
+    @classmethod
+    def setUpClass(cls):
+        cls.hud = HUDService()
 
     def test_build_basic_actions(self):
         """Test building basic available actions."""
@@ -124,8 +126,9 @@ class TestAvailableActions(unittest.TestCase):
 class TestResponseParsing(unittest.TestCase):
     """Tests for parsing agent responses."""
 
-    def setUp(self):
-        self.hud = HUDService()
+    @classmethod
+    def setUpClass(cls):
+        cls.hud = HUDService()
 
     def test_parse_empty_response(self):
         """Test parsing empty response."""
@@ -133,6 +136,25 @@ class TestResponseParsing(unittest.TestCase):
         self.assertEqual(responses, [])
         self.assertEqual(actions, [])
 
+    def test_parse_whitespace_response(self):
+        """Test parsing whitespace-only response."""
+        responses, actions = self.hud.parse_response("  \n\t ")
+        self.assertEqual(responses, [])
+        self.assertEqual(actions, [])
+
+    def test_parse_bytes_response(self):
+        """Test parsing a JSON response given as raw bytes."""
+        response_bytes = json.dumps({
+            "actions": [
+                {"type": "message", "room_id": 2, "content": "From bytes"},
+                {"type": "set", "path": "mood", "value": "happy"}
+            ]
+        }).encode("utf-8")
+        responses, actions = self.hud.parse_response(response_bytes)
+
+        self.assertEqual(responses, [{"room_id": 2, "message": "From bytes"}])
+        self.assertEqual(len(actions), 1)
+
     def test_parse_json_response(self):
         """Test parsing valid JSON response."""
         response_json = json.dumps({
@@ -218,12 +240,31 @@ class TestResponseParsing(unittest.TestCase):
         responses, actions = self.hud.parse_response(toon_str, HUD_FORMAT_TOON)
         self.assertEqual(len(responses), 1)
 
+    def test_parse_json_response_in_toon_mode(self):
+        """Test that a JSON reply is accepted when TOON was requested."""
+        response_json = json.dumps({
+            "actions": [{"type": "message", "room_id": 4, "content": "JSON anyway"}]
+        })
+        responses, actions = self.hud.parse_response(response_json, HUD_FORMAT_TOON)
+
+        self.assertEqual(responses, [{"room_id": 4, "message": "JSON anyway"}])
+
+    def test_parse_plain_text_in_toon_mode(self):
+        """Test that plain text in TOON mode returns empty instead of raising."""
+        responses, actions = self.hud.parse_response("just some words", HUD_FORMAT_TOON)
+        self.assertEqual(responses, [])
+        self.assertEqual(actions, [])
+
 
 class TestActionApplication(unittest.TestCase):
     """Tests for applying actions to agent state."""
 
+    @classmethod
+    def setUpClass(cls):
+        # Shared service - these tests only inspect the agent, not the action history
+        cls.hud = HUDService()
+
     def setUp(self):
-        self.hud = HUDService()
         self.agent = AIAgent(
             id=1,
             name="TestAgent",
@@ -318,6 +359,44 @@ class TestActionApplication(unittest.TestCase):
         applied = self.hud.apply_actions(self.agent, actions)
 
         self.assertEqual(applied, 3)
+        sc = SelfConcept.from_json(self.agent.self_concept_json)
+        self.assertEqual(sc.to_dict(), {"a": 1, "b": 2, "c": 3})
+
+    def test_non_knowledge_actions_leave_self_concept_untouched(self):
+        """Test that a batch without knowledge actions doesn't rewrite the self-concept."""
+        self.agent.self_concept_json = '{"kept":   "as-is"}'
+        actions = [
+            {"type": "set_name", "name": "Renamed"}
+        ]
+        self.hud.apply_actions(self.agent, actions)
+
+        self.assertEqual(self.agent.self_concept_json, '{"kept":   "as-is"}')
+
+    def test_failed_knowledge_actions_leave_self_concept_untouched(self):
+        """Test that knowledge actions which all fail don't rewrite the self-concept."""
+        self.agent.self_concept_json = '{"kept":   "as-is"}'
+        actions = [
+            {"type": "set", "path": "", "value": 1},
+            {"type": "delete", "path": ""}
+        ]
+        self.hud.apply_actions(self.agent, actions)
+
+        self.assertEqual(self.agent.self_concept_json, '{"kept":   "as-is"}')
+
+    def test_knowledge_handler_error_drops_cached_self_concept(self):
+        """Test a knowledge handler failing mid-change doesn't leave a half-applied cached copy."""
+        self.agent.self_concept_json = '{"kept": 1}'
+        self.agent.get_self_concept()
+
+        def half_apply(hud, agent, action, self_concept):
+            self_concept.set("partial", True)
+            raise RuntimeError("boom")
+
+        with patch.dict(HUDService._ACTION_HANDLERS, {"set": half_apply}):
+            self.hud.apply_actions(self.agent, [{"type": "set", "path": "x", "value": 1}])
+
+        self.assertEqual(self.agent.self_concept_json, '{"kept": 1}')
+        self.assertEqual(self.agent.get_self_concept().to_dict(), {"kept": 1})
 
     def test_apply_no_actions(self):
         """Test applying empty actions list."""
@@ -337,6 +416,7 @@ class TestRecentActions(unittest.TestCase):
     """Tests for recent action tracking."""
 
     def setUp(self):
+        # Fresh service per test - the action history under test lives on it
         self.hud = HUDService()
         self.agent = AIAgent(id=1, name="Test", self_concept_json="{}")
 
@@ -367,12 +447,46 @@ class TestRecentActions(unittest.TestCase):
         recent = self.hud.get_recent_actions(1)
         self.assertLessEqual(len(recent), 50)  # config.MAX_RECENT_ACTIONS
 
+    def test_oldest_actions_trimmed_first(self):
+        """Test that trimming keeps the most recent actions in order."""
+        for i in range(config.MAX_RECENT_ACTIONS + 5):
+            self.hud._record_action(1, {"type": "set", "path": f"key{i}", "value": i})
+
+        recent = self.hud.get_recent_actions(1)
+        self.assertEqual(len(recent), config.MAX_RECENT_ACTIONS)
+        self.assertEqual(recent[0]["path"], "key5")
+        self.assertEqual(recent[-1]["path"], f"key{config.MAX_RECENT_ACTIONS + 4}")
+
+    def test_long_values_truncated_when_recorded(self):
+        """Test the stored history keeps only truncated values, not the full payload."""
+        self.hud._record_action(1, {"type": "set", "path": "notes", "value": "x" * 500})
+
+        stored = self.hud._recent_actions[1][0]
+        self.assertEqual(stored["value"], "x" * 47 + "...")
+        self.assertEqual(self.hud.get_recent_actions(1), [stored])
+
+    def test_least_recently_active_agent_evicted(self):
+        """Test that the history is bounded across agents, evicting the least recently active."""
+        self.hud._max_tracked_agents = 3
+        for agent_id in (1, 2, 3):
+            self.hud._record_action(agent_id, {"type": "set", "path": "x", "value": 1})
+        self.hud._record_action(1, {"type": "set", "path": "y", "value": 2})  # 1 is active again
+        self.hud._record_action(4, {"type": "set", "path": "z", "value": 3})
+
+        self.assertEqual(len(self.hud.get_recent_actions(1)), 2)
+        self.assertEqual(self.hud.get_recent_actions(2), [])
+        self.assertEqual(len(self.hud.get_recent_actions(4)), 1)
+
 
 class TestHUDBuilding(unittest.TestCase):
     """Tests for full HUD building."""
 
+    @classmethod
+    def setUpClass(cls):
+        # Shared service - these tests only inspect the agent, not the action history
+        cls.hud = HUDService()
+
     def setUp(self):
-        self.hud = HUDService()
         self.agent = AIAgent(
             id=5,
             name="TestBot",
@@ -484,6 +598,64 @@ class TestHUDBuilding(unittest.TestCase):
         self.assertIn("sys", hud_str)  # "system" -> "sys"
 
 
+class TestBatchedContextPacking(unittest.TestCase):
+    """Tests for importance-based message packing in batched agent segments."""
+
+    def setUp(self):
+        self.hud = HUDService()
+        self.agent = AIAgent(id=5, name="TestBot", agent_type="bot", model="gpt-5-mini")
+
+    def test_importance_boosts(self):
+        """Test recency decay and mention/reply boosts."""
+        now = datetime.utcnow()
+        old = now - timedelta(seconds=config.CONTEXT_RECENCY_TAU_SECONDS * 3)
+        fresh = importance("hello", now, "TestBot", now)
+        stale = importance("hello", old, "TestBot", now)
+        self.assertGreater(fresh, stale)
+        self.assertGreater(importance("hey @testbot", old, "TestBot", now), fresh)
+        self.assertGreater(importance("hello", old, "TestBot", now, replies_to_agent=True), fresh)
+        self.assertEqual(importance("TestBotty", old, "TestBot", now), stale)
+
+    def test_numeric_name_needs_explicit_mention(self):
+        """Test an agent named with digits is only mentioned via @name or #name."""
+        now = datetime.utcnow()
+        plain = importance("we need 42 more", now, "42", now)
+        self.assertEqual(plain, importance("we need more", now, "42", now))
+        self.assertGreater(importance("@42 are you there?", now, "42", now), plain)
+        self.assertGreater(importance("thanks #42", now, "42", now), plain)
+
+    def test_pack_by_importance(self):
+        """Test greedy packing keeps top scores that fit, in original order."""
+        self.assertEqual(pack_by_importance([0.1, 0.9, 0.5, 0.8], [5, 6, 1, 6], 8), [1, 2])
+        self.assertEqual(pack_by_importance([1.0, 1.0], [3, 3], 3), [1])
+
+    def test_segment_packs_to_budget(self):
+        """Test an agent segment keeps mentions and recent messages within its budget."""
+        now = datetime.utcnow()
+        messages = [
+            ChatMessage(id=i, room_id=5, sender_id=6, sender_name="Alice",
+                        content="x" * 400, timestamp=now - timedelta(hours=10 - i))
+            for i in range(1, 10)
+        ]
+        messages[0].content = "@TestBot are you there?"
+        room_data = [{
+            'room': ChatRoom(id=5, name="TestRoom"),
+            'membership': RoomMembership(agent_id=5, room_id=5, attention_pct=100.0),
+            'messages': messages,
+            'members': [5, 6],
+        }]
+
+        with patch.object(config, "CONTEXT_BASE_TOKENS", 300), \
+                patch.dict(config.CONTEXT_ROLE_TOKENS, {"bot": 0}):
+            segment, _ = self.hud.build_agent_segment(self.agent, room_data)
+
+        kept = [m["id"] for m in segment["rooms"][0]["messages"]]
+        self.assertEqual(kept, [1, 8, 9])
+        budget = segment["context_budget"]
+        self.assertEqual((budget["budget"], budget["kept"], budget["dropped"]), (300, 3, 6))
+        self.assertLessEqual(budget["used"], 300)
+
+
 def run_tests():
     """Run all tests and return success status."""
     loader = unittest.TestLoader()
@@ -497,6 +669,7 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestActionApplication))
     suite.addTests(loader.loadTestsFromTestCase(TestRecentActions))
     suite.addTests(loader.loadTestsFromTestCase(TestHUDBuilding))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchedContextPacking))
 
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
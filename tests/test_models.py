@@ -2,19 +2,17 @@
 """Test suite for data models (AIAgent, ChatMessage, ChatRoom, RoomMembership, SelfConcept).
 
 Run with: python -m pytest tests/test_models.py -v
-Or standalone: python tests/test_models.py
+Or standalone: python -m tests.test_models
 """
 
 import sys
-import os
 import json
 import unittest
-from datetime import datetime, timedelta
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
 
 from models import AIAgent, ChatMessage, ChatRoom, RoomMembership, SelfConcept
+from models.chat_message import SENDER_AGENT, SENDER_OTHER, SENDER_SYSTEM, SENDER_USER
 from models.ai_agent import (
     HUD_FORMAT_JSON, HUD_FORMAT_COMPACT, HUD_FORMAT_TOON,
     HUD_INPUT_FORMATS, HUD_OUTPUT_FORMATS
@@ -125,6 +123,35 @@ class TestAIAgent(unittest.TestCase):
         self.assertEqual(restored.hud_input_format, original.hud_input_format)
         self.assertEqual(restored.hud_output_format, original.hud_output_format)
 
+    def test_roundtrip_dict_unchecked(self):
+        """Test trusted-row loading matches the validated path."""
+        original = AIAgent(
+            id=11,
+            name="Trusted",
+            background_prompt="From our own DB",
+            is_architect=True,
+            sleep_until=datetime.utcnow() + timedelta(minutes=5)
+        )
+        data = original.to_dict()
+        data['is_architect'] = 1  # SQLite stores booleans as integers
+        restored = AIAgent.from_dict_unchecked(data)
+
+        self.assertEqual(restored, AIAgent.from_dict(data))
+        self.assertIs(restored.is_architect, True)
+
+    def test_memory_allocations_cached_copy(self):
+        """Test parsed allocations are reused but callers can't corrupt them."""
+        agent = AIAgent(memory_allocations_json='{"knowledge": 50}')
+        first = agent.get_memory_allocations()
+        self.assertEqual(first["knowledge"], 50)
+        self.assertEqual(first["rooms"], 60)
+        first["knowledge"] = 99
+        self.assertEqual(agent.get_memory_allocations()["knowledge"], 50)
+
+        self.assertTrue(agent.set_memory_allocation("rooms", 40))
+        self.assertEqual(agent.get_memory_allocations()["rooms"], 40)
+        self.assertFalse(agent.set_memory_allocation("bogus", 10))
+
     def test_hud_format_constants(self):
         """Test HUD format constants are valid."""
         self.assertEqual(HUD_FORMAT_JSON, "json")
@@ -158,6 +185,37 @@ class TestAIAgent(unittest.TestCase):
         agent = AIAgent.from_dict(data)
         self.assertEqual(agent.hud_input_format, 'compact_json')
 
+    def test_pending_action_queues_initialized(self):
+        """Test that runtime action queues start empty and aren't shared between agents."""
+        agent = AIAgent(id=1)
+        other = AIAgent(id=2)
+        self.assertEqual(agent._pending_messages, [])
+        self.assertIsNone(agent._pending_sleep)
+        self.assertFalse(agent._over_budget)
+
+        agent._pending_messages.append({"room_id": 1, "content": "hi"})
+        self.assertEqual(other._pending_messages, [])
+        self.assertNotIn('_pending_messages', agent.to_dict())
+
+    def test_self_concept_cached_until_json_changes(self):
+        """Test that the parsed self-concept is reused until self_concept_json changes."""
+        agent = AIAgent(id=1, self_concept_json='{"mood": "calm"}')
+        first = agent.get_self_concept()
+        self.assertIs(agent.get_self_concept(), first)
+
+        agent.self_concept_json = '{"mood": "busy"}'
+        self.assertEqual(agent.get_self_concept().get("mood"), "busy")
+
+    def test_set_self_concept_syncs_json(self):
+        """Test that set_self_concept serializes and keeps the parsed copy."""
+        agent = AIAgent(id=1)
+        sc = agent.get_self_concept()
+        sc.set("mood", "happy")
+        agent.set_self_concept(sc)
+
+        self.assertEqual(json.loads(agent.self_concept_json), {"mood": "happy"})
+        self.assertIs(agent.get_self_concept(), sc)
+
 
 class TestChatMessage(unittest.TestCase):
     """Tests for ChatMessage model."""
@@ -206,6 +264,21 @@ class TestChatMessage(unittest.TestCase):
         self.assertTrue(msg.is_image)
         self.assertEqual(msg.image_url, "https://example.com/image.png")
 
+    def test_sender_kind(self):
+        """Test sender kind and agent ID are derived from sender_name."""
+        cases = [
+            ("System", SENDER_SYSTEM, None),
+            ("The Architect", SENDER_USER, None),
+            ("User", SENDER_USER, None),
+            ("42", SENDER_AGENT, 42),
+            ("Alice", SENDER_OTHER, None),
+        ]
+        for sender_name, kind, agent_id in cases:
+            with self.subTest(sender_name=sender_name):
+                msg = ChatMessage(sender_name=sender_name)
+                self.assertEqual(msg.sender_kind, kind)
+                self.assertEqual(msg.sender_agent_id, agent_id)
+
     def test_reply_to_message(self):
         """Test creating a reply message."""
         msg = ChatMessage(
@@ -267,18 +340,65 @@ class TestChatMessage(unittest.TestCase):
         self.assertEqual(restored.content, original.content)
         self.assertEqual(restored.reply_to_id, original.reply_to_id)
 
+    def test_roundtrip_dict_unchecked(self):
+        """Test trusted-row loading matches the validated path."""
+        original = ChatMessage(id=101, room_id=10, sender_name="Trusted", content="hi")
+        data = original.to_dict()
+        self.assertEqual(ChatMessage.from_dict_unchecked(data), ChatMessage.from_dict(data))
+
     def test_timestamp_handling(self):
         """Test timestamp serialization and deserialization."""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         msg = ChatMessage(timestamp=now)
         data = msg.to_dict()
 
         # Timestamp should be ISO format string
         self.assertIsInstance(data['timestamp'], str)
 
-        # Should restore to datetime
+        # Should restore to the same (tz-aware) datetime
         restored = ChatMessage.from_dict(data)
         self.assertIsInstance(restored.timestamp, datetime)
+        self.assertEqual(restored.timestamp, now)
+
+    def test_from_json_list(self):
+        """Test batch decode matches per-item from_dict."""
+        for size in (1, 10, 100):
+            with self.subTest(size=size):
+                dicts = [
+                    ChatMessage(id=i, room_id=1, sender_name="A", content=f"m{i}",
+                                sequence_number=i).to_dict()
+                    for i in range(size)
+                ]
+                batch = ChatMessage.from_json_list(json.dumps(dicts).encode())
+                self.assertEqual(batch, [ChatMessage.from_dict(d) for d in dicts])
+
+    def test_message_type_shares_one_instance(self):
+        """Test loaded enum-like strings map to a shared instance."""
+        fresh = "".join(["sys", "tem"])  # Distinct object, equal value
+        a = ChatMessage.from_dict({'message_type': fresh})
+        b = ChatMessage.from_dict({'message_type': "".join(["sys", "tem"])})
+        self.assertIs(a.message_type, b.message_type)
+        self.assertTrue(a.is_system_message)
+
+    def test_default_timestamp_is_naive_utc(self):
+        """Test default timestamps stay naive UTC, matching stored rows."""
+        msg = ChatMessage()
+        self.assertIsNone(msg.timestamp.tzinfo)
+        self.assertLess(abs(msg.timestamp - datetime.now(timezone.utc).replace(tzinfo=None)),
+                        timedelta(seconds=5))
+
+    def test_utcnow_iso_seconds(self):
+        """Test the per-second timestamp is current, whole-second and reused."""
+        from models.timestamps import utcnow_iso_seconds
+        stamp = utcnow_iso_seconds()
+        parsed = datetime.fromisoformat(stamp)
+        self.assertEqual(parsed.microsecond, 0)
+        self.assertLess(abs(parsed - datetime.now(timezone.utc).replace(tzinfo=None)), timedelta(seconds=5))
+
+        with patch("models.timestamps.time.time", return_value=1_700_000_000.5):
+            first = utcnow_iso_seconds()
+            self.assertIs(utcnow_iso_seconds(), first)
+        self.assertEqual(first, "2023-11-14T22:13:20")
 
 
 class TestChatRoom(unittest.TestCase):
@@ -409,7 +529,7 @@ class TestRoomMembership(unittest.TestCase):
 
     def test_last_response_time_handling(self):
         """Test last_response_time serialization."""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         membership = RoomMembership(last_response_time=now)
         data = membership.to_dict()
 
@@ -417,9 +537,39 @@ class TestRoomMembership(unittest.TestCase):
         self.assertIsNotNone(restored.last_response_time)
 
 
+class TestModelRoundtrips(unittest.TestCase):
+    """Full-equality to_dict -> from_dict roundtrips across all persisted models."""
+
+    CASES = [
+        (AIAgent, {'id': 1, 'name': 'A', 'temperature': 1.1, 'is_architect': True,
+                   'hud_input_format': HUD_FORMAT_TOON, 'sleep_until': datetime(2030, 1, 1)}),
+        (ChatMessage, {'id': 2, 'room_id': 3, 'sender_id': 4, 'content': 'hi', 'reply_to_id': 1}),
+        (ChatRoom, {'id': 5, 'name': 'Room'}),
+        (RoomMembership, {'id': 6, 'agent_id': 7, 'room_id': 8, 'is_dynamic': True,
+                          'last_response_time': datetime(2030, 1, 1, 12, 30)}),
+    ]
+
+    def test_roundtrip_equality(self):
+        """Test every persisted field survives the roundtrip."""
+        for cls, kwargs in self.CASES:
+            with self.subTest(model=cls.__name__):
+                original = cls(**kwargs)
+                self.assertEqual(cls.from_dict(original.to_dict()), original)
+
+
 class TestSelfConcept(unittest.TestCase):
     """Tests for SelfConcept model - the flexible JSON knowledge store."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build read-only fixtures once; tests that write make their own."""
+        cls.people_sc = SelfConcept({
+            "people": {
+                "Alice": {"trust": 0.8, "role": "friend"}
+            }
+        })
+        cls.items_sc = SelfConcept({"items": ["a", "b", "c"]})
+
     def test_create_empty(self):
         """Test creating empty self-concept."""
         sc = SelfConcept()
@@ -439,23 +589,19 @@ class TestSelfConcept(unittest.TestCase):
 
     def test_get_nested_path(self):
         """Test getting value at nested path."""
-        sc = SelfConcept({
-            "people": {
-                "Alice": {"trust": 0.8, "role": "friend"}
-            }
-        })
+        sc = self.people_sc
         self.assertEqual(sc.get("people.Alice.trust"), 0.8)
         self.assertEqual(sc.get("people.Alice.role"), "friend")
 
     def test_get_missing_path(self):
         """Test getting non-existent path returns None."""
-        sc = SelfConcept({"a": 1})
-        self.assertIsNone(sc.get("b"))
-        self.assertIsNone(sc.get("a.b.c"))
+        sc = self.people_sc
+        self.assertIsNone(sc.get("places"))
+        self.assertIsNone(sc.get("people.Alice.trust.level"))
 
     def test_get_array_index(self):
         """Test getting array element by index."""
-        sc = SelfConcept({"items": ["a", "b", "c"]})
+        sc = self.items_sc
         self.assertEqual(sc.get("items.0"), "a")
         self.assertEqual(sc.get("items.2"), "c")
 
@@ -541,6 +687,11 @@ class TestSelfConcept(unittest.TestCase):
         parsed = json.loads(json_str)
         self.assertEqual(parsed["name"], "Test")
 
+    def test_to_json_large_integer(self):
+        """Test serializing integers too large for a 64-bit encoder."""
+        sc = SelfConcept({"big": 10 ** 30})
+        self.assertEqual(json.loads(sc.to_json())["big"], 10 ** 30)
+
     def test_from_json(self):
         """Test JSON deserialization."""
         json_str = '{"name": "Test", "nested": {"value": 123}}'
@@ -560,12 +711,7 @@ class TestSelfConcept(unittest.TestCase):
 
     def test_migration_from_old_format_facts(self):
         """Test migration from old facts/theories format."""
-        old_json = json.dumps({
-            "facts": [
-                {"content": "Fact 1"},
-                {"content": "Fact 2"}
-            ]
-        })
+        old_json = b'{"facts": [{"content": "Fact 1"}, {"content": "Fact 2"}]}'
         sc = SelfConcept.from_json(old_json)
         facts = sc.get("facts")
         self.assertIsInstance(facts, list)
@@ -573,11 +719,7 @@ class TestSelfConcept(unittest.TestCase):
 
     def test_migration_from_old_format_relationships(self):
         """Test migration from old relationships format."""
-        old_json = json.dumps({
-            "relationships": [
-                {"with": "Alice", "notes": "Friend"}
-            ]
-        })
+        old_json = b'{"relationships": [{"with": "Alice", "notes": "Friend"}]}'
         sc = SelfConcept.from_json(old_json)
         alice = sc.get("people.Alice")
         self.assertIsNotNone(alice)
@@ -607,6 +749,16 @@ class TestSelfConcept(unittest.TestCase):
 class TestSelfConceptEdgeCases(unittest.TestCase):
     """Edge case tests for SelfConcept."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build read-only fixtures once; tests that write make their own."""
+        cls.projects_sc = SelfConcept({
+            "projects": [
+                {"name": "Project A", "tasks": ["task1", "task2"]},
+                {"name": "Project B", "tasks": ["task3"]}
+            ]
+        })
+
     def test_set_through_non_dict_fails(self):
         """Test setting through non-dict intermediate fails gracefully."""
         sc = SelfConcept({"value": "string"})
@@ -623,15 +775,33 @@ class TestSelfConceptEdgeCases(unittest.TestCase):
 
     def test_mixed_dict_array_navigation(self):
         """Test navigating through mixed dict and array structures."""
-        sc = SelfConcept({
-            "projects": [
-                {"name": "Project A", "tasks": ["task1", "task2"]},
-                {"name": "Project B", "tasks": ["task3"]}
-            ]
-        })
+        sc = self.projects_sc
         self.assertEqual(sc.get("projects.0.name"), "Project A")
         self.assertEqual(sc.get("projects.1.tasks.0"), "task3")
 
+    def test_cached_get_sees_writes(self):
+        """Test repeated gets stay correct across set/delete/append."""
+        sc = SelfConcept()
+        sc.set("a.b.c", 1)
+        self.assertEqual(sc.get("a.b.c"), 1)
+        sc.set("a.b", {"c": 2})
+        self.assertEqual(sc.get("a.b.c"), 2)
+        sc.set("list", ["x", "y"])
+        self.assertEqual(sc.get("list.0"), "x")
+        sc.delete("list.0")
+        self.assertEqual(sc.get("list.0"), "y")
+        sc.append("list", "z")
+        self.assertEqual(sc.get("list"), ["y", "z"])
+        sc.delete("a")
+        self.assertIsNone(sc.get("a.b.c"))
+
+    def test_path_split_is_cached(self):
+        """Test repeated paths reuse one immutable tokenization."""
+        from models.self_concept import _split_path
+        first = _split_path("people.'John.Doe'.trust")
+        self.assertEqual(first, ("people", "John.Doe", "trust"))
+        self.assertIs(_split_path("people.'John.Doe'.trust"), first)
+
     def test_special_characters_in_values(self):
         """Test handling values with special characters."""
         sc = SelfConcept()
@@ -650,15 +820,8 @@ class TestSelfConceptEdgeCases(unittest.TestCase):
 
 def run_tests():
     """Run all tests and return success status."""
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-
-    suite.addTests(loader.loadTestsFromTestCase(TestAIAgent))
-    suite.addTests(loader.loadTestsFromTestCase(TestChatMessage))
-    suite.addTests(loader.loadTestsFromTestCase(TestChatRoom))
-    suite.addTests(loader.loadTestsFromTestCase(TestRoomMembership))
-    suite.addTests(loader.loadTestsFromTestCase(TestSelfConcept))
-    suite.addTests(loader.loadTestsFromTestCase(TestSelfConceptEdgeCases))
+    # One pass over the module picks up every TestCase class, including new ones
+    suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
 
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
@@ -2,19 +2,15 @@
 """Test suite for OpenAIService - API integration with mocking.
 
 Run with: python -m pytest tests/test_openai_service.py -v
-Or standalone: python tests/test_openai_service.py
+Or standalone: python -m tests.test_openai_service
 
 Note: These tests use mocking to avoid actual API calls.
 """
 
 import sys
-import os
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from services.openai_service import OpenAIService
 
 
@@ -32,6 +28,19 @@ class TestOpenAIServiceInitialization(unittest.TestCase):
         service.set_api_key("test-key-123")
         self.assertTrue(service.has_api_key)
 
+    @patch('services.openai_service.OpenAI')
+    def test_key_change_reuses_http_client(self, mock_openai):
+        """Test that changing the key keeps the pooled HTTP client."""
+        service = OpenAIService()
+        service.set_api_key("key-1")
+        service.set_api_key("key-2")
+        first = mock_openai.call_args_list[0].kwargs['http_client']
+        second = mock_openai.call_args_list[1].kwargs['http_client']
+        self.assertIs(first, second)
+        service.close()
+        self.assertTrue(first.is_closed)
+        self.assertIsNone(service._client)
+
     def test_set_empty_api_key(self):
         """Test setting empty API key."""
         service = OpenAIService()
@@ -255,6 +264,41 @@ class TestGetAvailableModels(unittest.TestCase):
         self.assertNotIn("text-embedding-ada-002", model_ids)
         self.assertNotIn("whisper-1", model_ids)
 
+    @patch('services.openai_service.OpenAI')
+    def test_get_models_cached_until_key_changes(self, mock_openai):
+        """Test that the model list is fetched once per key."""
+        mock_model = MagicMock()
+        mock_model.id = "gpt-5-mini"
+        mock_client = MagicMock()
+        mock_client.models.list.return_value = MagicMock(data=[mock_model])
+        mock_openai.return_value = mock_client
+
+        service = OpenAIService()
+        service.set_api_key("test-key")
+        self.assertEqual(service.get_available_models(), ["gpt-5-mini"])
+        self.assertEqual(service.get_available_models(), ["gpt-5-mini"])
+        self.assertEqual(mock_client.models.list.call_count, 1)
+
+        service.set_api_key("other-key")
+        service.get_available_models()
+        self.assertEqual(mock_client.models.list.call_count, 2)
+
+    @patch('services.openai_service.OpenAI')
+    def test_connection_test_primes_model_cache(self, mock_openai):
+        """Test that a connection test followed by a model lookup lists models once."""
+        mock_model = MagicMock()
+        mock_model.id = "gpt-5-nano"
+        mock_client = MagicMock()
+        mock_client.models.list.return_value = MagicMock(data=[mock_model])
+        mock_openai.return_value = mock_client
+
+        service = OpenAIService()
+        service.set_api_key("test-key")
+        success, _ = service.test_connection()
+        self.assertTrue(success)
+        self.assertEqual(service.get_available_models(), ["gpt-5-nano"])
+        self.assertEqual(mock_client.models.list.call_count, 1)
+
 
 class TestConversationContinuity(unittest.TestCase):
     """Tests for conversation continuity using previous_response_id."""
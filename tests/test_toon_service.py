@@ -2,23 +2,20 @@
 """Test suite for TOON (Token-Oriented Object Notation) service.
 
 Run with: python -m pytest tests/test_toon_service.py -v
-Or standalone: python tests/test_toon_service.py
+Or standalone: python -m tests.test_toon_service
 """
 
 import sys
-import os
 import json
 import unittest
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from services.toon_service import (
     TOONSerializer, TOONDeserializer,
     toon_to_hud, hud_to_toon,
     to_compact_json, from_compact_json,
     serialize_hud, get_format_comparison,
-    HUDFormat, compact_keys, expand_keys
+    HUDFormat, compact_keys, expand_keys,
+    dumps_json, loads_json
 )
 
 
@@ -147,6 +144,16 @@ class TestTOONDeserializer(unittest.TestCase):
         result = self.deserializer.deserialize(r'"Hello\nWorld"')
         self.assertEqual(result, "Hello\nWorld")
 
+    def test_deserialize_json_input_terminates(self):
+        """Test that JSON text (quoted keys) parses instead of stalling."""
+        result = self.deserializer.deserialize('{"mood": "happy"}')
+        self.assertEqual(result, {"mood": "happy"})
+
+    def test_deserialize_stray_delimiters_terminate(self):
+        """Test that stray delimiters are skipped instead of stalling."""
+        self.assertEqual(self.deserializer.deserialize("[1, }, 2]"), [1, 2])
+        self.assertIsInstance(self.deserializer.deserialize('x{"a",b}: 1'), dict)
+
 
 class TestRoundTrip(unittest.TestCase):
     """Tests for serialize -> deserialize round trips."""
@@ -280,6 +287,14 @@ class TestCompactJSON(unittest.TestCase):
         # room_id doesn't have a mapping, so it stays as-is
         self.assertEqual(restored["rooms"][0]["room_id"], 1)
 
+    def test_dumps_json_matches_stdlib_layout(self):
+        """Indented output matches json.dumps; compact output has no spaces."""
+        obj = {"name": "Zoë", "rooms": [{"room_id": 1, "tags": []}], "ok": True, "x": None}
+        self.assertEqual(dumps_json(obj, indent=2), json.dumps(obj, indent=2, ensure_ascii=False))
+        self.assertEqual(dumps_json(obj), json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+        self.assertEqual(loads_json(dumps_json(obj)), obj)
+        self.assertEqual(dumps_json({"big": 2 ** 70}), '{"big":%d}' % 2 ** 70)
+
 
 class TestSerializeHUD(unittest.TestCase):
     """Tests for the serialize_hud function with different formats."""
@@ -1,7 +1,32 @@
-"""UI components for the AI Chat Room application."""
+"""UI components for the AI Chat Room application.
 
-from .main_window import MainWindow
-from .dialogs import AgentManagerDialog, TOONTelemetryDialog
-from . import theme
+Submodules are loaded on first attribute access (PEP 562), so importing
+``ui.theme`` or the package itself doesn't pull in customtkinter/Tk.
+"""
 
-__all__ = ['MainWindow', 'AgentManagerDialog', 'TOONTelemetryDialog', 'theme']
+import importlib
+
+__all__ = ['MainWindow', 'AgentManagerDialog', 'RoomManagerDialog', 'TOONTelemetryDialog', 'theme']
+
+# name -> (submodule, attribute); attribute None means the module itself
+_LAZY = {
+    'MainWindow': ('.main_window', 'MainWindow'),
+    'AgentManagerDialog': ('.dialogs', 'AgentManagerDialog'),
+    'RoomManagerDialog': ('.dialogs', 'RoomManagerDialog'),
+    'TOONTelemetryDialog': ('.dialogs', 'TOONTelemetryDialog'),
+    'theme': ('.theme', None),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value  # Cache so __getattr__ isn't hit again
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,5 +1,6 @@
 """Pop-out dialogs for agent and room management."""
 
+import copy
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from typing import List, Optional, Callable
@@ -7,7 +8,7 @@ import os
 from models import AIAgent, ChatRoom, RoomMembership, SelfConcept
 from models.ai_agent import HUD_FORMAT_JSON, HUD_FORMAT_COMPACT, HUD_FORMAT_TOON
 from services import DatabaseService, RoomService, get_telemetry
-import config
+from .keychain import get_api_key, save_api_key
 
 # HUD INPUT format options (what we send to agent)
 HUD_INPUT_FORMAT_OPTIONS = [
@@ -718,6 +719,55 @@ class RoomManagerDialog(tk.Toplevel):
                 self._on_room_changed()
 
 
+class ConfirmDialog(tk.Toplevel):
+    """Modal yes/no question with a "Don't ask again" checkbox.
+
+    After wait_window(), ``result`` is True for Yes and ``remember`` is the
+    checkbox state (only meaningful when the answer was Yes).
+    """
+
+    def __init__(self, parent, title: str, message: str):
+        super().__init__(parent)
+        self.title(title)
+        self.resizable(False, False)
+        self.transient(parent)
+
+        # Dark mode colors
+        self._bg_dark = "#1e1e1e"
+        self._fg_light = "#e0e0e0"
+
+        self.result = False
+        self.remember = False
+        self._remember_var = tk.BooleanVar(value=False)
+
+        self.configure(bg=self._bg_dark)
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self._setup_ui(message)
+        self.grab_set()
+
+    def _setup_ui(self, message: str):
+        """Set up the dialog UI."""
+        frame = tk.Frame(self, bg=self._bg_dark, padx=20, pady=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(frame, text=message, bg=self._bg_dark, fg=self._fg_light,
+                 wraplength=320, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+        tk.Checkbutton(frame, text="Don't ask again", variable=self._remember_var,
+                       bg=self._bg_dark, fg=self._fg_light, selectcolor=self._bg_dark,
+                       activebackground=self._bg_dark, activeforeground=self._fg_light).pack(anchor=tk.W)
+
+        btn_frame = tk.Frame(frame, bg=self._bg_dark)
+        btn_frame.pack(fill=tk.X, pady=(15, 0))
+        ttk.Button(btn_frame, text="No", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(btn_frame, text="Yes", command=self._on_yes).pack(side=tk.RIGHT, padx=(0, 5))
+
+    def _on_yes(self):
+        """Accept and close."""
+        self.result = True
+        self.remember = self._remember_var.get()
+        self.destroy()
+
+
 class KnowledgeExplorerDialog(tk.Toplevel):
     """Pop-out window for exploring agent's knowledge tree."""
 
@@ -905,7 +955,11 @@ class KnowledgeExplorerDialog(tk.Toplevel):
 
 
 class SettingsDialog(tk.Toplevel):
-    """Pop-out window for API settings and connection."""
+    """Pop-out window for API settings and connection.
+
+    Closing only hides the window so the main window can show it again
+    without rebuilding it (see on_reopen).
+    """
 
     def __init__(self, parent, openai_service, on_connected=None):
         super().__init__(parent)
@@ -922,9 +976,14 @@ class SettingsDialog(tk.Toplevel):
         self._fg_light = "#e0e0e0"
 
         self.configure(bg=self._bg_dark)
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
         self._setup_ui()
         self._load_api_key()
 
+    def on_reopen(self):
+        """Refresh the shown key before a hidden dialog is shown again."""
+        self._load_api_key()
+
     def _setup_ui(self):
         """Set up the dialog UI."""
         # API Key section
@@ -955,13 +1014,12 @@ class SettingsDialog(tk.Toplevel):
         btn_frame.pack(fill=tk.X)
 
         ttk.Button(btn_frame, text="Test Connection", command=self._test_connection).pack(side=tk.LEFT)
-        ttk.Button(btn_frame, text="Close", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(btn_frame, text="Close", command=self.withdraw).pack(side=tk.RIGHT)
 
     def _load_api_key(self):
         """Load API key from keyring."""
         try:
-            import keyring
-            api_key = keyring.get_password(config.KEYRING_SERVICE, config.KEYRING_USERNAME)
+            api_key = get_api_key()
             if api_key:
                 self._api_key_var.set(api_key)
                 if self._openai.has_api_key:
@@ -986,8 +1044,7 @@ class SettingsDialog(tk.Toplevel):
         if success:
             # Save API key
             try:
-                import keyring
-                keyring.set_password(config.KEYRING_SERVICE, config.KEYRING_USERNAME, api_key)
+                save_api_key(api_key)
             except Exception:
                 pass  # Keyring not available
 
@@ -996,7 +1053,10 @@ class SettingsDialog(tk.Toplevel):
 
 
 class PromptEditorDialog(tk.Toplevel):
-    """Pop-out window for editing agent prompts as a dynamic JSON tree."""
+    """Pop-out window for editing agent prompts as a dynamic JSON tree.
+
+    Closing only hides the window; on_reopen reloads the prompts.
+    """
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -1015,9 +1075,14 @@ class PromptEditorDialog(tk.Toplevel):
         self._data = {}
         self._selected_path = []  # Path to currently selected node
 
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
         self._setup_ui()
         self._load_prompts()
 
+    def on_reopen(self):
+        """Reload prompts from disk before a hidden dialog is shown again."""
+        self._load_prompts()
+
     def _setup_ui(self):
         """Set up the dialog UI with tree view and editor."""
         # Header
@@ -1103,13 +1168,14 @@ class PromptEditorDialog(tk.Toplevel):
 
         ttk.Button(btn_frame, text="Save All", command=self._save_prompts).pack(side=tk.LEFT)
         ttk.Button(btn_frame, text="Reload", command=self._load_prompts).pack(side=tk.LEFT, padx=(10, 0))
-        ttk.Button(btn_frame, text="Close", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(btn_frame, text="Close", command=self.withdraw).pack(side=tk.RIGHT)
 
     def _load_prompts(self):
         """Load prompts from JSON file."""
         try:
             import prompts
-            self._data = prompts.load_prompts()
+            # load_prompts returns a shared cached dict; the editor mutates its copy
+            self._data = copy.deepcopy(prompts.load_prompts())
             self._refresh_tree()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load prompts: {e}", parent=self)
@@ -1550,7 +1616,10 @@ class HUDHistoryDialog(tk.Toplevel):
 
 
 class TOONTelemetryDialog(tk.Toplevel):
-    """Dialog to view TOON vs JSON telemetry data and token savings."""
+    """Dialog to view TOON vs JSON telemetry data and token savings.
+
+    Closing only hides the window; on_reopen reloads the telemetry.
+    """
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -1564,9 +1633,14 @@ class TOONTelemetryDialog(tk.Toplevel):
         self._fg_light = "#cccccc"
 
         self.configure(bg=self._bg_dark)
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
         self._setup_ui()
         self._load_telemetry()
 
+    def on_reopen(self):
+        """Reload telemetry before a hidden dialog is shown again."""
+        self._load_telemetry()
+
     def _setup_ui(self):
         """Set up the dialog UI."""
         # Header
@@ -1629,7 +1703,7 @@ class TOONTelemetryDialog(tk.Toplevel):
         btn_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
 
         ttk.Button(btn_frame, text="Refresh", command=self._load_telemetry).pack(side=tk.LEFT)
-        ttk.Button(btn_frame, text="Close", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(btn_frame, text="Close", command=self.withdraw).pack(side=tk.RIGHT)
 
     def _load_telemetry(self):
         """Load telemetry data from the TOON service."""
@@ -0,0 +1,51 @@
+"""Cached access to the API key stored in the OS keyring.
+
+A keyring read is a blocking call into the platform credential store
+(100ms+ on some systems), so the key is read once per process and kept
+here. Saving through save_api_key keeps the cache in step.
+"""
+
+import threading
+from typing import Optional
+try:
+    import keyring
+    HAS_KEYRING = True
+except ImportError:
+    HAS_KEYRING = False
+
+import config
+
+_cached_api_key: Optional[str] = None
+_loaded = False
+_api_key_lock = threading.Lock()
+
+
+def get_api_key() -> Optional[str]:
+    """Return the stored API key, or None if there is none or no keyring.
+
+    Raises whatever the keyring backend raises on the first (uncached) read.
+    """
+    global _cached_api_key, _loaded
+    if _loaded:
+        return _cached_api_key
+    if not HAS_KEYRING:
+        return None
+    with _api_key_lock:
+        if not _loaded:
+            _cached_api_key = keyring.get_password(config.KEYRING_SERVICE, config.KEYRING_USERNAME)
+            _loaded = True
+    return _cached_api_key
+
+
+def save_api_key(api_key: str) -> None:
+    """Store the API key in the keyring and the cache.
+
+    Raises whatever the keyring backend raises; the cache is then left as is.
+    """
+    global _cached_api_key, _loaded
+    if not HAS_KEYRING:
+        return
+    with _api_key_lock:
+        keyring.set_password(config.KEYRING_SERVICE, config.KEYRING_USERNAME, api_key)
+        _cached_api_key = api_key
+        _loaded = True
@@ -4,18 +4,23 @@ The main application window that coordinates all UI components for the
 AI Chat Room application.
 """
 
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
 import customtkinter as ctk
 from tkinter import messagebox
-from typing import Optional, List
-try:
-    import keyring
-    HAS_KEYRING = True
-except ImportError:
-    HAS_KEYRING = False
+from typing import Any, Callable, Dict, Optional, List, Set, Tuple
 
 from services import DatabaseService, OpenAIService, HeartbeatService, RoomService, setup_logging, get_logger
-from models import AIAgent, ChatRoom
-from .dialogs import KnowledgeExplorerDialog, SettingsDialog, PromptEditorDialog, HUDHistoryDialog, TOONTelemetryDialog
+from models import AIAgent, ChatMessage, ChatRoom
+from models.chat_message import SENDER_AGENT, SENDER_SYSTEM, SENDER_USER, classify_sender
+from .dialogs import (ConfirmDialog, KnowledgeExplorerDialog, SettingsDialog, PromptEditorDialog, HUDHistoryDialog,
+                      TOONTelemetryDialog)
+from .keychain import HAS_KEYRING, get_api_key
+from .theme import (STATUS_COLORS, STATUS_INDICATORS, STATUS_TEXT, REACTION_EMOJI, OWNER_COLOR, MEMBER_COLOR,
+                    SECONDARY_BUTTON)
 import config
 
 logger = get_logger("ui")
@@ -29,9 +34,23 @@ ctk.set_widget_scaling(1.0)
 ctk.set_window_scaling(1.0)
 
 
+# Dirty flags for MainWindow._schedule_refresh - bursts of service callbacks
+# are coalesced into one refresh pass when Tk next goes idle
+DIRTY_AGENTS = 1
+DIRTY_MEMBERS = 2
+DIRTY_MESSAGES = 4
+DIRTY_SELECTED = 8
+DIRTY_STATUS = 16
+DIRTY_REACTIONS = 32  # Reactions changed on rendered messages: needs a full rebuild
+
+
 class MainWindow:
     """Main application window."""
 
+    # Heartbeat toggle button labels
+    _HB_START = "▶ Start"
+    _HB_STOP = "⏹ Stop"
+
     def __init__(self):
         """Initialize the main window."""
         # Set up logging first
@@ -46,6 +65,7 @@ class MainWindow:
 
         # Set up callbacks
         self._room_service.add_messages_changed_callback(self._on_messages_changed)
+        self._room_service.add_reactions_changed_callback(self._on_reactions_changed)
         self._room_service.add_agent_status_callback(self._on_agent_status_changed)
         self._room_service.add_room_changed_callback(self._on_rooms_changed)
         self._room_service.add_membership_changed_callback(self._on_membership_changed)
@@ -63,16 +83,54 @@ class MainWindow:
         self._font_title = ctk.CTkFont(size=14, weight="bold")
         self._font_mono = ctk.CTkFont(family="Consolas", size=13)
 
+        # Pending refresh state (service callbacks arrive on worker threads)
+        self._refresh_lock = threading.Lock()
+        # Set first thing in _on_close; late callbacks then schedule nothing
+        self._shutting_down = False
+        self._pending_refresh = 0
+        self._refresh_scheduled = False
+        self._pending_selected_agent: Optional[AIAgent] = None
+        self._pending_status_message = ""
+
+        # Open dialogs by key (name, or (name, agent_id) for per-agent ones)
+        self._dialogs: Dict[Any, Any] = {}
+
         # Track selected items
         self._selected_agent: Optional[AIAgent] = None
         self._selected_room: Optional[ChatRoom] = None
         self._rooms_list: List[ChatRoom] = []
         self._room_agents_list: List[AIAgent] = []
+        self._agents_list: List[AIAgent] = []
+        # room_id -> member agent ids; dropped on membership change
+        self._room_members_cache: Dict[int, Set[int]] = {}
+        self._available_agents_to_add: List[AIAgent] = []
+
+        # What the messages textbox currently shows (for incremental appends)
+        self._rendered_room_id: Optional[int] = None
+        self._rendered_messages: Dict[int, ChatMessage] = {}
+        self._last_rendered_seq = 0
+        # message id -> formatted "%H:%M:%S" timestamp for the rendered room
+        self._ts_cache: Dict[int, str] = {}
+
+        # Message queries run here so the Tk thread never waits on SQLite.
+        # One worker keeps results in submission order; a full rebuild bumps
+        # the generation so results queued before it are dropped.
+        self._db_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui-db")
+        self._messages_gen = 0
+
+        # "Don't ask again" for clearing chat, read once and kept in the settings table
+        self._confirm_clear = self._database.get_setting(
+            "confirm_clear_chat", "1" if config.CONFIRM_CLEAR_CHAT else "0") == "1"
+
+        # Architect messages waiting to be written: (room_id, content)
+        self._send_queue: deque = deque()
+        self._flush_sends_id: Optional[str] = None
 
         # Build UI
         self._create_menu_bar()
         self._create_ui()
-        self._load_data()
+        # Let the window map before the keyring/API check and first DB queries
+        self._root.after_idle(self._load_data)
 
         # Handle window close
         self._root.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -149,15 +207,17 @@ class MainWindow:
         self._agent_scroll = ctk.CTkScrollableFrame(list_frame, fg_color=("gray90", "gray17"))
         self._agent_scroll.pack(fill="both", expand=True)
 
-        # Agent buttons will be added here dynamically
-        self._agent_buttons = []
+        # Agent buttons are added/updated incrementally: agent_id -> button,
+        # plus the (status, name, selected) state each button currently shows
+        self._agent_buttons: Dict[int, ctk.CTkButton] = {}
+        self._agent_button_state: Dict[int, tuple] = {}
 
         # Action buttons
         btn_frame = ctk.CTkFrame(agents_frame, fg_color="transparent")
         btn_frame.pack(fill="x", padx=6, pady=(0, 8))
 
         ctk.CTkButton(btn_frame, text="+ New", command=self._create_agent, height=28).pack(side="left", expand=True, fill="x", padx=(0, 3))
-        ctk.CTkButton(btn_frame, text="Delete", command=self._delete_agent, height=28, fg_color="gray40", hover_color="gray30").pack(side="left", expand=True, fill="x", padx=(3, 0))
+        ctk.CTkButton(btn_frame, text="Delete", command=self._delete_agent, height=28, **SECONDARY_BUTTON).pack(side="left", expand=True, fill="x", padx=(3, 0))
 
         # === BOTTOM: Agent Settings (collapsible) ===
         self._create_settings_panel(panel)
@@ -222,9 +282,12 @@ class MainWindow:
             self._settings_expanded = True
 
     def _on_heartbeat_slider_change(self, *args) -> None:
-        """Handle heartbeat slider value change."""
-        value = self._heartbeat_interval_var.get()
-        self._heartbeat_interval_label.configure(text=f"{value:.1f}s")
+        """Handle heartbeat slider value change (relabel only when the shown text changes)."""
+        text = f"{self._heartbeat_interval_var.get():.1f}s"
+        if text == self._last_slider_text:
+            return
+        self._last_slider_text = text
+        self._heartbeat_interval_text.set(text)
 
     def _create_settings_section(self, parent) -> None:
         """Create agent settings section (optimized for narrow left panel)."""
@@ -250,7 +313,9 @@ class MainWindow:
         self._agent_model_combo.pack(side="left", fill="x", expand=True, padx=(3, 6))
 
         self._heartbeat_status_var = ctk.StringVar(value="● Idle")
-        self._heartbeat_status_label = ctk.CTkLabel(row2, textvariable=self._heartbeat_status_var, text_color="#7ee787")
+        self._heartbeat_status_color = STATUS_COLORS["idle"]
+        self._heartbeat_status_label = ctk.CTkLabel(row2, textvariable=self._heartbeat_status_var,
+                                                     text_color=self._heartbeat_status_color)
         self._heartbeat_status_label.pack(side="right")
 
         # Row 3: WPM + Speed slider
@@ -272,7 +337,9 @@ class MainWindow:
             number_of_steps=18
         )
         self._heartbeat_slider.pack(side="left", fill="x", expand=True, padx=(3, 3))
-        self._heartbeat_interval_label = ctk.CTkLabel(row3, text="5.0s", width=32)
+        self._last_slider_text = "5.0s"
+        self._heartbeat_interval_text = ctk.StringVar(value=self._last_slider_text)
+        self._heartbeat_interval_label = ctk.CTkLabel(row3, textvariable=self._heartbeat_interval_text, width=32)
         self._heartbeat_interval_label.pack(side="left")
         self._heartbeat_interval_var.trace_add("write", self._on_heartbeat_slider_change)
 
@@ -295,8 +362,8 @@ class MainWindow:
         btn_frame.pack(fill="x")
 
         ctk.CTkButton(btn_frame, text="Save", command=self._save_agent_details, height=26).pack(side="left", fill="x", expand=True, padx=(0, 2))
-        ctk.CTkButton(btn_frame, text="Knowledge", command=self._open_knowledge_explorer, height=26, fg_color="gray40", hover_color="gray30").pack(side="left", fill="x", expand=True, padx=(2, 2))
-        ctk.CTkButton(btn_frame, text="HUD", command=self._open_hud_history, height=26, fg_color="gray40", hover_color="gray30").pack(side="left", fill="x", expand=True, padx=(2, 0))
+        ctk.CTkButton(btn_frame, text="Knowledge", command=self._open_knowledge_explorer, height=26, **SECONDARY_BUTTON).pack(side="left", fill="x", expand=True, padx=(2, 2))
+        ctk.CTkButton(btn_frame, text="HUD", command=self._open_hud_history, height=26, **SECONDARY_BUTTON).pack(side="left", fill="x", expand=True, padx=(2, 0))
 
     def _create_members_section(self, parent) -> None:
         """Create room members section."""
@@ -321,7 +388,12 @@ class MainWindow:
         self._members_scroll = ctk.CTkScrollableFrame(content, fg_color=("gray90", "gray17"))
         self._members_scroll.pack(fill="both", expand=True)
 
+        # agent_id -> (name_label, status_label, ((name, is_owner, is_architect), status))
         self._member_widgets = {}
+        self._member_order: List[int] = []
+        # room_id -> member ids in display order (owner first); dropped on membership change
+        self._room_agents_sorted_cache: Dict[int, List[int]] = {}
+        self._members_placeholder: Optional[ctk.CTkLabel] = None
 
     def _create_chat_section(self, parent) -> None:
         """Create chat room section."""
@@ -339,9 +411,9 @@ class MainWindow:
         ctk.CTkLabel(header, text="Chat Room", font=self._font_title).pack(side="left")
 
         # Heartbeat controls on the right
-        self._heartbeat_btn_text = ctk.StringVar(value="▶ Start")
+        self._heartbeat_btn_text = ctk.StringVar(value=self._HB_START)
         ctk.CTkButton(header, textvariable=self._heartbeat_btn_text, command=self._toggle_heartbeat, width=70, height=26).pack(side="right", padx=(6, 0))
-        ctk.CTkButton(header, text="Clear", command=self._clear_chat, width=50, height=26, fg_color="gray40", hover_color="gray30").pack(side="right")
+        ctk.CTkButton(header, text="Clear", command=self._clear_chat, width=50, height=26, **SECONDARY_BUTTON).pack(side="right")
 
         # Messages area - monospace for readability
         self._messages_text = ctk.CTkTextbox(frame, state="disabled", font=self._font_mono)
@@ -359,7 +431,7 @@ class MainWindow:
         self._message_var = ctk.StringVar()
         self._message_entry = ctk.CTkEntry(input_frame, textvariable=self._message_var, height=32, placeholder_text="Type a message...")
         self._message_entry.pack(side="left", fill="x", expand=True, padx=(0, 6))
-        self._message_entry.bind('<Return>', lambda e: self._send_message())
+        self._message_entry.bind('<Return>', self._on_entry_return)
 
         ctk.CTkButton(input_frame, text="Send", command=self._send_message, width=60, height=32).pack(side="left")
 
@@ -378,43 +450,66 @@ class MainWindow:
         self._refresh_messages()
 
     def _refresh_agent_list(self) -> None:
-        """Refresh the agent list with status indicators."""
+        """Refresh the agent list with status indicators.
+
+        Only buttons whose status, name or selection changed are reconfigured;
+        buttons are created/destroyed only when agents are added/removed.
+        """
         # Get all agents
         agents = self._database.get_all_agents()
         self._agents_list = [a for a in agents if not a.is_architect]
 
-        # Clear existing buttons
-        for btn in self._agent_buttons:
-            btn.destroy()
-        self._agent_buttons = []
+        selected_id = self._selected_agent.id if self._selected_agent else None
+        current_ids = {a.id for a in self._agents_list}
+
+        # Remove buttons for agents that no longer exist
+        for agent_id in [i for i in self._agent_buttons if i not in current_ids]:
+            self._agent_buttons.pop(agent_id).destroy()
+            del self._agent_button_state[agent_id]
 
-        # Create buttons for each agent
         for agent in self._agents_list:
             status = agent.status if agent.status else "idle"
-            indicator = {"idle": "●", "thinking": "◐", "typing": "⌨", "sending": "↑", "sleeping": "💤"}.get(status, "●")
-            color = {"idle": "#7ee787", "thinking": "#ffa657", "typing": "#79c0ff", "sending": "#d2a8ff", "sleeping": "#8b8b8b"}.get(status, "#7ee787")
-
             name = agent.name or "Unnamed"
-            text = f"{indicator} {name} (#{agent.id})"
+            state = (status, name, agent.id == selected_id)
+
+            btn = self._agent_buttons.get(agent.id)
+            if btn is not None and self._agent_button_state[agent.id] == state:
+                continue
 
-            btn = ctk.CTkButton(
-                self._agent_scroll,
-                text=text,
-                anchor="w",
-                height=28,
-                fg_color="transparent" if not (self._selected_agent and agent.id == self._selected_agent.id) else ("gray75", "gray25"),
-                hover_color=("gray70", "gray30"),
-                text_color=color,
-                command=lambda a=agent: self._select_agent(a)
-            )
-            btn.pack(fill="x", pady=1, padx=3)
-            self._agent_buttons.append(btn)
+            indicator = STATUS_INDICATORS.get(status, "●")
+            color = STATUS_COLORS.get(status, STATUS_COLORS["idle"])
+            text = f"{indicator} {name} (#{agent.id})"
+            fg_color = ("gray75", "gray25") if state[2] else "transparent"
+
+            if btn is None:
+                btn = ctk.CTkButton(
+                    self._agent_scroll,
+                    text=text,
+                    anchor="w",
+                    height=28,
+                    fg_color=fg_color,
+                    hover_color=("gray70", "gray30"),
+                    text_color=color,
+                    command=partial(self._select_agent_by_id, agent.id)
+                )
+                btn.pack(fill="x", pady=1, padx=3)
+                self._agent_buttons[agent.id] = btn
+            else:
+                btn.configure(text=text, text_color=color, fg_color=fg_color)
+            self._agent_button_state[agent.id] = state
 
         # Update model combo
         if hasattr(self, '_agent_model_combo'):
             models = self._openai.get_available_models()
             self._agent_model_combo.configure(values=models)
 
+    def _select_agent_by_id(self, agent_id: int) -> None:
+        """Select an agent from the list by ID (buttons outlive agent objects)."""
+        for agent in self._agents_list:
+            if agent.id == agent_id:
+                self._select_agent(agent)
+                return
+
     def _select_agent(self, agent: AIAgent) -> None:
         """Select an agent and update the UI."""
         self._selected_agent = agent
@@ -432,14 +527,9 @@ class MainWindow:
         self._detail_wpm_var.set(str(agent.room_wpm))
         self._can_create_agents_var.set(agent.can_create_agents)
         self._heartbeat_interval_var.set(agent.heartbeat_interval)
-        self._heartbeat_interval_label.configure(text=f"{agent.heartbeat_interval:.1f}s")
 
         # Update heartbeat status
-        status = agent.status if agent.status else "idle"
-        status_text = {"idle": "● Idle", "thinking": "◐ Waiting...", "typing": "⌨ Typing...", "sending": "↑ Sending...", "sleeping": "💤 Sleeping"}.get(status, f"● {status}")
-        color = {"idle": "#7ee787", "thinking": "#ffa657", "typing": "#79c0ff", "sending": "#d2a8ff", "sleeping": "#8b8b8b"}.get(status, "#7ee787")
-        self._heartbeat_status_var.set(status_text)
-        self._heartbeat_status_label.configure(text_color=color)
+        self._show_heartbeat_status(agent.status)
 
         # Refresh related UI
         self._refresh_agent_list()
@@ -470,6 +560,9 @@ class MainWindow:
         if messagebox.askyesno("Delete Agent", f"Delete agent {self._selected_agent.id}?"):
             self._database.delete_agent(self._selected_agent.id)
             self._selected_agent = None
+            # Deleting through the database bypasses RoomService's callbacks
+            self._room_agents_sorted_cache.clear()
+            self._room_members_cache.clear()
             self._refresh_agent_list()
             self._refresh_messages()
 
@@ -499,11 +592,15 @@ class MainWindow:
             self._add_agent_combo.configure(values=[])
             return
 
-        room_agents = self._room_service.get_agents_in_room(self._selected_room.id)
-        room_agent_ids = {a.id for a in room_agents}
+        room_id = self._selected_room.id
+        room_agent_ids = self._room_members_cache.get(room_id)
+        if room_agent_ids is None:
+            room_agent_ids = {a.id for a in self._room_service.get_agents_in_room(room_id)}
+            self._room_members_cache[room_id] = room_agent_ids
 
-        all_agents = self._database.get_all_agents()
-        available = [a for a in all_agents if a.id not in room_agent_ids and not a.is_architect]
+        # _agents_list is kept current by _refresh_agent_list and already
+        # excludes The Architect
+        available = [a for a in self._agents_list if a.id not in room_agent_ids]
 
         options = [f"{a.id}: {a.name or 'Unnamed'}" for a in available]
         self._add_agent_combo.configure(values=options)
@@ -511,98 +608,256 @@ class MainWindow:
 
     def _add_agent_to_room(self) -> None:
         """Add the selected agent to the current room."""
-        if not self._selected_room:
+        room = self._selected_room
+        if room is None:
             return
 
         selection = self._add_agent_var.get()
-        if not selection or not hasattr(self, '_available_agents_to_add'):
+        if not selection:
             return
 
         # Find the agent by the selection string
         for agent in self._available_agents_to_add:
             if selection.startswith(f"{agent.id}:"):
-                self._room_service.join_room(agent, self._selected_room.id)
+                self._room_service.join_room(agent, room.id)
                 self._update_room_status()
                 self._refresh_add_agent_combo()
                 self._add_agent_var.set("")
                 break
 
     def _update_room_status(self) -> None:
-        """Update the room members display."""
-        # Clear existing widgets
-        for widget in self._members_scroll.winfo_children():
-            widget.destroy()
-        self._member_widgets = {}
-
-        if not self._selected_room:
-            ctk.CTkLabel(self._members_scroll, text="No room selected", text_color="gray").pack(pady=6)
+        """Update the room members display.
+
+        Member rows are rebuilt only when the member list changes; otherwise
+        just the labels whose text or status changed are reconfigured.
+        """
+        room = self._selected_room
+        if room is None:
+            self._show_members_placeholder("No room selected")
             return
 
-        self._room_agents_list = self._room_service.get_agents_in_room(self._selected_room.id)
+        owner_id = room_id = room.id
+        self._room_agents_list = self._room_service.get_agents_in_room(room_id)
 
         if not self._room_agents_list:
-            ctk.CTkLabel(self._members_scroll, text="No agents in room", text_color="gray").pack(pady=6)
+            self._show_members_placeholder("No agents in room")
             return
 
-        owner_id = self._selected_room.id
-        sorted_agents = sorted(self._room_agents_list, key=lambda a: (0 if a.id == owner_id else 1, a.id))
+        by_id = {a.id: a for a in self._room_agents_list}
+        self._room_members_cache[room_id] = set(by_id)
+        order = self._room_agents_sorted_cache.get(room_id)
+        if order is None or len(order) != len(by_id) or not all(i in by_id for i in order):
+            order = sorted(by_id, key=lambda i: (i != room_id, i))
+            self._room_agents_sorted_cache[room_id] = order
+        sorted_agents = [by_id[i] for i in order]
+
+        if order != self._member_order or self._members_placeholder is not None:
+            self._clear_members()
+            self._member_order = order
 
         for agent in sorted_agents:
             is_owner = agent.id == owner_id
-
-            if agent.is_architect:
-                display = "The Architect"
-            elif is_owner:
-                display = f"★ {agent.name or 'Unnamed'} (#{agent.id})"
-            else:
-                display = f"   {agent.name or 'Unnamed'} (#{agent.id})"
-
-            color = "#ffd700" if is_owner else "#58a6ff"
             status = agent.status if agent.status else "idle"
-            status_color = {"idle": "#7ee787", "thinking": "#ffa657", "typing": "#79c0ff", "sleeping": "#8b8b8b"}.get(status, "#7ee787")
+            name_state = (agent.name, is_owner, agent.is_architect)
 
-            member_frame = ctk.CTkFrame(self._members_scroll, fg_color="transparent")
-            member_frame.pack(fill="x", pady=1)
+            widgets = self._member_widgets.get(agent.id)
+            if widgets is not None and widgets[2] == (name_state, status):
+                continue  # Nothing visible changed - skip formatting entirely
 
-            ctk.CTkLabel(member_frame, text=display, text_color=color, anchor="w").pack(side="left")
-            ctk.CTkLabel(member_frame, text=f" ● {status}", text_color=status_color).pack(side="left")
+            if widgets is None or widgets[2][0] != name_state:
+                if agent.is_architect:
+                    display = "The Architect"
+                elif is_owner:
+                    display = f"★ {agent.name or 'Unnamed'} (#{agent.id})"
+                else:
+                    display = f"   {agent.name or 'Unnamed'} (#{agent.id})"
+                color = OWNER_COLOR if is_owner else MEMBER_COLOR
+            status_color = STATUS_COLORS.get(status, STATUS_COLORS["idle"])
+
+            if widgets is None:
+                member_frame = ctk.CTkFrame(self._members_scroll, fg_color="transparent")
+                member_frame.pack(fill="x", pady=1)
+
+                name_label = ctk.CTkLabel(member_frame, text=display, text_color=color, anchor="w")
+                name_label.pack(side="left")
+                status_label = ctk.CTkLabel(member_frame, text=f" ● {status}", text_color=status_color)
+                status_label.pack(side="left")
+            else:
+                name_label, status_label, (old_name_state, old_status) = widgets
+                if old_name_state != name_state:
+                    name_label.configure(text=display, text_color=color)
+                if old_status != status:
+                    status_label.configure(text=f" ● {status}", text_color=status_color)
+            self._member_widgets[agent.id] = (name_label, status_label, (name_state, status))
+
+    def _clear_members(self) -> None:
+        """Destroy all member rows and any placeholder label."""
+        for widget in self._members_scroll.winfo_children():
+            widget.destroy()
+        self._member_widgets = {}
+        self._member_order = []
+        self._members_placeholder = None
 
-    def _refresh_messages(self) -> None:
-        """Refresh the messages display for selected room."""
-        self._messages_text.configure(state="normal")
-        self._messages_text.delete("1.0", "end")
+    def _show_members_placeholder(self, text: str) -> None:
+        """Show a single grey placeholder line in place of the member list."""
+        if self._members_placeholder is not None:
+            self._members_placeholder.configure(text=text)
+            return
+        self._clear_members()
+        self._members_placeholder = ctk.CTkLabel(self._members_scroll, text=text, text_color="gray")
+        self._members_placeholder.pack(pady=6)
 
-        if not self._selected_room:
+    def _refresh_messages(self) -> None:
+        """Rebuild the messages display for selected room.
+
+        The query runs on the DB worker; the textbox is rebuilt when the
+        results come back.
+        """
+        self._messages_gen += 1
+        room = self._selected_room
+        if room is None:
+            self._messages_text.configure(state="normal")
+            self._messages_text.delete("1.0", "end")
             self._messages_text.insert("end", "No room selected")
             self._messages_text.configure(state="disabled")
+            self._rendered_messages = {}
+            self._rendered_room_id = None
+            self._last_rendered_seq = 0
             return
 
-        messages = self._room_service.get_room_messages(self._selected_room.id)
+        room_id = room.id
+        if room_id != self._rendered_room_id:
+            self._ts_cache = {}
+        # Appends requested before the rebuild lands target the new room
+        self._rendered_room_id = room_id
+        self._submit_messages_fetch(room_id, None, {})
 
-        # Build lookup for reply references
-        msg_lookup = {msg.id: msg for msg in messages if msg.id}
+    def _append_new_messages(self) -> None:
+        """Append only messages newer than those already shown.
 
-        # Reaction emoji mapping
-        reaction_emoji = {
-            "thumbs_up": "👍",
-            "thumbs_down": "👎",
-            "brain": "🧠",
-            "heart": "❤️"
-        }
+        Falls back to a full rebuild when the room changed since the last render.
+        """
+        room = self._selected_room
+        if room is None or room.id != self._rendered_room_id:
+            self._refresh_messages()
+            return
 
+        self._submit_messages_fetch(room.id, self._last_rendered_seq, self._rendered_messages)
+
+    def _submit_messages_fetch(self, room_id: int, since_seq: Optional[int],
+                               known: Dict[int, ChatMessage]) -> None:
+        """Queue a messages query; since_seq None means a full rebuild."""
+        future = self._db_pool.submit(self._fetch_messages_bundle, room_id, since_seq, known)
+        future.add_done_callback(partial(self._on_messages_fetched, self._messages_gen, since_seq is None))
+
+    def _fetch_messages_bundle(self, room_id: int, since_seq: Optional[int], known: Dict[int, ChatMessage]
+                               ) -> Tuple[List[ChatMessage], Dict[int, AIAgent], Dict[int, Dict[str, int]]]:
+        """Load messages plus their senders and reactions (runs on the DB worker).
+
+        ``known`` holds already-rendered messages so reply targets outside
+        this batch still resolve their sender; it is only read here.
+        """
+        if since_seq is None:
+            messages = self._room_service.get_room_messages(room_id)
+        else:
+            messages = self._room_service.get_room_messages_since(room_id, since_seq)
+        if not messages:
+            return messages, {}, {}
+
+        batch = {msg.id: msg for msg in messages if msg.id}
+
+        # Resolve every agent sender (and replied-to sender) in one query
+        sender_ids = set()
         for msg in messages:
-            timestamp = msg.timestamp.strftime("%H:%M:%S")
+            agent_id = msg.sender_agent_id
+            if agent_id is not None:
+                sender_ids.add(agent_id)
+            if msg.reply_to_id:
+                replied_msg = batch.get(msg.reply_to_id) or known.get(msg.reply_to_id)
+                if replied_msg is not None and replied_msg.sender_agent_id is not None:
+                    sender_ids.add(replied_msg.sender_agent_id)
+        agents_by_id = self._database.get_agents_by_ids(sender_ids)
+        reactions_by_msg = self._database.get_reactions_summary_bulk(batch)
+        return messages, agents_by_id, reactions_by_msg
+
+    def _on_messages_fetched(self, gen: int, full: bool, future: Future) -> None:
+        """Hand a finished messages query back to the Tk thread (runs on the DB worker)."""
+        if self._shutting_down:
+            return
+        try:
+            bundle = future.result()
+        except Exception as e:
+            logger.error(f"Failed to load messages: {e}")
+            return
+        try:
+            self._root.after_idle(self._render_messages, gen, full, bundle)
+        except Exception as e:
+            # The window closed while the query was running
+            logger.debug(f"Dropping messages result: {e}")
+
+    def _render_messages(self, gen: int, full: bool, bundle: Tuple) -> None:
+        """Show the results of a messages query unless a newer rebuild superseded it."""
+        if gen != self._messages_gen:
+            return
+        messages, agents_by_id, reactions_by_msg = bundle
+
+        if full:
+            self._rendered_messages = {}
+            self._last_rendered_seq = 0
+        else:
+            # Overlapping appends can return the same messages twice
+            messages = [msg for msg in messages if msg.sequence_number > self._last_rendered_seq]
+            if not messages:
+                return
+
+        self._messages_text.configure(state="normal")
+        if full:
+            self._messages_text.delete("1.0", "end")
+        self._insert_messages(messages, agents_by_id, reactions_by_msg)
+        self._messages_text.configure(state="disabled")
+        self._messages_text.see("end")
+
+    def _insert_messages(self, messages: List[ChatMessage], agents_by_id: Dict[int, AIAgent],
+                         reactions_by_msg: Dict[int, Dict[str, int]]) -> None:
+        """Insert messages at the end of the (already writable) textbox."""
+        # Rendered messages by ID, for reply references
+        msg_lookup = self._rendered_messages
+        for msg in messages:
+            if msg.id:
+                msg_lookup[msg.id] = msg
+
+        # Untagged text is buffered and inserted in one call; only tagged
+        # segments (reply refs, reactions) need their own insert
+        insert = self._messages_text.insert
+        plain: List[str] = []
+        ts_cache = self._ts_cache
+
+        def insert_tagged(text: str, tag: str) -> None:
+            if plain:
+                insert("end", "".join(plain))
+                plain.clear()
+            insert("end", text, tag)
+
+        for msg in messages:
+            self._last_rendered_seq = max(self._last_rendered_seq, msg.sequence_number)
+
+            # Timestamps never change once stored, so format each one once
+            timestamp = ts_cache.get(msg.id) if msg.id else None
+            if timestamp is None:
+                timestamp = msg.timestamp.strftime("%H:%M:%S")
+                if msg.id:
+                    ts_cache[msg.id] = timestamp
 
             # Get sender name
-            if msg.sender_name == "System":
+            kind, agent_id = classify_sender(msg.sender_name)
+            if kind == SENDER_SYSTEM:
                 sender_display = ""
                 content_prefix = f"[{timestamp}] "
-            elif msg.sender_name in ["The Architect", "User"]:
+            elif kind == SENDER_USER:
                 sender_display = msg.sender_name
                 content_prefix = f"[{timestamp}] {sender_display}: "
-            elif msg.sender_name.isdigit():
-                agent_id = int(msg.sender_name)
-                agent = self._database.get_agent(agent_id)
+            elif kind == SENDER_AGENT:
+                agent = agents_by_id.get(agent_id)
                 sender_display = f"{agent.name} (#{agent_id})" if agent and agent.name else f"Agent #{agent_id}"
                 content_prefix = f"[{timestamp}] {sender_display}: "
             else:
@@ -613,170 +868,316 @@ class MainWindow:
             if msg.reply_to_id and msg.reply_to_id in msg_lookup:
                 replied_msg = msg_lookup[msg.reply_to_id]
                 replied_sender = replied_msg.sender_name
-                if replied_sender.isdigit():
-                    replied_agent = self._database.get_agent(int(replied_sender))
+                replied_kind, replied_id = classify_sender(replied_sender)
+                if replied_kind == SENDER_AGENT:
+                    replied_agent = agents_by_id.get(replied_id)
                     replied_sender = replied_agent.name if replied_agent and replied_agent.name else f"#{replied_sender}"
-                elif replied_sender in ["The Architect", "User"]:
+                elif replied_kind == SENDER_USER:
                     pass  # Keep as is
                 else:
                     replied_sender = replied_sender[:20]
 
                 preview = replied_msg.content[:40] + "..." if len(replied_msg.content) > 40 else replied_msg.content
-                self._messages_text.insert("end", f"  ↩ {replied_sender}: {preview}\n", "reply_ref")
+                insert_tagged(f"  ↩ {replied_sender}: {preview}\n", "reply_ref")
 
-            # Insert main message
-            if msg.sender_name == "System":
-                self._messages_text.insert("end", f"{content_prefix}{msg.content}")
-            else:
-                self._messages_text.insert("end", f"{content_prefix}{msg.content}")
+            # Main message
+            plain.append(f"{content_prefix}{msg.content}")
 
             # Get and display reactions
             if msg.id:
-                reactions = self._database.get_reactions_summary(msg.id)
+                reactions = reactions_by_msg.get(msg.id)
                 if reactions:
                     reaction_str = " "
                     for reaction_type, count in reactions.items():
-                        emoji = reaction_emoji.get(reaction_type, "?")
+                        emoji = REACTION_EMOJI.get(reaction_type, "?")
                         reaction_str += f"{emoji}{count} "
-                    self._messages_text.insert("end", reaction_str, "reactions")
+                    insert_tagged(reaction_str, "reactions")
 
-            self._messages_text.insert("end", "\n\n")
+            plain.append("\n\n")
 
-        self._messages_text.configure(state="disabled")
-        self._messages_text.see("end")
+        if plain:
+            insert("end", "".join(plain))
+
+    def _schedule_refresh(self, flags: int) -> None:
+        """Mark parts of the UI dirty and post a single idle-time flush."""
+        if self._shutting_down:
+            return
+        with self._refresh_lock:
+            self._pending_refresh |= flags
+            if self._refresh_scheduled:
+                return
+            self._refresh_scheduled = True
+        self._root.after_idle(self._flush_refresh)
 
-    def _on_messages_changed(self) -> None:
-        """Handle messages changed event."""
-        self._root.after(0, self._refresh_messages)
+    def _flush_refresh(self) -> None:
+        """Run each pending refresh once, however many events requested it."""
+        if self._shutting_down:
+            return
+        with self._refresh_lock:
+            flags = self._pending_refresh
+            self._pending_refresh = 0
+            self._refresh_scheduled = False
+            agent = self._pending_selected_agent
+            self._pending_selected_agent = None
+            message = self._pending_status_message
+
+        if flags & DIRTY_REACTIONS:
+            # The rebuild also picks up any new messages
+            self._refresh_messages()
+        elif flags & DIRTY_MESSAGES:
+            self._append_new_messages()
+        if flags & DIRTY_AGENTS:
+            self._refresh_agent_list()
+        if flags & DIRTY_MEMBERS:
+            self._update_room_status()
+        if flags & DIRTY_SELECTED and agent is not None:
+            self._update_selected_agent_status(agent)
+        if flags & DIRTY_STATUS:
+            self._status_var.set(message)
+            if "is typing" in message:
+                self._typing_var.set(message)
+            elif "responded" in message or "thinking" in message:
+                self._typing_var.set("")
+
+    def _on_messages_changed(self, room_id: int) -> None:
+        """Handle messages changed event (ignored for rooms not on screen)."""
+        # Runs on worker threads: read the selection once
+        room = self._selected_room
+        if room is not None and room.id == room_id:
+            self._schedule_refresh(DIRTY_MESSAGES)
+
+    def _on_reactions_changed(self, room_id: int) -> None:
+        """Handle reactions changed event (ignored for rooms not on screen)."""
+        room = self._selected_room
+        if room is not None and room.id == room_id:
+            self._schedule_refresh(DIRTY_REACTIONS)
 
     def _on_agent_status_changed(self, agent: AIAgent) -> None:
         """Handle agent status change."""
-        self._root.after(0, self._refresh_agent_list)
-        self._root.after(0, self._update_room_status)
+        flags = DIRTY_AGENTS
+        # The member list only shows the selected room's agents
+        if any(member.id == agent.id for member in self._room_agents_list):
+            flags |= DIRTY_MEMBERS
         if self._selected_agent and agent.id == self._selected_agent.id:
-            self._root.after(0, lambda: self._update_selected_agent_status(agent))
+            with self._refresh_lock:
+                self._pending_selected_agent = agent
+            flags |= DIRTY_SELECTED
+        self._schedule_refresh(flags)
 
     def _update_selected_agent_status(self, agent: AIAgent) -> None:
         """Update status display for selected agent."""
-        status = agent.status if agent.status else "idle"
-        status_text = {"idle": "● Idle", "thinking": "◐ Waiting...", "typing": "⌨ Typing...", "sending": "↑ Sending...", "sleeping": "💤 Sleeping"}.get(status, f"● {status}")
-        color = {"idle": "#7ee787", "thinking": "#ffa657", "typing": "#79c0ff", "sending": "#d2a8ff", "sleeping": "#8b8b8b"}.get(status, "#7ee787")
-        self._heartbeat_status_var.set(status_text)
-        self._heartbeat_status_label.configure(text_color=color)
+        self._show_heartbeat_status(agent.status)
         self._agent_name_var.set(agent.name)
 
+    def _show_heartbeat_status(self, status: str) -> None:
+        """Show an agent status in the heartbeat label.
+
+        The text goes through the StringVar; the label is only reconfigured
+        (a full CTk redraw) when the colour actually changes.
+        """
+        status = status or "idle"
+        self._heartbeat_status_var.set(STATUS_TEXT.get(status, f"● {status}"))
+        color = STATUS_COLORS.get(status, STATUS_COLORS["idle"])
+        if color != self._heartbeat_status_color:
+            self._heartbeat_status_color = color
+            self._heartbeat_status_label.configure(text_color=color)
+
     def _on_status_update(self, message: str) -> None:
-        """Handle status update."""
-        self._root.after(0, lambda: self._status_var.set(message))
-        if "is typing" in message:
-            self._root.after(0, lambda: self._typing_var.set(message))
-        elif "responded" in message or "thinking" in message:
-            self._root.after(0, lambda: self._typing_var.set(""))
+        """Handle status update (only the latest message in a burst is shown)."""
+        with self._refresh_lock:
+            self._pending_status_message = message
+        self._schedule_refresh(DIRTY_STATUS)
 
     def _on_rooms_changed(self) -> None:
-        """Handle rooms list change."""
-        self._root.after(0, self._refresh_agent_list)
+        """Handle rooms list change.
+
+        Rooms are agents, so this fires when an agent is created or deleted -
+        the agent list has to refresh. A deleted agent may also have been a
+        member of the selected room.
+        """
+        self._room_agents_sorted_cache.clear()
+        self._room_members_cache.clear()
+        self._schedule_refresh(DIRTY_AGENTS | DIRTY_MEMBERS)
 
     def _on_membership_changed(self, room_id: int) -> None:
         """Handle room membership change."""
-        if self._selected_room and self._selected_room.id == room_id:
-            self._root.after(0, self._update_room_status)
+        self._room_agents_sorted_cache.pop(room_id, None)
+        self._room_members_cache.pop(room_id, None)
+        room = self._selected_room
+        if room is not None and room.id == room_id:
+            self._schedule_refresh(DIRTY_MEMBERS)
 
     def _load_api_key(self) -> None:
-        """Load API key from keyring and auto-connect if found."""
+        """Load API key from keyring and auto-connect if found.
+
+        The keyring read, connection test and model listing can take
+        seconds, so they run on a background thread.
+        """
         if not HAS_KEYRING:
             logger.info("Keyring not available")
             return
 
+        threading.Thread(target=self._load_api_key_worker, name="api-key-load", daemon=True).start()
+
+    def _load_api_key_worker(self) -> None:
+        """Connect with the stored API key (runs off the Tk thread)."""
         try:
-            api_key = keyring.get_password(config.KEYRING_SERVICE, config.KEYRING_USERNAME)
-            if api_key:
-                self._openai.set_api_key(api_key)
-                logger.info("API key loaded from keyring")
-                success, message = self._openai.test_connection()
-                logger.info(f"Connection test: {message}")
-                if success:
-                    models = self._openai.get_available_models()
-                    logger.info(f"API connected: {len(models)} models available")
+            api_key = get_api_key()
+            if not api_key:
+                return
+            self._openai.set_api_key(api_key)
+            logger.info("API key loaded from keyring")
+            success, message = self._openai.test_connection()
+            logger.info(f"Connection test: {message}")
+            models = None
+            if success:
+                models = self._openai.get_available_models()
+                logger.info(f"API connected: {len(models)} models available")
         except Exception as e:
             logger.error(f"Failed to load API key from keyring: {e}")
+            return
+
+        if self._shutting_down:
+            return
+        try:
+            self._root.after_idle(self._on_api_key_loaded, message, models)
+        except Exception as e:
+            logger.debug(f"Dropping API key load result: {e}")
+
+    def _on_api_key_loaded(self, message: str, models: Optional[List[str]]) -> None:
+        """Show the startup connection result (Tk thread)."""
+        self._status_var.set(message)
+        if models:
+            self._agent_model_combo.configure(values=models)
+
+    def _on_entry_return(self, event) -> None:
+        """Send the message when Return is pressed in the entry."""
+        self._send_message()
 
     def _send_message(self) -> None:
         """Send a message from The Architect to selected room."""
-        if not self._selected_room:
+        room = self._selected_room
+        if room is None:
             messagebox.showwarning("Warning", "Please select a room first")
             return
 
-        message = self._message_var.get().strip()
-        if not message:
+        message = self._message_var.get()
+        if not message or message.isspace():
             return
+        message = message.strip()
 
-        self._room_service.send_message(self._selected_room.id, "The Architect", message)
         self._message_var.set("")
-        self._refresh_messages()
+        self._send_queue.append((room.id, message))
+        if self._flush_sends_id is None:
+            self._flush_sends_id = self._root.after(config.SEND_BATCH_DELAY_MS, self._flush_sends)
+
+    def _flush_sends(self) -> None:
+        """Write all queued Architect messages in one transaction."""
+        self._flush_sends_id = None
+        if not self._send_queue:
+            return
+        items = [(room_id, "The Architect", content) for room_id, content in self._send_queue]
+        self._send_queue.clear()
+        self._room_service.send_messages(items)
+        # Coalesces with any other pending refresh and appends only the new messages
+        self._schedule_refresh(DIRTY_MESSAGES)
 
     def _toggle_heartbeat(self) -> None:
         """Toggle heartbeat service."""
         if self._heartbeat.is_running:
             self._heartbeat.stop()
-            self._heartbeat_btn_text.set("▶ Start")
+            self._heartbeat_btn_text.set(self._HB_START)
         else:
             if not self._openai.has_api_key:
                 messagebox.showerror("Error", "Please connect to OpenAI first (File > Settings)")
                 return
 
             self._heartbeat.start()
-            self._heartbeat_btn_text.set("⏹ Stop")
+            self._heartbeat_btn_text.set(self._HB_STOP)
 
     def _clear_chat(self) -> None:
         """Clear chat messages in selected room."""
-        if not self._selected_room:
+        room = self._selected_room
+        if room is None:
             messagebox.showwarning("Warning", "Please select a room first")
             return
 
-        if messagebox.askyesno("Confirm", f"Clear all messages in room {self._selected_room.id}?"):
-            self._room_service.clear_room_messages(self._selected_room.id)
-            self._refresh_messages()
-            self._status_var.set(f"Chat cleared")
+        if self._confirm_clear:
+            dialog = ConfirmDialog(self._root, "Confirm", f"Clear all messages in room {room.id}?")
+            self._root.wait_window(dialog)
+            if not dialog.result:
+                return
+            if dialog.remember:
+                self._confirm_clear = False
+                self._database.set_setting("confirm_clear_chat", "0")
+
+        self._room_service.clear_room_messages(room.id)
+        self._refresh_messages()
+        self._status_var.set(f"Chat cleared")
+
+    def _show_dialog(self, key, factory: Callable[[], Any]) -> None:
+        """Bring the existing dialog for key to the front, or create it.
+
+        Dialogs with an on_reopen hook hide instead of closing; they are
+        refreshed through it before being shown again.
+        """
+        dialog = self._dialogs.get(key)
+        if dialog is not None and dialog.winfo_exists():
+            if dialog.state() == "withdrawn" and hasattr(dialog, "on_reopen"):
+                dialog.on_reopen()
+            dialog.deiconify()
+            dialog.lift()
+            dialog.focus_force()
+            return
+        self._dialogs[key] = factory()
 
     def _open_settings(self) -> None:
         """Open the settings dialog."""
-        dialog = SettingsDialog(self._root, self._openai, on_connected=self._refresh_agent_list)
+        self._show_dialog("settings", lambda: SettingsDialog(self._root, self._openai, on_connected=self._refresh_agent_list))
 
     def _open_prompt_editor(self) -> None:
         """Open the prompt editor dialog."""
-        dialog = PromptEditorDialog(self._root)
+        self._show_dialog("prompt_editor", lambda: PromptEditorDialog(self._root))
 
     def _open_knowledge_explorer(self) -> None:
         """Open the knowledge explorer for the selected agent."""
         if not self._selected_agent:
             messagebox.showwarning("No Agent", "Please select an agent first.")
             return
-        dialog = KnowledgeExplorerDialog(self._root, self._selected_agent, self._database)
+        agent = self._selected_agent
+        self._show_dialog(("knowledge", agent.id), lambda: KnowledgeExplorerDialog(self._root, agent, self._database))
 
     def _open_hud_history(self) -> None:
         """Open the HUD history viewer for the selected agent."""
         if not self._selected_agent:
             messagebox.showwarning("No Agent", "Please select an agent first.")
             return
-        dialog = HUDHistoryDialog(self._root, self._selected_agent, self._heartbeat)
+        agent = self._selected_agent
+        self._show_dialog(("hud_history", agent.id), lambda: HUDHistoryDialog(self._root, agent, self._heartbeat))
 
     def _open_toon_telemetry(self) -> None:
         """Open the TOON telemetry viewer to compare format efficiency."""
-        dialog = TOONTelemetryDialog(self._root)
+        self._show_dialog("toon_telemetry", lambda: TOONTelemetryDialog(self._root))
 
     def _on_close(self) -> None:
         """Handle window close."""
         logger.info("Application closing")
-
+        # Don't drop messages sent in the last few milliseconds
+        if self._flush_sends_id is not None:
+            self._root.after_cancel(self._flush_sends_id)
+        self._flush_sends()
+        self._shutting_down = True
+        # Hide at once; joining the heartbeat thread can take a couple of seconds
+        self._root.withdraw()
+
+        # Stops and joins the heartbeat thread, then drops its callbacks.
+        # This has to finish before the HTTP pool is closed below, since an
+        # in-flight heartbeat may still be using it.
         self._heartbeat.cleanup()
         self._room_service.cleanup()
+        self._db_pool.shutdown(wait=False)
 
-        if hasattr(self._openai, '_client') and self._openai._client:
-            try:
-                self._openai._client.close()
-            except Exception as e:
-                logger.debug(f"Error closing OpenAI client: {e}")
+        self._openai.close()
 
         logger.info("All services cleaned up")
         self._root.destroy()
@@ -16,7 +16,20 @@ STATUS_COLORS = {
     "thinking": "#ffa657",   # Orange - waiting for AI response
     "typing": "#79c0ff",     # Blue - typing
     "sending": "#d2a8ff",    # Purple - sending
-    "responded": "#7ee787"   # Bright green - goes back to idle
+    "responded": "#7ee787",  # Bright green - goes back to idle
+    "sleeping": "#8b8b8b"    # Grey - asleep until woken
+}
+
+# Status glyphs for agent lists, and the longer labels for the selected agent
+STATUS_INDICATORS = {"idle": "●", "thinking": "◐", "typing": "⌨", "sending": "↑", "sleeping": "💤"}
+STATUS_TEXT = {"idle": "● Idle", "thinking": "◐ Waiting...", "typing": "⌨ Typing...", "sending": "↑ Sending...", "sleeping": "💤 Sleeping"}
+
+# Reaction type -> emoji shown after a message
+REACTION_EMOJI = {
+    "thumbs_up": "👍",
+    "thumbs_down": "👎",
+    "brain": "🧠",
+    "heart": "❤️"
 }
 
 # Message colors
@@ -29,6 +42,9 @@ MESSAGE_COLORS = {
     "typing": "#ffa657",    # Orange
 }
 
+# Shared CTkButton options for secondary (non-primary) actions
+SECONDARY_BUTTON = {"fg_color": "gray40", "hover_color": "gray30"}
+
 # Special colors
 OWNER_COLOR = "#ffd700"  # Gold for room owner/admin
 MEMBER_COLOR = "#58a6ff"  # Blue for regular members